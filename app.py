@@ -1,34 +1,43 @@
-from flask import Config, Flask, jsonify, request, send_file, render_template_string
+from flask import Flask, jsonify, request, send_file, render_template_string
 from flask_cors import CORS
+from sqlalchemy import delete, insert, inspect
 import pandas as pd
 from extensions import db
+from config import Config
+from database import POOL_SETTINGS, SQLITE_PRAGMAS, database_url, init_database, read_only
 import init_data
-from models import User, BehavioralAssessment, ReferenceProfile, Course, University
-from recommendation import career_recommendation, calculate_reference_profile
+from models import Adjective, User, BehavioralAssessment, ReferenceProfile, Course, University
+from recommendation import (
+    career_recommendation_batch, get_user_recommendations,
+    refresh_user_recommendations, scoring_coalescer
+)
+from career_catalogue import catalogue
+from courses import course_index, get_courses_and_schools
+from assessments import (
+    FACTOR_CODES, QUESTION_TYPE_CODES, adjective_vocabulary, factor_scores
+)
+from reference_profiles import profile_index
+from skills import AVAILABLE_SKILLS, skill_vocabulary, split_skills
+from lookup_tables import get_factor, get_career_progression
+from model_service import DEFAULT_MODEL_PATH, model_service
+from migrate_indexes import create_indexes
+from migrate_assessments import seed_adjectives
+from user_cache import UserCache, TokenUser
+from read_routing import recent_writes
+from password_service import PasswordHasher, PasswordServiceBusy
 import io
 import os
-import bcrypt
 import logging
 import traceback
 import jwt
 from datetime import datetime, timedelta
 from functools import wraps
 
-if not os.path.exists('logs'):
-    os.makedirs('logs')
-
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/app.log'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
 # Initialize Flask app
 app = Flask(__name__)
+Config.init_logging(app)
 
 # Configure CORS with more permissive settings for development
 CORS(app, 
@@ -49,97 +58,76 @@ CORS(app,
 
 # Configuration
 app.config.update(
-    SQLALCHEMY_DATABASE_URI='sqlite:///db.sqlite',
+    SQLALCHEMY_DATABASE_URI=database_url(),
     SQLALCHEMY_TRACK_MODIFICATIONS=False,
-    SQLALCHEMY_ECHO=True,
+    # Connection pool per worker on PostgreSQL; SQLite gets WAL and the other
+    # SQLITE_PRAGMAS on each connection unless SQLITE_TUNING is off
+    DATABASE_POOL_SIZE=int(os.environ.get('DATABASE_POOL_SIZE', POOL_SETTINGS['pool_size'])),
+    DATABASE_MAX_OVERFLOW=int(os.environ.get('DATABASE_MAX_OVERFLOW', POOL_SETTINGS['max_overflow'])),
+    DATABASE_POOL_TIMEOUT=float(os.environ.get('DATABASE_POOL_TIMEOUT', POOL_SETTINGS['pool_timeout'])),
+    DATABASE_POOL_RECYCLE=int(os.environ.get('DATABASE_POOL_RECYCLE', POOL_SETTINGS['pool_recycle'])),
+    SQLITE_PRAGMAS=SQLITE_PRAGMAS if os.environ.get('SQLITE_TUNING', 'true').lower() in ('1', 'true', 'yes') else {},
+    # Read-only routes read from this replica (or from read-only connections
+    # to a WAL SQLite file); a user who wrote reads from the primary for
+    # READ_YOUR_WRITES_SECONDS
+    DATABASE_READ_URL=os.environ.get('DATABASE_READ_URL'),
+    READ_YOUR_WRITES_SECONDS=float(os.environ.get('READ_YOUR_WRITES_SECONDS', 5)),
+    # Logs every statement; for debugging only
+    SQLALCHEMY_ECHO=os.environ.get('SQLALCHEMY_ECHO', 'false').lower() in ('1', 'true', 'yes'),
     JWT_SECRET_KEY=os.environ.get('JWT_SECRET_KEY', 'your-secret-key-here'),
-    JWT_ACCESS_TOKEN_EXPIRES=timedelta(days=1)
+    JWT_ACCESS_TOKEN_EXPIRES=timedelta(days=1),
+    # Read handlers get users from an in-process cache; writes invalidate it
+    USER_CACHE_TTL=float(os.environ.get('USER_CACHE_TTL', 5)),
+    USER_CACHE_SIZE=int(os.environ.get('USER_CACHE_SIZE', 1024)),
+    # bcrypt cost and the per-worker hashing pool; stored hashes with another
+    # cost are upgraded on the next successful login
+    BCRYPT_ROUNDS=int(os.environ.get('BCRYPT_ROUNDS', 12)),
+    PASSWORD_POOL_WORKERS=int(os.environ.get('PASSWORD_POOL_WORKERS', 2)),
+    PASSWORD_MAX_PENDING=int(os.environ.get('PASSWORD_MAX_PENDING', 16)),
+    PASSWORD_QUEUE_TIMEOUT=float(os.environ.get('PASSWORD_QUEUE_TIMEOUT', 2.0)),
+    PASSWORD_RESULT_TIMEOUT=float(os.environ.get('PASSWORD_RESULT_TIMEOUT', 5.0)),
+    # Trained career model blended into the heuristic ratings. Opt-in: the
+    # model is close to uniform over its classes and adds a prediction to
+    # every scoring call, so the default weight of 0 (or a missing model
+    # file) leaves the heuristic alone and never loads it
+    MODEL_PATH=os.environ.get('MODEL_PATH', DEFAULT_MODEL_PATH),
+    MODEL_BLEND_WEIGHT=float(os.environ.get('MODEL_BLEND_WEIGHT', 0)),
+    MODEL_MMAP=os.environ.get('MODEL_MMAP', 'true').lower() in ('1', 'true', 'yes'),
+    # Recommendation scoring requests arriving within this window (or until
+    # the batch is full) are scored together, to share one model prediction.
+    # Only used while a model is blended in; the default of 0 disables it
+    SCORING_BATCH_WINDOW_MS=float(os.environ.get('SCORING_BATCH_WINDOW_MS', 0)),
+    SCORING_MAX_BATCH=int(os.environ.get('SCORING_MAX_BATCH', 64)),
+    # Accounts allowed to call the cohort endpoints, comma separated
+    ADMIN_EMAILS={e.strip().lower() for e in os.environ.get('ADMIN_EMAILS', '').split(',') if e.strip()}
 )
 
 # Initialize extensions
-db.init_app(app)
-
-import logging
-from typing import List, Dict, Any
-
-def get_career_progression(career: str) -> List[Dict[str, Any]]:
-    """
-    Generate career progression path for a given career.
-    Args:
-        career (str): The career title to generate progression for
-    Returns:
-        List[Dict]: A list of career stages with title, years of experience, and salary
-    """
-    # Career progression mapping with defined paths for different careers
-    career_paths = {
-        "Software Engineer": [
-            {"title": "Junior Software Engineer", "years": 0, "salary": 45000, "currency": "ZAR"},
-            {"title": "Software Engineer", "years": 2, "salary": 75000, "currency": "ZAR"},
-            {"title": "Senior Software Engineer", "years": 5, "salary": 95000, "currency": "ZAR"},
-            {"title": "Lead Software Engineer", "years": 8, "salary": 120000, "currency": "ZAR"}
-        ],
-        "Data Scientist": [
-            {"title": "Junior Data Scientist", "years": 0, "salary": 48000, "currency": "ZAR"},
-            {"title": "Data Scientist", "years": 2, "salary": 78000, "currency": "ZAR"},
-            {"title": "Senior Data Scientist", "years": 5, "salary": 98000, "currency": "ZAR"},
-            {"title": "Lead Data Scientist", "years": 8, "salary": 125000, "currency": "ZAR"}
-        ],
-        "Public Defender": [
-            {"title": "Junior Public Defender", "years": 0, "salary": 42000, "currency": "ZAR"},
-            {"title": "Public Defender", "years": 3, "salary": 65000, "currency": "ZAR"},
-            {"title": "Senior Public Defender", "years": 6, "salary": 85000, "currency": "ZAR"},
-            {"title": "Chief Public Defender", "years": 9, "salary": 110000, "currency": "ZAR"}
-        ],
-        "Accountant": [
-            {"title": "Junior Accountant", "years": 0, "salary": 40000, "currency": "ZAR"},
-            {"title": "Staff Accountant", "years": 2, "salary": 60000, "currency": "ZAR"},
-            {"title": "Senior Accountant", "years": 5, "salary": 80000, "currency": "ZAR"},
-            {"title": "Finance Manager", "years": 8, "salary": 100000, "currency": "ZAR"}
-        ],
-        "Operations Manager": [
-            {"title": "Operations Coordinator", "years": 0, "salary": 45000, "currency": "ZAR"},
-            {"title": "Operations Manager", "years": 3, "salary": 70000, "currency": "ZAR"},
-            {"title": "Senior Operations Manager", "years": 6, "salary": 90000, "currency": "ZAR"},
-            {"title": "Director of Operations", "years": 9, "salary": 115000, "currency": "ZAR"}
-        ],
-        "General Practitioner": [
-            {"title": "Medical Resident", "years": 0, "salary": 52000, "currency": "ZAR"},
-            {"title": "General Practitioner", "years": 3, "salary": 120000, "currency": "ZAR"},
-            {"title": "Senior GP", "years": 6, "salary": 150000, "currency": "ZAR"},
-            {"title": "Medical Director", "years": 10, "salary": 180000, "currency": "ZAR"}
-        ],
-        "Civil Engineer": [
-            {"title": "Junior Civil Engineer", "years": 0, "salary": 48000, "currency": "ZAR"},
-            {"title": "Civil Engineer", "years": 3, "salary": 75000, "currency": "ZAR"},
-            {"title": "Senior Civil Engineer", "years": 6, "salary": 95000, "currency": "ZAR"},
-            {"title": "Project Director", "years": 9, "salary": 120000, "currency": "ZAR"}
-        ],
-        "IT Support Specialist": [
-            {"title": "IT Support Technician", "years": 0, "salary": 35000, "currency": "ZAR"},
-            {"title": "IT Support Specialist", "years": 2, "salary": 50000, "currency": "ZAR"},
-            {"title": "Senior IT Support Specialist", "years": 4, "salary": 65000, "currency": "ZAR"},
-            {"title": "IT Support Manager", "years": 7, "salary": 85000, "currency": "ZAR"}
-        ]
-    }
-
-    try:
-        # If we have a defined path for this career, return it
-        if career in career_paths:
-            logger.info(f"Found defined career path for: {career}")
-            return career_paths[career]
-
-        # If no specific path is defined, generate a generic progression
-        logger.info(f"Generating generic career path for: {career}")
-        return [
-            {"title": f"Junior {career}", "years": 0, "salary": 40000},
-            {"title": career, "years": 2, "salary": 60000},
-            {"title": f"Senior {career}", "years": 5, "salary": 80000},
-            {"title": f"Lead {career}", "years": 8, "salary": 100000}
-        ]
-
-    except Exception as e:
-        logger.error(f"Error generating career progression for {career}: {str(e)}")
-        return []
+init_database(app)
+# Gunicorn never runs the __main__ blocks, so every worker stores the
+# assessment adjectives the vocabulary needs; existing rows are left alone
+with app.app_context(), db.engine.begin() as connection:
+    if inspect(connection).has_table(Adjective.__tablename__):
+        seed_adjectives(connection)
+recent_writes.configure(window=app.config['READ_YOUR_WRITES_SECONDS'])
+user_cache = UserCache(ttl=app.config['USER_CACHE_TTL'], max_size=app.config['USER_CACHE_SIZE'])
+password_hasher = PasswordHasher(
+    rounds=app.config['BCRYPT_ROUNDS'],
+    workers=app.config['PASSWORD_POOL_WORKERS'],
+    max_pending=app.config['PASSWORD_MAX_PENDING'],
+    queue_timeout=app.config['PASSWORD_QUEUE_TIMEOUT'],
+    result_timeout=app.config['PASSWORD_RESULT_TIMEOUT']
+)
+model_service.configure(
+    path=app.config['MODEL_PATH'],
+    blend_weight=app.config['MODEL_BLEND_WEIGHT'],
+    mmap=app.config['MODEL_MMAP']
+)
+model_service.warm()
+scoring_coalescer.configure(
+    window_ms=app.config['SCORING_BATCH_WINDOW_MS'],
+    max_batch=app.config['SCORING_MAX_BATCH']
+)
 
 @app.route('/')
 def test_route():
@@ -150,6 +138,8 @@ if __name__ == "__main__":
         try:
             # Initialize database tables
             db.create_all()
+            # create_all does not add indexes to tables that already exist
+            create_indexes(db.engine)
 
             # Load reference profiles
             if ReferenceProfile.query.count() == 0:
@@ -163,6 +153,10 @@ if __name__ == "__main__":
             if Course.query.count() == 0:
                 init_data.init_courses(app)
 
+            # Adds adjectives new to the CSV; stored ones are left alone
+            init_data.init_adjectives(app)
+
+            course_index.build()
             logger.info("Application initialized successfully")
         except Exception as e:
             logger.error(f"Error during initialization: {str(e)}")
@@ -172,7 +166,19 @@ if __name__ == "__main__":
 
 
 # Authentication decorator
-def token_required(f):
+def token_required(f=None, load='cached'):
+    """
+    Require a valid JWT and pass the authenticated user to the handler.
+
+    Args:
+        load (str): What the handler receives as current_user:
+            'claims' - a TokenUser built from the token alone, no database access
+            'cached' - a read-only CachedUser from user_cache (queried only on a miss)
+            'orm'    - the full User row, for handlers that modify it
+    """
+    if f is None:
+        return lambda f: token_required(f, load)
+
     @wraps(f)
     def decorated(*args, **kwargs):
         token = request.headers.get('Authorization')
@@ -184,7 +190,15 @@ def token_required(f):
             if token.startswith('Bearer '):
                 token = token.split(" ")[1]
             data = jwt.decode(token, app.config['JWT_SECRET_KEY'], algorithms=["HS256"])
-            current_user = User.query.get(data['user_id'])
+            # Whose writes pin reads to the primary; see read_routing
+            db.session.info['user_id'] = data['user_id']
+            
+            if load == 'claims':
+                current_user = TokenUser(data)
+            elif load == 'cached':
+                current_user = user_cache.get(data['user_id'])
+            else:
+                current_user = User.query.get(data['user_id'])
             
             if not current_user:
                 return jsonify({'error': 'Invalid user'}), 401
@@ -197,6 +211,52 @@ def token_required(f):
         return f(current_user, *args, **kwargs)
     return decorated
 
+def create_token(user):
+    """Issue a JWT carrying the claims handlers need without a user lookup"""
+    return jwt.encode(
+        {
+            'user_id': user.id,
+            'email': user.email,
+            'exp': datetime.utcnow() + app.config['JWT_ACCESS_TOKEN_EXPIRES']
+        },
+        app.config['JWT_SECRET_KEY'],
+        algorithm='HS256'
+    )
+
+def refresh_stored_recommendations(user):
+    """Recompute a user's stored recommendations inside a savepoint.
+
+    Called when reference_profile_id or skills change, before the caller
+    commits. A failure here leaves the user's update intact; reads then
+    score the user afresh until the rows are stored again.
+    """
+    try:
+        with db.session.begin_nested():
+            refresh_user_recommendations(user)
+    except Exception as e:
+        logger.error(f"Error refreshing recommendations for user {user.id}: {str(e)}")
+
+def rehash_password(user, password):
+    """Re-hash a password at the configured cost after it verified"""
+    try:
+        user.password = password_hasher.hash(password)
+        db.session.commit()
+        password_hasher.record_rehash()
+    except PasswordServiceBusy:
+        # Not urgent; try again on a later login
+        pass
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error rehashing password for user {user.id}: {str(e)}")
+
+def password_service_busy_response():
+    """429 for signup/login when the hashing pool has no capacity"""
+    response = jsonify({"error": "Too many requests, please try again shortly"})
+    response.headers.add('Retry-After', '1')
+    response.headers.add('Access-Control-Allow-Origin', request.headers.get('Origin', 'http://localhost:3000'))
+    response.headers.add('Access-Control-Allow-Credentials', 'true')
+    return response, 429
+
 # Authentication routes
 @app.route('/signup', methods=['POST', 'OPTIONS'])
 def signup():
@@ -213,7 +273,6 @@ def signup():
     try:
         logger.debug("Received signup request")
         data = request.json
-        logger.debug(f"Signup data received: {data}")
 
         # Validate required fields
         required_fields = ['firstName', 'lastName', 'email', 'age', 'careerInterests', 'password']
@@ -228,7 +287,7 @@ def signup():
             return jsonify({"error": "User already exists"}), 409
 
         # Hash password
-        hashed_password = bcrypt.hashpw(data['password'].encode('utf-8'), bcrypt.gensalt())
+        hashed_password = password_hasher.hash(data['password'])
 
         # Create new user
         new_user = User(
@@ -244,17 +303,11 @@ def signup():
         # Add user to database
         db.session.add(new_user)
         db.session.commit()
-        logger.info(f"New user created: {new_user.email}")
+        recent_writes.record(new_user.id)
+        logger.info("New user created: %s", new_user.id)
 
         # Generate token
-        token = jwt.encode(
-            {
-                'user_id': new_user.id,
-                'exp': datetime.utcnow() + timedelta(days=1)
-            },
-            app.config['JWT_SECRET_KEY'],
-            algorithm='HS256'
-        )
+        token = create_token(new_user)
 
         # Return user data and token
         response = jsonify({
@@ -276,6 +329,8 @@ def signup():
         response.headers.add('Access-Control-Allow-Credentials', 'true')
         return response, 201
 
+    except PasswordServiceBusy:
+        return password_service_busy_response()
     except Exception as e:
         logger.error(f"Error in signup: {str(e)}")
         logger.error(traceback.format_exc())
@@ -303,11 +358,11 @@ def login():
         password = data.get('password')
 
         user = User.query.filter_by(email=email).first()
-        if user and bcrypt.checkpw(password.encode('utf-8'), user.password):
-            token = jwt.encode({
-                'user_id': user.id,
-                'exp': datetime.utcnow() + app.config['JWT_ACCESS_TOKEN_EXPIRES']
-            }, app.config['JWT_SECRET_KEY'])
+        if user and password_hasher.verify(password, user.password):
+            if password_hasher.needs_rehash(user.password):
+                rehash_password(user, password)
+                
+            token = create_token(user)
 
             response = jsonify({
                 'token': token,
@@ -331,6 +386,8 @@ def login():
             error_response.headers.add('Access-Control-Allow-Origin', request.headers.get('Origin', 'http://localhost:3000'))
             error_response.headers.add('Access-Control-Allow-Credentials', 'true')
             return error_response, 401
+    except PasswordServiceBusy:
+        return password_service_busy_response()
     except Exception as e:
         logger.error(f"Login error: {str(e)}")
         error_response = jsonify({'error': 'Login failed'})
@@ -340,6 +397,7 @@ def login():
 
 # Protected routes
 @app.route('/user/profile', methods=['GET'])
+@read_only
 @token_required
 def get_user_profile(current_user):
     """
@@ -375,7 +433,7 @@ def get_user_profile(current_user):
                 "lastName": current_user.last_name,
                 "email": current_user.email,
                 "age": current_user.age,
-                "skills": current_user.skills.split(", ") if current_user.skills else [],
+                "skills": split_skills(current_user.skills),
                 "careerInterests": current_user.career_interests,
                 "profile": profile_data
             }
@@ -385,7 +443,7 @@ def get_user_profile(current_user):
         return jsonify({"error": "Failed to get user profile"}), 500
 
 @app.route('/user/profile', methods=['PUT'])
-@token_required
+@token_required(load='orm')
 def update_user_profile(current_user):
     """
     Update the profile information for the current user.
@@ -410,9 +468,12 @@ def update_user_profile(current_user):
                 setattr(current_user, field, data[field])
         
         if 'skills' in data:
-            current_user.skills = ", ".join(data['skills'])
+            current_user.skills = data['skills']
+        if 'skills' in data or 'age' in data:
+            refresh_stored_recommendations(current_user)
             
         db.session.commit()
+        user_cache.invalidate(current_user.id)
         
         return jsonify({
             "message": "Profile updated successfully",
@@ -421,7 +482,7 @@ def update_user_profile(current_user):
                 "lastName": current_user.last_name,
                 "email": current_user.email,
                 "age": current_user.age,
-                "skills": current_user.skills.split(", ") if current_user.skills else [],
+                "skills": split_skills(current_user.skills),
                 "careerInterests": current_user.career_interests
             }
         })
@@ -431,7 +492,7 @@ def update_user_profile(current_user):
         return jsonify({"error": "Failed to update profile"}), 500
 
 @app.route('/submit_assessment', methods=['POST'])
-@token_required
+@token_required(load='orm')
 def submit_assessment(current_user):
     """
     Handles behavioral assessment submissions
@@ -445,35 +506,45 @@ def submit_assessment(current_user):
         if not responses:
             return jsonify({"error": "Responses are required"}), 400
 
-        # Clear existing assessments
-        BehavioralAssessment.query.filter_by(user_id=current_user.id).delete()
-
-        for response in responses:
-            adjective = response['adjective']
-            question_type = response['question_type']
-            factor = get_factor(adjective)
-            assessment_entry = BehavioralAssessment(
-                user_id=current_user.id,
-                adjective=adjective,
-                question_type=question_type,
-                factor=factor
-            )
-            db.session.add(assessment_entry)
+        try:
+            question_types = [QUESTION_TYPE_CODES[response.get('question_type')] for response in responses]
+        except KeyError as e:
+            return jsonify({"error": f"Unknown question_type {str(e)}"}), 400
+        try:
+            adjective_ids = adjective_vocabulary.ids([response.get('adjective') for response in responses])
+        except KeyError as e:
+            return jsonify({"error": f"Unknown adjective {str(e)}"}), 400
 
-        db.session.commit()
+        # Score the submitted answers in memory; nothing is read back
+        rows = [
+            {
+                'user_id': current_user.id,
+                'question_type': question_type,
+                'adjective_id': adjective_id,
+                'factor': FACTOR_CODES[get_factor(response['adjective'])]
+            }
+            for response, question_type, adjective_id in zip(responses, question_types, adjective_ids)
+        ]
 
-        profile_id = calculate_reference_profile(current_user.id)
-        current_user.reference_profile_id = profile_id
-        db.session.commit()
+        profile = profile_index.match(factor_scores((row['question_type'], row['factor']) for row in rows))
+        if profile is None:
+            logger.error("Assessment submission error: no reference profiles available")
+            return jsonify({"error": "Failed to submit assessment"}), 500
 
-        profile = ReferenceProfile.query.get(profile_id)
+        # Replace the old answers and set the profile in one transaction
+        db.session.execute(delete(BehavioralAssessment).where(BehavioralAssessment.user_id == current_user.id))
+        db.session.execute(insert(BehavioralAssessment), rows)
+        current_user.reference_profile_id = profile['id']
+        refresh_stored_recommendations(current_user)
+        db.session.commit()
+        user_cache.invalidate(current_user.id)
         
         return jsonify({
             "message": "Assessment submitted successfully",
             "profile": {
-                "id": profile.id,
-                "name": profile.name,
-                "description": profile.description
+                "id": profile['id'],
+                "name": profile['name'],
+                "description": profile['description']
             }
         })
 
@@ -482,17 +553,27 @@ def submit_assessment(current_user):
         logger.error(f"Assessment submission error: {str(e)}")
         return jsonify({"error": "Failed to submit assessment"}), 500
 
+# Upper bound for ?k= on the recommendation endpoints
+MAX_RECOMMENDATIONS = 10
+
 @app.route('/recommend', methods=['GET'])
+@read_only
 @token_required
 def recommend(current_user):
     """
     Get a career recommendation for the current user.
 
+    Query parameters:
+        k (int, optional): Number of careers to return in ``recommendations``
+            (1 to MAX_RECOMMENDATIONS, default 1)
+
     Returns:
         A JSON object with the following properties:
             name (str): The full name of the current user
             career_recommendation (str): The recommended career
             recommendation_rating (float): The rating of the recommendation
+            recommendations (list of objects): The k best careers, best first,
+                each with career, rating, personality_match and skills_match
             related_courses_and_schools (list of objects): A list of related courses
                 with the following properties:
                     course (str): The name of the course
@@ -504,111 +585,95 @@ def recommend(current_user):
         if not current_user.reference_profile_id:
             return jsonify({"error": "Please complete the assessment first"}), 400
             
-        career, rating = career_recommendation(current_user.id)
-        if career is None:
+        k = request.args.get('k', 1, type=int)
+        if not 1 <= k <= MAX_RECOMMENDATIONS:
+            return jsonify({"error": f"k must be between 1 and {MAX_RECOMMENDATIONS}"}), 400
+            
+        recommendations = get_user_recommendations(current_user, k)
+        if not recommendations:
             return jsonify({"error": "Recommendation could not be generated"}), 500
+        career, rating = recommendations[0]['career'], recommendations[0]['rating']
 
-        related_courses = Course.query.filter_by(recommended_career=career).all()
-        courses_and_schools = [
-            {
-                "course": course.name,
-                "school": University.query.get(course.university_id).name,
-                "duration": course.duration,
-                "keySkills": course.key_skills.split(", ") if course.key_skills else []
-            }
-            for course in related_courses
-        ]
+        courses_and_schools = get_courses_and_schools(career)
 
         return jsonify({
             "name": f"{current_user.first_name} {current_user.last_name}",
             "career_recommendation": career,
             "recommendation_rating": rating,
+            "recommendations": recommendations,
             "related_courses_and_schools": courses_and_schools
         })
     except Exception as e:
         logger.error(f"Recommendation error: {str(e)}")
         return jsonify({"error": "Failed to generate recommendation"}), 500
 
-# Utility functions
-def get_factor(adjective):
-    # Convert adjective to lowercase and remove any whitespace
+# Largest cohort accepted by /recommend/batch in one call
+MAX_BATCH_USERS = 5000
+
+@app.route('/recommend/batch', methods=['POST'])
+@token_required
+def recommend_batch(current_user):
     """
-    Determine the behavioral factor associated with a given adjective.
+    Get career recommendations for a cohort of users in one call.
 
-    Args:
-        adjective (str): A descriptive word characterizing behavior or personality.
+    Only accounts listed in ADMIN_EMAILS may call this endpoint.
 
-    Returns:
-        str: The corresponding behavioral factor, which can be one of the following:
-             "Dominance", "Extraversion", "Patience", or "Formality". Defaults to 
-             "Dominance" if the adjective is not recognized.
+    Request body:
+        user_ids (list of int): The users to score (at most MAX_BATCH_USERS)
+        k (int, optional): Number of careers per user (default 1)
 
-    Notes:
-        Logs a warning if an unrecognized adjective is encountered.
+    Returns:
+        A JSON object mapping each user id to its list of recommendations,
+        each with career, rating, personality_match and skills_match. Users
+        without a completed assessment get an empty list.
     """
-    adjective = adjective.lower().strip()
-    
-    factor_mapping = {
-        # Dominance factors
-        "assertive": "Dominance",
-        "confident": "Dominance",
-        "decisive": "Dominance",
-        "ambitious": "Dominance",
-        "bold": "Dominance",
-        "commanding": "Dominance",
-        "competitive": "Dominance",
-        "determined": "Dominance",
-        "independent": "Dominance",
-        "fast-paced": "Dominance",
-        "achievement": "Dominance",
-        
-        # Extraversion factors
-        "sociable": "Extraversion",
-        "outgoing": "Extraversion",
-        "friendly": "Extraversion",
-        "communicative": "Extraversion",
-        "enthusiastic": "Extraversion",
-        "persuasive": "Extraversion",
-        "lively": "Extraversion",
-        "talkative": "Extraversion",
-        "engaging": "Extraversion",
-        "energetic": "Extraversion",
-        "teamwork": "Extraversion",
+    if current_user.email.lower() not in app.config['ADMIN_EMAILS']:
+        return jsonify({"error": "Not authorized"}), 403
         
-        # Patience factors
-        "calm": "Patience",
-        "steady": "Patience",
-        "patient": "Patience",
-        "consistent": "Patience",
-        "reliable": "Patience",
-        "composed": "Patience",
-        "accommodating": "Patience",
-        "predictable": "Patience",
-        "supportive": "Patience",
-        "stable": "Patience",
-        "consistency": "Patience",
+    try:
+        data = request.json or {}
+        user_ids = data.get('user_ids')
+        k = data.get('k', 1)
         
-        # Formality factors
-        "structured": "Formality",
-        "precise": "Formality",
-        "detail-oriented": "Formality",
-        "methodical": "Formality",
-        "organized": "Formality",
-        "careful": "Formality",
-        "disciplined": "Formality",
-        "conscientious": "Formality",
-        "rule-following": "Formality",
-        "excellence": "Formality",
-        "collaborative": "Formality"
-    }
-    
-    factor = factor_mapping.get(adjective)
-    if not factor:
-        logger.warning(f"Unknown adjective encountered: {adjective}")
-        return "Dominance"  # Default factor if unknown
-    return factor
+        # bool is a subclass of int, but true/false are not user ids
+        if not isinstance(user_ids, list) or not all(type(i) is int for i in user_ids):
+            return jsonify({"error": "user_ids must be a list of integers"}), 400
+        if len(user_ids) > MAX_BATCH_USERS:
+            return jsonify({"error": f"At most {MAX_BATCH_USERS} users per request"}), 400
+        if type(k) is not int or not 1 <= k <= MAX_RECOMMENDATIONS:
+            return jsonify({"error": f"k must be between 1 and {MAX_RECOMMENDATIONS}"}), 400
+            
+        results = career_recommendation_batch(user_ids, k)
+        return jsonify({
+            "recommendations": {str(user_id): recs for user_id, recs in results.items()}
+        })
+    except Exception as e:
+        logger.error(f"Batch recommendation error: {str(e)}")
+        return jsonify({"error": "Failed to generate recommendations"}), 500
 
+@app.route('/metrics', methods=['GET'])
+@token_required
+def metrics(current_user):
+    """
+    Return in-process cache counters for this worker.
+
+    Only accounts listed in ADMIN_EMAILS may call this endpoint.
+    """
+    if current_user.email.lower() not in app.config['ADMIN_EMAILS']:
+        return jsonify({"error": "Not authorized"}), 403
+
+    return jsonify({
+        "career_catalogue": catalogue.stats(),
+        "user_cache": user_cache.stats(),
+        "password_hasher": password_hasher.stats(),
+        "career_model": model_service.stats(),
+        "scoring_coalescer": scoring_coalescer.stats(),
+        "recent_writes": recent_writes.stats()
+    }), 200
+
+# Utility functions
 @app.route('/career_path', methods=['GET'])
+@read_only
 @token_required
 def get_career_path_route(current_user):
     """
@@ -617,10 +682,15 @@ def get_career_path_route(current_user):
     Route: /career_path
     Method: GET
 
+    Query parameters:
+        - k: int, optional, number of careers to consider (default 1); the
+          runners-up are returned as ``alternatives``
+
     Returns:
         - current_career: str, the recommended career for the user
         - match_rating: float, the match rating for the recommended career
         - progression: List[Dict[str, Any]], a list of career stages with title, years of experience, and salary
+        - alternatives: List[Dict[str, Any]], the next best careers with their ratings and sub-scores
 
     Raises:
         400: If the user has not completed the assessment
@@ -634,8 +704,13 @@ def get_career_path_route(current_user):
                 "redirect": "/assessment"
             }), 400
             
+        k = request.args.get('k', 1, type=int)
+        if not 1 <= k <= MAX_RECOMMENDATIONS:
+            return jsonify({"error": f"k must be between 1 and {MAX_RECOMMENDATIONS}"}), 400
+
         # Get career recommendation
-        career, rating = career_recommendation(current_user.id)
+        recommendations = get_user_recommendations(current_user, k)
+        career, rating = (recommendations[0]['career'], recommendations[0]['rating']) if recommendations else (None, 0)
         if not career:
             logger.error(f"Unable to generate career recommendation for user {current_user.id}")
             return jsonify({
@@ -654,7 +729,8 @@ def get_career_path_route(current_user):
         return jsonify({
             "current_career": career,
             "match_rating": rating,
-            "progression": progression
+            "progression": progression,
+            "alternatives": recommendations[1:]
         })
         
     except Exception as e:
@@ -662,6 +738,7 @@ def get_career_path_route(current_user):
         return jsonify({"error": "Failed to load career data"}), 500
 
 @app.route('/dashboard_data', methods=['GET'])
+@read_only
 @token_required
 def get_dashboard_data(current_user):
     """
@@ -694,18 +771,13 @@ def get_dashboard_data(current_user):
         career_data = None
         if current_user.reference_profile_id:
             try:
-                career, rating = career_recommendation(current_user.id)
-                if career:
-                    related_courses = Course.query.filter_by(recommended_career=career).all()
+                recommendations = get_user_recommendations(current_user, 1)
+                if recommendations:
+                    career, rating = recommendations[0]['career'], recommendations[0]['rating']
                     career_data = {
                         "career_recommendation": career,
                         "recommendation_rating": rating,
-                        "related_courses_and_schools": [{
-                            "course": course.name,
-                            "school": University.query.get(course.university_id).name,
-                            "duration": course.duration,
-                            "keySkills": course.key_skills.split(", ") if course.key_skills else []
-                        } for course in related_courses]
+                        "related_courses_and_schools": get_courses_and_schools(career)
                     }
             except Exception as e:
                 logger.error(f"Error getting career recommendation: {str(e)}")
@@ -716,7 +788,7 @@ def get_dashboard_data(current_user):
                 "lastName": current_user.last_name,
                 "email": current_user.email,
                 "age": current_user.age,
-                "skills": current_user.skills.split(", ") if current_user.skills else [],
+                "skills": split_skills(current_user.skills),
                 "careerInterests": current_user.career_interests,
                 "profile": profile_data
             },
@@ -727,67 +799,20 @@ def get_dashboard_data(current_user):
         logger.error(f"Error getting dashboard data: {str(e)}")
         return jsonify({"error": "Failed to load dashboard data"}), 500
     
-AVAILABLE_SKILLS = [
-    "Programming",
-    "Data Structures",
-    "Legal Research",
-    "Negotiation",
-    "Financial Analysis",
-    "Excel",
-    "Python",
-    "Machine Learning",
-    "Data Analysis",
-    "System Design",
-    "Problem Solving",
-    "SQL",
-    "Contract Law",
-    "Communication",
-    "Compliance",
-    "Risk Management",
-    "Auditing",
-    "Policy Development",
-    "Critical Thinking",
-    "Financial Reporting",
-    "Accounting Principles",
-    "Tax",
-    "Supply Chain Management",
-    "Inventory Management",
-    "Project Management",
-    "AutoCAD",
-    "Structural Analysis",
-    "Patient Care",
-    "Clinical Skills",
-    "Health Assessment",
-    "Diagnosis",
-    "Technical Drawing",
-    "Equipment Maintenance",
-    "Welding",
-    "Blueprint Reading",
-    "Environmental Science",
-    "Research Methods",
-    "Classroom Management",
-    "Curriculum Planning",
-    "Child Development",
-    "Technical Support",
-    "Troubleshooting",
-    "Customer Service",
-    "Networking",
-    "System Administration"
-]
 
 # Add this route to your app.py
 @app.route('/skills', methods=['GET'])
-@token_required
+@token_required(load='claims')
 def get_skills(current_user):
     """Return list of available skills"""
     try:
-        return jsonify(AVAILABLE_SKILLS)
+        return jsonify(list(AVAILABLE_SKILLS))
     except Exception as e:
         logger.error(f"Error getting skills: {str(e)}")
         return jsonify({"error": "Failed to load skills"}), 500
     
 @app.route('/submit_skills', methods=['POST'])
-@token_required
+@token_required(load='orm')
 def submit_skills(current_user):
     """
     Update user's skills with the given list of skills
@@ -800,13 +825,15 @@ def submit_skills(current_user):
         skills = data.get('skills', [])
         
         # Validate skills
-        invalid_skills = [skill for skill in skills if skill not in AVAILABLE_SKILLS]
+        invalid_skills = skill_vocabulary.invalid(skills)
         if invalid_skills:
             return jsonify({"error": f"Invalid skills: {', '.join(invalid_skills)}"}), 400
             
-        # Update user's skills
-        current_user.skills = ", ".join(skills)
+        # Update user's skills; the model stores their bitset alongside
+        current_user.skills = skills
+        refresh_stored_recommendations(current_user)
         db.session.commit()
+        user_cache.invalidate(current_user.id)
         
         return jsonify({
             "message": "Skills updated successfully",
@@ -833,6 +860,8 @@ if __name__ == "__main__":
         try:
             # Initialize database tables
             db.create_all()
+            # create_all does not add indexes to tables that already exist
+            create_indexes(db.engine)
 
             # Load reference profiles
             if ReferenceProfile.query.count() == 0:
@@ -846,6 +875,10 @@ if __name__ == "__main__":
             if Course.query.count() == 0:
                 init_data.init_courses(app)
 
+            # Adds adjectives new to the CSV; stored ones are left alone
+            init_data.init_adjectives(app)
+
+            course_index.build()
             logger.info("Application initialized successfully")
         except Exception as e:
             logger.error(f"Error during initialization: {str(e)}")
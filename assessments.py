@@ -0,0 +1,75 @@
+import logging
+import threading
+
+from extensions import db
+from models import Adjective
+from lookup_tables import ADJECTIVE_WORDS, canonical_adjective
+
+logger = logging.getLogger(__name__)
+
+# behavioral_assessments stores these as their index
+FACTORS = ("Dominance", "Extraversion", "Patience", "Formality")
+QUESTION_TYPES = ("Expected", "Self-description")
+
+FACTOR_CODES = {name: code for code, name in enumerate(FACTORS)}
+QUESTION_TYPE_CODES = {name: code for code, name in enumerate(QUESTION_TYPES)}
+
+# Points each answer adds to its factor, by question type code
+QUESTION_WEIGHTS = (1, 2)
+
+
+def factor_scores(answers):
+    """Total (question_type, factor) code pairs into a list of factor scores.
+
+    The list is in FACTORS order. Answers with a NULL code add nothing.
+    """
+    totals = [0] * len(FACTORS)
+    for question_type, factor in answers:
+        if question_type is not None and factor is not None:
+            totals[factor] += QUESTION_WEIGHTS[question_type]
+    return totals
+
+
+class AdjectiveVocabulary:
+    """Word -> id map over the adjectives table.
+
+    The vocabulary is closed: it holds the adjectives of
+    data/adjective_factors.csv, which init_data.init_adjectives stores, and
+    any spelling or alias get_factor accepts resolves to its adjective's id.
+    Ids are read once and served from memory; nothing is ever written here.
+    """
+
+    def __init__(self):
+        self._ids = {}
+        self._lock = threading.Lock()
+
+    @property
+    def words(self):
+        """The adjectives of the vocabulary, in table order"""
+        return tuple(dict.fromkeys(ADJECTIVE_WORDS.values()))
+
+    def ids(self, words):
+        """Return the ids of words; raises KeyError for a word not in the vocabulary"""
+        canonical = []
+        for word in words:
+            adjective = canonical_adjective(word)
+            if adjective is None:
+                raise KeyError(word)
+            canonical.append(adjective)
+
+        ids = self._ids
+        if not ids:
+            rows = db.session.query(Adjective.word, Adjective.id).filter(Adjective.word.in_(self.words)).all()
+            missing = set(self.words) - {word for word, _ in rows}
+            if missing:
+                raise RuntimeError(f"{len(missing)} adjectives are not stored, run init_data.init_adjectives")
+            with self._lock:
+                self._ids = ids = dict(rows)
+        return [ids[word] for word in canonical]
+
+    def clear(self):
+        with self._lock:
+            self._ids = {}
+
+
+adjective_vocabulary = AdjectiveVocabulary()
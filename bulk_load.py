@@ -0,0 +1,256 @@
+import hashlib
+import logging
+import time
+
+import pandas as pd
+from sqlalchemy import delete, insert
+from sqlalchemy import update as update_statement
+
+from extensions import db
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 5000
+
+
+class LoadReport:
+    """Counts and timing for one bulk load"""
+
+    def __init__(self, name):
+        self.name = name
+        self.loaded = 0
+        self.rejected = 0
+        self.chunks = 0
+        self.seconds = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.loaded / self.seconds if self.seconds else 0.0
+
+    def as_dict(self):
+        return {
+            'name': self.name,
+            'loaded': self.loaded,
+            'rejected': self.rejected,
+            'chunks': self.chunks,
+            'seconds': round(self.seconds, 3),
+            'rows_per_second': round(self.rows_per_second, 1)
+        }
+
+    def __str__(self):
+        return (f"{self.name}: {self.loaded} rows loaded, {self.rejected} rejected "
+                f"in {self.seconds:.2f}s ({self.rows_per_second:.0f} rows/s)")
+
+
+def clean_columns(df):
+    """Strip whitespace and stray trailing commas from header names"""
+    df.columns = [str(column).strip().rstrip(',') for column in df.columns]
+    return df
+
+
+def stream_csv(path, chunk_size=DEFAULT_CHUNK_SIZE, **read_csv_kwargs):
+    """Yield the CSV as DataFrames of at most chunk_size rows, NaN replaced by None"""
+    for chunk in pd.read_csv(path, chunksize=chunk_size, **read_csv_kwargs):
+        chunk = clean_columns(chunk)
+        yield chunk.astype(object).where(chunk.notna(), None)
+
+
+def insert_statement(model, conflict_key=None, update=True):
+    """Return an executemany-able INSERT for model.
+
+    With conflict_key, rows whose key already exists are updated (or skipped
+    when update is False). Supported on SQLite and PostgreSQL.
+    """
+    if conflict_key is None:
+        return insert(model)
+
+    dialect = db.engine.dialect.name
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        raise NotImplementedError(f"Upserts are not supported on {dialect}")
+
+    stmt = dialect_insert(model)
+    if not update:
+        return stmt.on_conflict_do_nothing(index_elements=[conflict_key])
+    columns = [c.name for c in model.__table__.columns if c.name != conflict_key]
+    return stmt.on_conflict_do_update(
+        index_elements=[conflict_key],
+        set_={name: stmt.excluded[name] for name in columns}
+    )
+
+
+def bulk_load(name, chunks, to_mapping, model, conflict_key=None, update=True):
+    """Insert rows chunk by chunk, one transaction per chunk.
+
+    ``to_mapping`` turns a row dict into a column mapping for ``model``; it may
+    return None to skip a row or raise ValueError/KeyError/TypeError to reject
+    it. If a chunk fails in the database, its rows are retried one at a time
+    in savepoints so that only the offending rows are rejected. Returns a
+    LoadReport.
+    """
+    report = LoadReport(name)
+    stmt = insert_statement(model, conflict_key, update)
+    started = time.perf_counter()
+
+    for chunk in chunks:
+        mappings = []
+        for row in chunk.to_dict('records'):
+            try:
+                mapping = to_mapping(row)
+            except (ValueError, KeyError, TypeError) as e:
+                report.rejected += 1
+                logger.warning(f"{name}: rejected row {row}: {str(e)}")
+                continue
+            if mapping is not None:
+                mappings.append(mapping)
+
+        if mappings:
+            try:
+                db.session.execute(stmt, mappings)
+                db.session.commit()
+                report.loaded += len(mappings)
+            except Exception as e:
+                db.session.rollback()
+                logger.warning(f"{name}: chunk {report.chunks} failed ({str(e)}), retrying row by row")
+                for mapping in mappings:
+                    try:
+                        with db.session.begin_nested():
+                            db.session.execute(stmt, [mapping])
+                        report.loaded += 1
+                    except Exception as row_error:
+                        report.rejected += 1
+                        logger.warning(f"{name}: rejected row {mapping}: {str(row_error)}")
+                db.session.commit()
+        report.chunks += 1
+
+    report.seconds = time.perf_counter() - started
+    logger.info(str(report))
+    return report
+
+
+class SyncReport:
+    """Counts and timing for one sync_table run"""
+
+    def __init__(self, name):
+        self.name = name
+        self.inserted = 0
+        self.updated = 0
+        self.deleted = 0
+        self.unchanged = 0
+        self.rejected = 0
+        self.seconds = 0.0
+
+    @property
+    def writes(self):
+        return self.inserted + self.updated + self.deleted
+
+    def as_dict(self):
+        return {
+            'name': self.name,
+            'inserted': self.inserted,
+            'updated': self.updated,
+            'deleted': self.deleted,
+            'unchanged': self.unchanged,
+            'rejected': self.rejected,
+            'seconds': round(self.seconds, 3)
+        }
+
+    def __str__(self):
+        return (f"{self.name}: {self.inserted} inserted, {self.updated} updated, {self.deleted} deleted, "
+                f"{self.unchanged} unchanged, {self.rejected} rejected in {self.seconds:.2f}s")
+
+
+def row_hash(values):
+    """Stable hash of a row's column values"""
+    return hashlib.sha1(repr(tuple(values)).encode('utf-8')).hexdigest()
+
+
+def keyed_rows(rows, key_columns, unique):
+    """Index rows by their natural key.
+
+    When the key is not unique (unique=False), repeated keys are told apart by
+    their occurrence number, so duplicates in the source map onto duplicates
+    in the table in order. With unique=True the last occurrence wins.
+    """
+    keyed = {}
+    occurrences = {}
+    for row in rows:
+        key = tuple(row[column] for column in key_columns)
+        if not unique:
+            n = occurrences.get(key, 0)
+            occurrences[key] = n + 1
+            key = key + (n,)
+        keyed[key] = row
+    return keyed
+
+
+def sync_table(name, chunks, to_mapping, model, key_columns):
+    """Make model's table match the source rows with the fewest writes.
+
+    Source rows are mapped like bulk_load does and matched to stored rows on
+    ``key_columns``. Each side is hashed over the mapped columns: new keys are
+    inserted, changed rows updated in place (keeping their primary key) and
+    keys no longer in the source deleted, all in one transaction. An
+    unchanged source produces no writes. Nothing is deleted when any source
+    row was rejected or the source has no rows at all, since a renamed
+    header or a truncated file would otherwise empty the table. Returns a
+    SyncReport.
+    """
+    report = SyncReport(name)
+    started = time.perf_counter()
+
+    mappings = []
+    for chunk in chunks:
+        for row in chunk.to_dict('records'):
+            try:
+                mapping = to_mapping(row)
+            except (ValueError, KeyError, TypeError) as e:
+                report.rejected += 1
+                logger.warning(f"{name}: rejected row {row}: {str(e)}")
+                continue
+            if mapping is not None:
+                mappings.append(mapping)
+
+    table = model.__table__
+    pk = list(table.primary_key.columns)[0]
+    unique = pk.name in key_columns
+    columns = list(mappings[0]) if mappings else list(key_columns)
+
+    source = keyed_rows(mappings, key_columns, unique)
+    stored_rows = db.session.query(pk.label('_pk'), *(table.c[c] for c in columns)).order_by(pk).all()
+    stored = keyed_rows([row._asdict() for row in stored_rows], key_columns, unique)
+
+    inserts, updates = [], []
+    for key, mapping in source.items():
+        current = stored.get(key)
+        if current is None:
+            inserts.append(mapping)
+        elif row_hash(mapping[c] for c in columns) != row_hash(current[c] for c in columns):
+            updates.append({pk.name: current['_pk'], **mapping})
+        else:
+            report.unchanged += 1
+    deletes = [row['_pk'] for key, row in stored.items() if key not in source]
+    if deletes and (report.rejected or not source):
+        logger.warning(f"{name}: keeping {len(deletes)} rows missing from the source "
+                       f"({report.rejected} rejected, {len(source)} read)")
+        deletes = []
+
+    try:
+        if inserts:
+            db.session.execute(insert(model), inserts)
+        if updates:
+            db.session.execute(update_statement(model), updates)
+        for start in range(0, len(deletes), 500):
+            db.session.execute(delete(model).where(pk.in_(deletes[start:start + 500])))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    report.inserted, report.updated, report.deleted = len(inserts), len(updates), len(deletes)
+    report.seconds = time.perf_counter() - started
+    logger.info(str(report))
+    return report
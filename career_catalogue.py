@@ -0,0 +1,213 @@
+import hashlib
+import io
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from ml.feature_engineering import parse_skills, skill_bitsets
+from skills import skill_vocabulary
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATA_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'data', 'career_recommendation_with_courses.csv'
+)
+
+TRAIT_COLUMNS = ['Dominance', 'Extraversion', 'Patience', 'Formality']
+
+
+class CatalogueSnapshot:
+    """Immutable, parsed view of the career dataset.
+
+    Rows keep the order of the CSV. Career names are interned: ``career_codes``
+    indexes into ``career_names`` so repeated titles are stored once. Key skill
+    sets are interned the same way: ``skill_rows`` indexes each row's set in
+    ``skill_bits``, one bitset per distinct set over skills.skill_vocabulary
+    (shape (sets, words)). ``skill_set_counts`` holds each set's number of
+    skills and ``skill_counts`` each row's; a skill missing from the
+    vocabulary counts but can never match. ``skill_names`` lists the skills
+    in use.
+    """
+
+    __slots__ = (
+        'version', 'career_names', 'career_codes', 'traits',
+        'skill_names', 'skill_rows', 'skill_bits', 'skill_set_counts', 'skill_counts', 'loaded_at'
+    )
+
+    def __init__(self, version, career_names, career_codes, traits, skill_names, skill_rows, skill_bits,
+                 skill_set_counts):
+        self.version = version
+        self.career_names = career_names
+        self.career_codes = career_codes
+        self.traits = traits
+        self.skill_names = skill_names
+        self.skill_rows = skill_rows
+        self.skill_bits = skill_bits
+        self.skill_set_counts = skill_set_counts
+        self.skill_counts = skill_set_counts[skill_rows]
+        self.skill_counts.setflags(write=False)
+        self.loaded_at = time.time()
+
+    def __len__(self):
+        return len(self.career_codes)
+
+    def career(self, row):
+        """Return the career title of a row"""
+        return self.career_names[self.career_codes[row]]
+
+
+def parse_catalogue(raw, version):
+    """Parse the raw CSV bytes into a CatalogueSnapshot"""
+    df = pd.read_csv(io.BytesIO(raw))
+
+    codes, names = pd.factorize(df['Recommended Career'])
+    career_names = tuple(str(name) for name in names)
+
+    traits = df[TRAIT_COLUMNS].to_numpy()
+    if np.issubdtype(traits.dtype, np.integer):
+        traits = traits.astype(np.int16)
+    else:
+        traits = traits.astype(np.float64)
+    traits.setflags(write=False)
+
+    career_codes = codes.astype(np.int32)
+    career_codes.setflags(write=False)
+
+    # Split on "," and strip, the same as users' and courses' skills
+    skill_sets = {}
+    skill_rows = np.array([
+        skill_sets.setdefault(parse_skills(str(value)) if pd.notna(value) else frozenset(), len(skill_sets))
+        for value in df['Key Skills']
+    ], dtype=np.intp)
+    skill_rows.setflags(write=False)
+    skill_names = tuple(sorted(frozenset().union(*skill_sets)))
+    skill_bits = skill_bitsets(list(skill_sets), skill_vocabulary.ids)
+    skill_bits.setflags(write=False)
+    skill_set_counts = np.array([len(skills) for skills in skill_sets], dtype=np.int32)
+    skill_set_counts.setflags(write=False)
+
+    return CatalogueSnapshot(
+        version, career_names, career_codes, traits, skill_names, skill_rows, skill_bits, skill_set_counts
+    )
+
+
+class CareerCatalogue:
+    """Process-wide cache of the career dataset.
+
+    The file is parsed once into a CatalogueSnapshot. Every ``check_interval``
+    seconds a reader stats the file; if the mtime or size moved, the contents
+    are hashed and, when the hash differs, re-parsed and swapped in. Only one
+    thread reloads at a time and other readers keep using the current snapshot
+    meanwhile, so readers never block once the first load has happened.
+
+    A file that cannot be read or parsed after the first load keeps the
+    current snapshot; a file that fails to parse is not parsed again until
+    it changes.
+    """
+
+    def __init__(self, path=DEFAULT_DATA_PATH, check_interval=1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._snapshot = None
+        self._stat_key = None
+        self._next_check = 0.0
+        self._reload_lock = threading.Lock()
+        self._counters = {
+            'hits': 0,
+            'reloads': 0,
+            'unchanged_checks': 0,
+            'parse_errors': 0,
+            'parse_seconds_total': 0.0,
+            'parse_seconds_last': 0.0,
+        }
+
+    def snapshot(self):
+        """Return the current snapshot, reloading it first if the file changed.
+
+        A call served without parsing counts as a hit. Raises FileNotFoundError
+        if the file is missing and nothing was loaded yet.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._reload_lock:
+                if self._snapshot is None:
+                    self._reload()
+                return self._snapshot
+
+        if time.monotonic() >= self._next_check and self._reload_lock.acquire(blocking=False):
+            try:
+                self._reload()
+            except OSError as e:
+                logger.warning(f"Keeping career catalogue {snapshot.version[:12]}: {str(e)}")
+            finally:
+                self._reload_lock.release()
+            if self._snapshot is not snapshot:
+                return self._snapshot
+
+        self._counters['hits'] += 1
+        return snapshot
+
+    def invalidate(self):
+        """Force the next snapshot() call to re-check the file"""
+        self._next_check = 0.0
+
+    @property
+    def version(self):
+        return self.snapshot().version
+
+    def stats(self):
+        """Return counters describing cache behaviour"""
+        snapshot = self._snapshot
+        stats = dict(self._counters)
+        stats['version'] = snapshot.version if snapshot else None
+        stats['rows'] = len(snapshot) if snapshot else 0
+        return stats
+
+    def _reload(self):
+        """Re-stat, hash and, if needed, re-parse the file. Caller holds the lock."""
+        self._next_check = time.monotonic() + self.check_interval
+
+        stat = os.stat(self.path)
+        stat_key = (stat.st_mtime_ns, stat.st_size)
+        if self._snapshot is not None and stat_key == self._stat_key:
+            return
+
+        with open(self.path, 'rb') as f:
+            raw = f.read()
+        version = hashlib.sha256(raw).hexdigest()
+
+        if self._snapshot is not None and version == self._snapshot.version:
+            # Touched but not modified
+            self._stat_key = stat_key
+            self._counters['unchanged_checks'] += 1
+            return
+
+        started = time.perf_counter()
+        try:
+            snapshot = parse_catalogue(raw, version)
+        except Exception as e:
+            if self._snapshot is None:
+                raise
+            # Remember the bad file so it is not parsed on every check
+            self._stat_key = stat_key
+            self._counters['parse_errors'] += 1
+            logger.error(
+                f"Keeping career catalogue {self._snapshot.version[:12]}: cannot parse {self.path}: "
+                f"{type(e).__name__}: {str(e)}"
+            )
+            return
+        elapsed = time.perf_counter() - started
+
+        self._snapshot = snapshot
+        self._stat_key = stat_key
+        self._counters['reloads'] += 1
+        self._counters['parse_seconds_last'] = elapsed
+        self._counters['parse_seconds_total'] += elapsed
+        logger.info(f"Loaded career catalogue {version[:12]} ({len(snapshot)} rows) in {elapsed * 1000:.1f}ms")
+
+
+catalogue = CareerCatalogue()
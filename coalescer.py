@@ -0,0 +1,131 @@
+import logging
+import threading
+import time
+from collections import Counter
+
+from password_service import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (in milliseconds) of the queueing delay histogram buckets
+DELAY_BUCKETS_MS = (0.5, 1, 2, 3, 5, 10, 25, 50)
+
+
+class _Batch:
+    __slots__ = ('key', 'items', 'enqueued', 'results', 'error', 'full', 'done')
+
+    def __init__(self, key):
+        self.key = key
+        self.items = []
+        self.enqueued = []
+        self.results = None
+        self.error = None
+        self.full = threading.Event()
+        self.done = threading.Event()
+
+
+class BatchCoalescer:
+    """Collect concurrent calls for a short window and run them as one batch.
+
+    ``run(key, items)`` must return one result per item, in order. The first
+    caller to arrive opens a batch and becomes its leader: it waits up to
+    ``window_ms`` (less if ``max_batch`` items arrive first), runs the batch
+    on its own thread and hands each waiting caller its result, or re-raises
+    the batch's exception in every caller. Only calls with an equal ``key``
+    share a batch; a call whose key differs from the open batch runs alone.
+
+    With ``window_ms`` of 0 every call runs alone, immediately. Batches are
+    per process.
+    """
+
+    def __init__(self, run, window_ms=3.0, max_batch=64):
+        self.run = run
+        self.window_ms = window_ms
+        self.max_batch = max_batch
+        self._open = None
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._sizes = Counter()
+        self._delay = LatencyHistogram(DELAY_BUCKETS_MS)
+        self._run_time = LatencyHistogram()
+        self._errors = 0
+
+    def configure(self, window_ms=None, max_batch=None):
+        if window_ms is not None:
+            self.window_ms = window_ms
+        if max_batch is not None:
+            self.max_batch = max_batch
+
+    def submit(self, key, item):
+        """Add item to a batch for key and return its result"""
+        if self.window_ms <= 0 or self.max_batch <= 1:
+            return self._execute(_Batch(key), [item], [time.perf_counter()])[0]
+
+        now = time.perf_counter()
+        with self._lock:
+            batch = self._open
+            leader = batch is None
+            if leader:
+                batch = self._open = _Batch(key)
+            elif batch.key != key:
+                batch = None
+            if batch is not None:
+                index = len(batch.items)
+                batch.items.append(item)
+                batch.enqueued.append(now)
+                if len(batch.items) >= self.max_batch:
+                    self._open = None
+                    batch.full.set()
+
+        if batch is None:
+            return self._execute(_Batch(key), [item], [now])[0]
+
+        if leader:
+            batch.full.wait(self.window_ms / 1000)
+            with self._lock:
+                if self._open is batch:
+                    self._open = None
+            try:
+                batch.results = self._execute(batch, batch.items, batch.enqueued)
+            except Exception as e:
+                batch.error = e
+            finally:
+                batch.done.set()
+        else:
+            batch.done.wait()
+
+        if batch.error is not None:
+            raise batch.error
+        return batch.results[index]
+
+    def _execute(self, batch, items, enqueued):
+        started = time.perf_counter()
+        try:
+            results = self.run(batch.key, items)
+        except Exception:
+            with self._stats_lock:
+                self._errors += 1
+            raise
+        finished = time.perf_counter()
+        with self._stats_lock:
+            self._sizes[len(items)] += 1
+            for queued in enqueued:
+                self._delay.observe((started - queued) * 1000)
+            self._run_time.observe((finished - started) * 1000)
+        return results
+
+    def stats(self):
+        with self._stats_lock:
+            batches = sum(self._sizes.values())
+            items = sum(size * n for size, n in self._sizes.items())
+            return {
+                'window_ms': self.window_ms,
+                'max_batch': self.max_batch,
+                'batches': batches,
+                'items': items,
+                'mean_batch_size': round(items / batches, 2) if batches else 0.0,
+                'errors': self._errors,
+                'batch_sizes': {str(size): n for size, n in sorted(self._sizes.items())},
+                'queue_delay': self._delay.as_dict(),
+                'run_time': self._run_time.as_dict()
+            }
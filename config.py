@@ -1,56 +1,159 @@
+import atexit
+import json
 import os
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from database import database_url
+
+# Keep 1 in this many DEBUG records per call site
+DEFAULT_DEBUG_SAMPLE = 10
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, for log collectors"""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'process': record.process,
+            'thread': record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class DebugSampler(logging.Filter):
+    """Let through the first and then every ``every``-th DEBUG record of each call site.
+
+    Records at INFO and above always pass. An ``every`` of 1 keeps all of them.
+    """
+
+    def __init__(self, every=DEFAULT_DEBUG_SAMPLE):
+        super().__init__()
+        self.every = max(1, every)
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG or self.every == 1:
+            return True
+        site = (record.pathname, record.lineno)
+        with self._lock:
+            seen = self._seen.get(site, 0)
+            self._seen[site] = seen + 1
+        return seen % self.every == 0
+
 
 class Config:
     # Flask config
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-key-please-change'
     
     # Database config
-    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///db.sqlite'
+    SQLALCHEMY_DATABASE_URI = database_url()
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
-    # Logging config
+    # Logging config; the environment is FLASK_ENV and LOG_LEVEL overrides its level
     LOG_FOLDER = 'logs'
     LOG_FILENAME = 'app.log'
-    LOG_LEVEL = logging.DEBUG
+    LOG_LEVELS = {
+        'development': logging.DEBUG,
+        'production': logging.INFO,
+        'testing': logging.WARNING,
+    }
+    # Environments that also write LOG_FOLDER/LOG_FILENAME
+    LOG_TO_FILE = {'development': True, 'production': True, 'testing': False}
     LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     LOG_MAX_BYTES = 10_000_000  # 10MB
     LOG_BACKUP_COUNT = 5
+    # Keep 1 in LOG_DEBUG_SAMPLE DEBUG records per call site
+    LOG_DEBUG_SAMPLE = DEFAULT_DEBUG_SAMPLE
+
+    _log_listener = None
+    _log_handler = None
 
     @staticmethod
     def init_logging(app):
-        # Create logs directory if it doesn't exist
-        if not os.path.exists(Config.LOG_FOLDER):
-            os.makedirs(Config.LOG_FOLDER)
-
-        # Configure logging
-        formatter = logging.Formatter(Config.LOG_FORMAT)
-        
-        # File handler
-        file_handler = RotatingFileHandler(
-            os.path.join(Config.LOG_FOLDER, Config.LOG_FILENAME),
-            maxBytes=Config.LOG_MAX_BYTES,
-            backupCount=Config.LOG_BACKUP_COUNT
-        )
-        file_handler.setFormatter(formatter)
-        file_handler.setLevel(Config.LOG_LEVEL)
-        
-        # Console handler
-        console_handler = logging.StreamHandler()
-        console_handler.setFormatter(formatter)
-        console_handler.setLevel(Config.LOG_LEVEL)
-        
-        # Root logger
+        """Send the root logger's records through a queue to the console and a rotating file.
+
+        The request thread only filters and enqueues a record; a
+        QueueListener thread formats and writes it. Reads FLASK_ENV
+        (default production), LOG_LEVEL, LOG_JSON and LOG_DEBUG_SAMPLE from
+        the environment. Calling it again replaces the previous setup.
+        """
+        environment = os.environ.get('FLASK_ENV', 'production')
+        default_level = Config.LOG_LEVELS.get(environment, logging.INFO)
+        requested = os.environ.get('LOG_LEVEL', '').strip().upper()
+        # getLevelName maps known names to their number and anything else to a string
+        level = logging.getLevelName(requested) if requested else default_level
+        unknown_level = not isinstance(level, int)
+        if unknown_level:
+            level = default_level
+        if os.environ.get('LOG_JSON', 'false').lower() in ('1', 'true', 'yes'):
+            formatter = JsonFormatter()
+        else:
+            formatter = logging.Formatter(Config.LOG_FORMAT)
+
+        handlers = [logging.StreamHandler()]
+        if Config.LOG_TO_FILE.get(environment, True):
+            # Create logs directory if it doesn't exist
+            os.makedirs(Config.LOG_FOLDER, exist_ok=True)
+            handlers.append(RotatingFileHandler(
+                os.path.join(Config.LOG_FOLDER, Config.LOG_FILENAME),
+                maxBytes=Config.LOG_MAX_BYTES,
+                backupCount=Config.LOG_BACKUP_COUNT
+            ))
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        queue_handler = QueueHandler(queue.SimpleQueue())
+        queue_handler.addFilter(DebugSampler(int(os.environ.get('LOG_DEBUG_SAMPLE', Config.LOG_DEBUG_SAMPLE))))
+
+        Config.stop_logging()
         root_logger = logging.getLogger()
-        root_logger.setLevel(Config.LOG_LEVEL)
-        root_logger.addHandler(file_handler)
-        root_logger.addHandler(console_handler)
-        
+        root_logger.addHandler(queue_handler)
+        root_logger.setLevel(level)
+
+        Config._log_handler = queue_handler
+        Config._log_listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+        Config._log_listener.start()
+        app.extensions['log_listener'] = Config._log_listener
+
+        if unknown_level:
+            logging.getLogger(__name__).warning(
+                f"Ignoring unknown LOG_LEVEL {requested!r}; using {logging.getLevelName(level)}"
+            )
+
         # Werkzeug logger
         logging.getLogger('werkzeug').setLevel(logging.INFO)
+        # Statements are only logged when SQLALCHEMY_ECHO is on
+        logging.getLogger('sqlalchemy.engine').setLevel(logging.WARNING)
+
+    @staticmethod
+    def stop_logging():
+        """Flush the queued records and stop the listener thread"""
+        if Config._log_handler is not None:
+            logging.getLogger().removeHandler(Config._log_handler)
+            Config._log_handler = None
+        if Config._log_listener is not None:
+            Config._log_listener.stop()
+            for handler in Config._log_listener.handlers:
+                handler.close()
+            Config._log_listener = None
+
+
+atexit.register(Config.stop_logging)
 
-    TEST_CONFIG = {
+TEST_CONFIG = {
     "host": "http://localhost:5000",
     "test_user": {
         "email": "test@example.com",
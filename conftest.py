@@ -0,0 +1,34 @@
+# conftest.py
+import pytest
+from flask import Flask
+
+from extensions import db
+from models import User, ReferenceProfile
+from courses import course_index
+from reference_profiles import profile_index
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config.update(SQLALCHEMY_DATABASE_URI='sqlite://', SQLALCHEMY_TRACK_MODIFICATIONS=False)
+    db.init_app(app)
+    course_index.invalidate()
+    profile_index.invalidate()
+    with app.app_context():
+        db.create_all()
+        profiles = [
+            ReferenceProfile(name="Analyzer", dominance=7, extraversion=4, patience=6, formality=9),
+            ReferenceProfile(name="Altruist", dominance=6, extraversion=8, patience=7, formality=5),
+        ]
+        db.session.add_all(profiles)
+        db.session.flush()
+        skills = ["Programming, Data Structures", "Legal Research", "", None]
+        for i in range(8):
+            db.session.add(User(
+                first_name=f"User{i}", last_name="Test", email=f"user{i}@example.com", age=20,
+                password=b"x", skills=skills[i % len(skills)],
+                reference_profile_id=profiles[i % 2].id if i != 7 else None
+            ))
+        db.session.commit()
+        yield app
@@ -0,0 +1,68 @@
+import logging
+import threading
+
+from models import Course
+from skills import split_skills
+
+logger = logging.getLogger(__name__)
+
+
+def serialize_course(course):
+    """Shape a Course (with its University loaded) for the API"""
+    return {
+        "course": course.name,
+        "school": course.university.name if course.university else None,
+        "duration": course.duration,
+        "keySkills": split_skills(course.key_skills)
+    }
+
+
+class CourseIndex:
+    """In-process map from recommended_career to serialized courses.
+
+    The courses table is small and only changes when init_data reseeds it, so
+    the whole table is serialized once (one joined query) and requests are
+    answered from memory. The index is per process: init_data rebuilds it in
+    the process that reseeded, and every other worker keeps serving its old
+    index until it restarts. build() swaps in a new dict so readers never
+    see a partial index. Payload dicts are shared between requests and must
+    not be modified.
+    """
+
+    def __init__(self):
+        self._by_career = None
+        self._lock = threading.Lock()
+
+    def build(self):
+        """Load every course and its university and replace the index"""
+        by_career = {}
+        for course in Course.query.all():
+            by_career.setdefault(course.recommended_career, []).append(serialize_course(course))
+        self._by_career = {career: tuple(payloads) for career, payloads in by_career.items()}
+        logger.info(f"Built course index: {len(self._by_career)} careers")
+
+    def invalidate(self):
+        """Drop this process's index; the next lookup in it rebuilds it"""
+        self._by_career = None
+
+    def get(self, career):
+        """Return the serialized courses for a career (requires an app context on first use)"""
+        by_career = self._by_career
+        if by_career is None:
+            with self._lock:
+                if self._by_career is None:
+                    self.build()
+                by_career = self._by_career
+        return list(by_career.get(career, ()))
+
+
+course_index = CourseIndex()
+
+
+def get_courses_and_schools(career):
+    """Return the serialized courses leading to a career.
+
+    Served from course_index: no queries once the index is built. A course
+    whose university is missing gets school None.
+    """
+    return course_index.get(career)
@@ -1,3 +1,178 @@
+"""Database engine setup for the app, scripts and benchmarks.
+
+The database comes from DATABASE_URL (SQLite in db.sqlite by default).
+SQLite connections are tuned with pragmas run on every new connection:
+WAL lets readers carry on while one writer commits, synchronous=NORMAL
+only syncs at checkpoints in WAL mode (a crash can lose the last commits
+but never corrupts the file), and busy_timeout makes concurrent writers
+from other gunicorn workers wait for the lock instead of failing with
+"database is locked". PostgreSQL gets a sized connection pool whose
+connections are checked before use, so workers survive server restarts
+and idle connections dropped by the provider.
+
+Routes wrapped in read_only() read through a second engine when there is
+one: DATABASE_READ_URL (e.g. a PostgreSQL replica) or, for a SQLite file
+in WAL mode, a pool of read-only connections to the same file.
+"""
+import os
+from functools import wraps
+
+from sqlalchemy import create_engine as sqlalchemy_create_engine
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
 from extensions import db
+from read_routing import READ_ENGINE
+
+DEFAULT_DATABASE_URL = 'sqlite:///db.sqlite'
+
+# Applied to every SQLite connection; cache_size is negative to mean KiB
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,
+    'busy_timeout': 5000,
+}
+
+# The read-only SQLite pool shares the file, and so its journal mode, with the primary
+SQLITE_READ_PRAGMAS = {
+    'query_only': 1,
+    'mmap_size': SQLITE_PRAGMAS['mmap_size'],
+    'cache_size': SQLITE_PRAGMAS['cache_size'],
+    'busy_timeout': SQLITE_PRAGMAS['busy_timeout'],
+}
+
+# Per worker process, shared by its request threads
+POOL_SETTINGS = {
+    'pool_size': 5,
+    'max_overflow': 5,
+    'pool_timeout': 10,
+    'pool_recycle': 1800,
+}
+
+
+def database_url(url=None):
+    """The SQLAlchemy URL to use: url, else DATABASE_URL, else the local SQLite file.
+
+    Render and Heroku hand out postgres:// URLs, which SQLAlchemy no longer accepts.
+    """
+    url = url or os.environ.get('DATABASE_URL') or DEFAULT_DATABASE_URL
+    if url.startswith('postgres://'):
+        url = 'postgresql://' + url[len('postgres://'):]
+    return url
+
+
+def read_database_url(url, read_url=None, pragmas=None):
+    """URL of the engine for read-only requests, or None to read from the primary.
+
+    read_url wins when given. Otherwise a SQLite file whose pragmas put it
+    in WAL mode, where readers never wait for the writer, is opened again
+    read-only.
+    """
+    if read_url:
+        return database_url(read_url)
+    parsed = make_url(url)
+    if parsed.get_backend_name() != 'sqlite' or parsed.database in (None, '', ':memory:'):
+        return None
+    if str((pragmas or {}).get('journal_mode', '')).upper() != 'WAL' or parsed.query.get('uri'):
+        return None
+    return f"sqlite:///file:{parsed.database}?mode=ro&uri=true"
+
+
+def engine_options(url, pool=None):
+    """create_engine keyword arguments for url's backend; pool overrides POOL_SETTINGS"""
+    backend = make_url(url).get_backend_name()
+    if backend == 'postgresql':
+        return {**POOL_SETTINGS, **(pool or {}), 'pool_pre_ping': True}
+    return {}
+
+
+def sqlite_pragmas(pragmas):
+    """A 'connect' listener running the given pragmas on each new SQLite connection"""
+    statements = [f"PRAGMA {name}={value}" for name, value in pragmas.items()]
+
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+    return on_connect
+
+
+def configure_engine(engine, pragmas=None):
+    """Attach the SQLite pragmas to engine; other backends are left alone"""
+    if engine.dialect.name == 'sqlite':
+        pragmas = SQLITE_PRAGMAS if pragmas is None else pragmas
+        if pragmas:
+            event.listen(engine, 'connect', sqlite_pragmas(pragmas))
+    return engine
+
+
+def create_engine(url=None, pragmas=None, pool=None, **kwargs):
+    """A standalone engine configured like the app's, for scripts and benchmarks"""
+    url = database_url(url)
+    options = {**engine_options(url, pool), **kwargs}
+    return configure_engine(sqlalchemy_create_engine(url, **options), pragmas)
+
+
+def init_database(app):
+    """Configure and initialise db for app.
+
+    Reads SQLALCHEMY_DATABASE_URI (defaulting to database_url()), the
+    DATABASE_POOL_* settings, SQLITE_PRAGMAS and DATABASE_READ_URL from
+    app.config; setting SQLITE_PRAGMAS to {} keeps SQLite's defaults. The
+    read engine, if any, is kept in app.extensions[READ_ENGINE].
+    """
+    url = database_url(app.config.get('SQLALCHEMY_DATABASE_URI'))
+    pool = {
+        name: app.config[key]
+        for name, key in (
+            ('pool_size', 'DATABASE_POOL_SIZE'),
+            ('max_overflow', 'DATABASE_MAX_OVERFLOW'),
+            ('pool_timeout', 'DATABASE_POOL_TIMEOUT'),
+            ('pool_recycle', 'DATABASE_POOL_RECYCLE'),
+        )
+        if app.config.get(key) is not None
+    }
+    pragmas = app.config.get('SQLITE_PRAGMAS')
+    pragmas = SQLITE_PRAGMAS if pragmas is None else pragmas
+    app.config['SQLALCHEMY_DATABASE_URI'] = url
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        **engine_options(url, pool), **app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {})
+    }
+    db.init_app(app)
+    with app.app_context():
+        for engine in db.engines.values():
+            configure_engine(engine, pragmas)
+        # Flask-SQLAlchemy has resolved a relative SQLite path against the instance folder
+        primary_url = db.engine.url.render_as_string(hide_password=False)
+
+    read_url = read_database_url(primary_url, app.config.get('DATABASE_READ_URL'), pragmas)
+    if read_url:
+        app.extensions[READ_ENGINE] = create_engine(
+            read_url, pragmas=SQLITE_READ_PRAGMAS, pool=pool, echo=app.config.get('SQLALCHEMY_ECHO', False)
+        )
+    else:
+        app.extensions.pop(READ_ENGINE, None)
+
+
+def read_only(f):
+    """Route decorator: the request's reads may use the read engine.
 
-# This file can be empty as we're just using it to avoid circular imports
\ No newline at end of file
+    Only for routes that never write: a read made before the first write,
+    such as a cache check that is refilled on a miss, may see a replica
+    that lags behind. Put it above token_required, which names the user so
+    that a user who has just written keeps reading from the primary.
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        db.session.info['read_only'] = True
+        try:
+            return f(*args, **kwargs)
+        finally:
+            db.session.info.pop('read_only', None)
+    return decorated
@@ -1,5 +1,7 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
 
-db = SQLAlchemy()
-cors = CORS(supports_credentials=True)
\ No newline at end of file
+from read_routing import RoutingSession
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+cors = CORS(supports_credentials=True)
@@ -13,7 +13,7 @@ function CareerPath() {
     useEffect(() => {
         const fetchCareerPath = async () => {
             try {
-                const response = await api.get('/career_path');
+                const response = await api.get('/career_path', { params: { k: 4 } });
                 if (response.data.redirect) {
                     navigate(response.data.redirect);
                     return;
@@ -41,6 +41,20 @@ function CareerPath() {
                         <h2 className="text-2xl font-bold mb-4">Career Match: {careerData.current_career}</h2>
                         <p className="text-lg text-indigo-600">Match Rating: {careerData.match_rating}%</p>
                     </div>
+
+                    {careerData.alternatives?.length > 0 && (
+                        <div className="bg-white p-6 rounded-lg shadow mb-6">
+                            <h2 className="text-xl font-bold mb-4">Other Careers to Consider</h2>
+                            <ul className="space-y-2">
+                                {careerData.alternatives.map((alternative) => (
+                                    <li key={alternative.career} className="flex justify-between">
+                                        <span className="font-medium">{alternative.career}</span>
+                                        <span className="text-indigo-600">{alternative.rating}%</span>
+                                    </li>
+                                ))}
+                            </ul>
+                        </div>
+                    )}
                     
                     <div className="space-y-6">
                         <h2 className="text-2xl font-bold text-gray-900">Career Progression</h2>
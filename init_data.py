@@ -1,6 +1,10 @@
-import pandas as pd
 from extensions import db
-from models import ReferenceProfile, University, Course
+from models import Adjective, ReferenceProfile, University, Course
+from courses import course_index
+from reference_profiles import profile_index
+from skills import format_skills, skill_vocabulary
+from bulk_load import DEFAULT_CHUNK_SIZE, bulk_load, stream_csv, sync_table
+from assessments import adjective_vocabulary
 import logging
 import os
 
@@ -11,7 +15,8 @@ def check_data_files():
     required_files = [
         'data/Reference_profiles.csv',
         'data/Universities.csv',
-        'data/courses_cleaned.csv'
+        'data/courses_cleaned.csv',
+        'data/adjective_factors.csv'
     ]
     
     missing_files = []
@@ -24,118 +29,146 @@ def check_data_files():
         return False
     return True
 
-def init_reference_profiles(app):
-    """Initialize reference profiles from CSV data with personality scores"""
+# Personality scores for each profile group
+PERSONALITY_SCORES = {
+    'Analytical': {'dominance': 7, 'extraversion': 4, 'patience': 6, 'formality': 9},
+    'Social': {'dominance': 6, 'extraversion': 8, 'patience': 7, 'formality': 5},
+    'Persistent': {'dominance': 8, 'extraversion': 5, 'patience': 8, 'formality': 7},
+    'Stabilizing': {'dominance': 5, 'extraversion': 6, 'patience': 9, 'formality': 8}
+}
+
+def clean_value(value):
+    """Strip whitespace and trailing commas; missing values become ''"""
+    return str(value).strip().rstrip(',') if value is not None else ''
+
+def reference_profile_mapping(row, seen):
+    """Map a Reference_profiles.csv row; only the first row of each profile is kept"""
+    name = row['Profiles']
+    if name is None or name in seen:
+        return None
+    seen.add(name)
+    
+    scores = PERSONALITY_SCORES.get(row['Reference Groups'], PERSONALITY_SCORES['Analytical'])
+    return {
+        'name': name,
+        'description': row['Description'] if row['Description'] is not None else f"A {name} profile type",
+        **scores
+    }
+
+def university_mapping(row):
+    """Map a Universities.csv row"""
+    university_id = clean_value(row['ID'])
+    if not university_id:
+        raise ValueError("missing ID")
+    return {
+        'id': university_id,
+        'name': str(row['Name']).strip(),
+        'tel_number': clean_value(row['Tel Number']),
+        'website': clean_value(row['Website'])
+    }
+
+def course_mapping(row):
+    """Map a courses_cleaned.csv row"""
+    row = {column: clean_value(value) for column, value in row.items()}
+    if not row['Course'] or not row['Universities_ID']:
+        raise ValueError("missing Course or Universities_ID")
+    return {
+        'name': row['Course'],
+        'university_id': row['Universities_ID'],
+        'faculty': row['Faculty/Department'],
+        'duration': int(float(row['Duration'])) if row['Duration'] else 0,
+        'recommended_career': row['Recommended Career'],
+        'key_skills': format_skills(row['Key Skills']),
+        'skill_bits': skill_vocabulary.pack(row['Key Skills'])
+    }
+
+def init_reference_profiles(app, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Sync reference profiles with the CSV data, adding personality scores"""
     try:
-        # Read the CSV file
-        df = pd.read_csv('data/Reference_profiles.csv', delimiter=';')
-        
         with app.app_context():
-            # Clear existing profiles first
-            ReferenceProfile.query.delete()
-            
-            # Define personality scores for each profile group
-            personality_scores = {
-                'Analytical': {'dominance': 7, 'extraversion': 4, 'patience': 6, 'formality': 9},
-                'Social': {'dominance': 6, 'extraversion': 8, 'patience': 7, 'formality': 5},
-                'Persistent': {'dominance': 8, 'extraversion': 5, 'patience': 8, 'formality': 7},
-                'Stabilizing': {'dominance': 5, 'extraversion': 6, 'patience': 9, 'formality': 8}
-            }
-            
-            for _, row in df.dropna(subset=['Profiles']).drop_duplicates(subset=['Profiles']).iterrows():
-                group = row['Reference Groups']
-                scores = personality_scores.get(group, personality_scores['Analytical'])
-                
-                profile = ReferenceProfile(
-                    name=row['Profiles'],
-                    description=row['Description'] if pd.notna(row['Description']) else f"A {row['Profiles']} profile type",
-                    dominance=scores['dominance'],
-                    extraversion=scores['extraversion'],
-                    patience=scores['patience'],
-                    formality=scores['formality']
-                )
-                db.session.add(profile)
-            
-            db.session.commit()
+            # Profiles are matched by name so users keep their reference_profile_id
+            seen = set()
+            report = sync_table(
+                'Reference profiles',
+                stream_csv('data/Reference_profiles.csv', chunk_size, delimiter=';'),
+                lambda row: reference_profile_mapping(row, seen),
+                ReferenceProfile,
+                key_columns=('name',)
+            )
+            profile_index.invalidate()
             logger.info("Reference profiles initialized successfully")
+            return report
             
     except Exception as e:
         logger.error(f"Error initializing reference profiles: {str(e)}")
         db.session.rollback()
 
-def init_universities(app):
-    """Initialize universities from CSV"""
+def init_universities(app, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Sync universities with the CSV"""
     try:
-        df = pd.read_csv('data/Universities.csv')
-        
         with app.app_context():
-            University.query.delete()
-            
-            for _, row in df.iterrows():
-                university = University(
-                    id=str(row['ID']).strip(),
-                    name=str(row['Name']).strip(),
-                    tel_number=str(row['Tel Number']).strip(),
-                    website=str(row['Website']).strip() if pd.notna(row['Website']) else ''
-                )
-                db.session.add(university)
-            
-            db.session.commit()
+            report = sync_table(
+                'Universities',
+                stream_csv('data/Universities.csv', chunk_size),
+                university_mapping,
+                University,
+                key_columns=('id',)
+            )
             logger.info("Universities initialized successfully")
             
+            # School names are baked into the serialized courses
+            course_index.build()
+            return report
+            
     except Exception as e:
         logger.error(f"Error initializing universities: {str(e)}")
         db.session.rollback()
 
-def init_courses(app):
-    """Initialize courses from CSV"""
+def init_courses(app, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Sync courses with the CSV"""
     try:
-        # Read the CSV file with different error handling
-        df = pd.read_csv('data/courses_cleaned.csv', 
-                        delimiter=';', 
-                        on_bad_lines='skip')
-        
-        # Clean up the Key Skills column
-        df['Key Skills'] = df['Key Skills'].apply(lambda x: str(x).split(',')[0] if pd.notna(x) else '')
-        
-        # Remove any trailing commas and clean up the data
-        for column in df.columns:
-            df[column] = df[column].apply(lambda x: str(x).strip().rstrip(',') if pd.notna(x) else '')
-        
         with app.app_context():
-            Course.query.delete()
-            
-            for _, row in df.iterrows():
-                try:
-                    # Skip malformed rows
-                    if pd.isna(row['Course']) or pd.isna(row['Universities_ID']):
-                        continue
-                        
-                    course = Course(
-                        name=str(row['Course']).strip(),
-                        university_id=str(row['Universities_ID']).strip(),
-                        faculty=str(row['Faculty/Department']).strip(),
-                        duration=int(float(row['Duration'])) if pd.notna(row['Duration']) else 0,
-                        recommended_career=str(row['Recommended Career']).strip(),
-                        key_skills=str(row['Key Skills']).strip()
-                    )
-                    db.session.add(course)
-                except Exception as e:
-                    logger.error(f"Error processing course {row['Course']}: {str(e)}")
-                    logger.error(f"Row data: {row.to_dict()}")
-                    continue
-            
-            try:
-                db.session.commit()
-                logger.info("Courses initialized successfully")
-            except Exception as e:
-                logger.error(f"Error committing courses: {str(e)}")
-                db.session.rollback()
+            # Lines with the wrong number of fields are counted and skipped
+            bad_lines = []
+            report = sync_table(
+                'Courses',
+                stream_csv(
+                    'data/courses_cleaned.csv', chunk_size,
+                    delimiter=';', engine='python', on_bad_lines=lambda line: bad_lines.append(line)
+                ),
+                course_mapping,
+                Course,
+                key_columns=('name', 'university_id', 'recommended_career')
+            )
+            report.rejected += len(bad_lines)
+            logger.info("Courses initialized successfully")
+            course_index.build()
+            return report
             
     except Exception as e:
         logger.error(f"Error initializing courses: {str(e)}")
         db.session.rollback()
 
+def init_adjectives(app, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Store the assessment adjectives from the CSV; stored ones keep their ids"""
+    try:
+        with app.app_context():
+            report = bulk_load(
+                'Adjectives',
+                stream_csv('data/adjective_factors.csv', chunk_size),
+                lambda row: {'word': row['Adjective']},
+                Adjective,
+                conflict_key='word',
+                update=False
+            )
+            adjective_vocabulary.clear()
+            logger.info("Adjectives initialized successfully")
+            return report
+
+    except Exception as e:
+        logger.error(f"Error initializing adjectives: {str(e)}")
+        db.session.rollback()
+
 def init_database(app):
     """Initialize all database tables"""
     try:
@@ -149,6 +182,7 @@ def init_database(app):
             init_reference_profiles(app)
             init_universities(app)
             init_courses(app)
+            init_adjectives(app)
             
             # Verify data
             profiles_count = ReferenceProfile.query.count()
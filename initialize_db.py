@@ -1,5 +1,6 @@
 import traceback
 from app import app, db
+import init_data
 from models import ReferenceProfile
 import logging
 
@@ -50,6 +51,9 @@ def init_database():
             db.session.commit()
             logger.info("Created default reference profiles")
 
+            # Assessment answers refer to these
+            init_data.init_adjectives(app)
+
         except Exception as e:
             logger.error(f"Error initializing database: {str(e)}")
             logger.error(traceback.format_exc())
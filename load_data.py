@@ -1,75 +1,76 @@
-from flask import Flask, jsonify, request
-import csv
 from extensions import db
 from app import app
 from models import ReferenceProfile, University, Course
+from bulk_load import bulk_load, stream_csv
+from skills import format_skills, skill_vocabulary
 
 with app.app_context():
     db.create_all()
 
-def load_reference_profiles():
-    with open('data/reference_profiles.csv', 'r', encoding='utf-8') as file:
-        reader = csv.DictReader(file, delimiter=';')
-        print("Detected headers for reference profiles:", reader.fieldnames)
+def int_or_none(value):
+    return int(value) if value not in (None, '') else None
 
-        for row in reader:
-            if row.get("Profiles"):
-                profile = ReferenceProfile(
-                    name=row.get("Profiles"),
-                    description=row.get("Description", ""),
-                    dominance=int(row.get("Dominance", 0)) if row.get("Dominance") else None,
-                    extraversion=int(row.get("Extraversion", 0)) if row.get("Extraversion") else None,
-                    patience=int(row.get("Patience", 0)) if row.get("Patience") else None,
-                    formality=int(row.get("Formality", 0)) if row.get("Formality") else None
-                )
-                db.session.add(profile)
+def load_reference_profiles():
+    def to_mapping(row):
+        if not row.get("Profiles"):
+            return None
+        return {
+            'name': row["Profiles"],
+            'description': row.get("Description") or "",
+            'dominance': int_or_none(row.get("Dominance")),
+            'extraversion': int_or_none(row.get("Extraversion")),
+            'patience': int_or_none(row.get("Patience")),
+            'formality': int_or_none(row.get("Formality"))
+        }
 
-        db.session.commit()
-    print("Reference profiles loaded successfully.")
+    report = bulk_load(
+        'Reference profiles',
+        stream_csv('data/Reference_profiles.csv', delimiter=';', encoding='utf-8'),
+        to_mapping,
+        ReferenceProfile
+    )
+    print(f"Reference profiles loaded successfully. {report}")
 
 def load_universities():
-    with open('data/universities.csv', 'r') as file:
-        reader = csv.DictReader(file)
-        for row in reader:
-            if not University.query.filter_by(id=row["ID"]).first():
-                university = University(
-                    id=row["ID"],
-                    name=row["Name"],
-                    tel_number=row["Tel Number"],
-                    website=row["Website"]
-                )
-                db.session.add(university)
-        db.session.commit()
-    print("Universities loaded successfully.")
+    # Existing universities are left untouched
+    report = bulk_load(
+        'Universities',
+        stream_csv('data/Universities.csv', dtype=str, keep_default_na=False),
+        lambda row: {
+            'id': row["ID"],
+            'name': row["Name"],
+            'tel_number': row["Tel Number"],
+            'website': row["Website"]
+        },
+        University,
+        conflict_key='id',
+        update=False
+    )
+    print(f"Universities loaded successfully. {report}")
 
 # Load Courses
 def load_courses():
-    with open('data/courses_cleaned.csv', 'r', encoding='utf-8-sig') as file:
-        reader = csv.DictReader(file, delimiter=';')
-        print("Detected headers for courses:", reader.fieldnames)
-
-        for row in reader:
-            if row.get("Course"):
-                try:
-
-                    course = Course(
-                        name=row["Course"].strip(),
-                        university_id=row["Universities_ID"].strip(),
-                        faculty=row["Faculty/Derpatment"].strip(),
-                        duration=int(row["Duration"].strip()) if row["Duration"].strip().isdigit() else None,
-                        recommended_career=row["Recommended Career"].strip(),
-                        key_skills=row["Key Skills"].strip()
-                    )
-                    db.session.add(course)
-                except Exception as e:
-                    print(f"Error loading row {row}: {e}")
+    def to_mapping(row):
+        if not row.get("Course"):
+            return None
+        duration = (row["Duration"] or "").strip()
+        return {
+            'name': row["Course"].strip(),
+            'university_id': row["Universities_ID"].strip(),
+            'faculty': row["Faculty/Department"].strip(),
+            'duration': int(duration) if duration.isdigit() else None,
+            'recommended_career': row["Recommended Career"].strip(),
+            'key_skills': format_skills(row["Key Skills"]),
+            'skill_bits': skill_vocabulary.pack(row["Key Skills"])
+        }
 
-        try:
-            db.session.commit()
-            print("Courses loaded successfully.")
-        except Exception as e:
-            db.session.rollback()
-            print(f"Error committing courses to the database: {e}")
+    report = bulk_load(
+        'Courses',
+        stream_csv('data/courses_cleaned.csv', delimiter=';', encoding='utf-8-sig', dtype=str, keep_default_na=False),
+        to_mapping,
+        Course
+    )
+    print(f"Courses loaded successfully. {report}")
 
 with app.app_context():
     load_reference_profiles()
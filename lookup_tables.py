@@ -0,0 +1,128 @@
+import csv
+import json
+import logging
+import os
+import re
+from functools import lru_cache
+from types import MappingProxyType
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+ADJECTIVE_FACTORS_PATH = os.path.join(DATA_DIR, 'adjective_factors.csv')
+CAREER_PROGRESSIONS_PATH = os.path.join(DATA_DIR, 'career_progressions.json')
+
+# Factor for adjectives that are not in the table
+DEFAULT_FACTOR = "Dominance"
+
+
+def normalize_adjective(adjective):
+    """Lowercase, trim and join words with hyphens: ' Detail  Oriented' -> 'detail-oriented'"""
+    return re.sub(r'[\s_]+', '-', adjective.strip().lower())
+
+
+def adjective_spellings(path=ADJECTIVE_FACTORS_PATH):
+    """Yield (spelling, row) for every spelling of each adjective and alias in the table.
+
+    Each name is entered under its normalized form, the space separated form
+    and their capitalized and upper-case spellings, so the spellings clients
+    send resolve with a single dict lookup.
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            names = [row['Adjective']] + [a for a in (row['Aliases'] or '').split('|') if a]
+            for name in names:
+                key = normalize_adjective(name)
+                for spelling in (key, key.replace('-', ' ')):
+                    for variant in (spelling, spelling.capitalize(), spelling.title(), spelling.upper()):
+                        yield variant, row
+
+
+def load_adjective_factors(path=ADJECTIVE_FACTORS_PATH):
+    """Read the adjective table into a read-only spelling -> factor map"""
+    factors = {}
+    for spelling, row in adjective_spellings(path):
+        factors.setdefault(spelling, row['Factor'])
+    return MappingProxyType(factors)
+
+
+def load_adjective_words(path=ADJECTIVE_FACTORS_PATH):
+    """Read the adjective table into a read-only spelling -> adjective map"""
+    words = {}
+    for spelling, row in adjective_spellings(path):
+        words.setdefault(spelling, row['Adjective'])
+    return MappingProxyType(words)
+
+
+def load_career_progressions(path=CAREER_PROGRESSIONS_PATH):
+    """Read the career progression file into a read-only career -> stages map"""
+    with open(path, encoding='utf-8') as f:
+        paths = json.load(f)
+    return MappingProxyType({career: tuple(stages) for career, stages in paths.items()})
+
+
+ADJECTIVE_FACTORS = load_adjective_factors()
+ADJECTIVE_WORDS = load_adjective_words()
+CAREER_PROGRESSIONS = load_career_progressions()
+
+
+def get_factor(adjective):
+    """
+    Determine the behavioral factor associated with a given adjective.
+
+    Args:
+        adjective (str): A descriptive word characterizing behavior or personality.
+
+    Returns:
+        str: The corresponding behavioral factor, which can be one of the following:
+             "Dominance", "Extraversion", "Patience", or "Formality". Defaults to
+             "Dominance" if the adjective is not recognized.
+
+    Notes:
+        Logs a warning if an unrecognized adjective is encountered.
+    """
+    factor = ADJECTIVE_FACTORS.get(adjective)
+    if factor is None:
+        factor = ADJECTIVE_FACTORS.get(normalize_adjective(adjective))
+    if factor is None:
+        logger.warning(f"Unknown adjective encountered: {adjective}")
+        return DEFAULT_FACTOR
+    return factor
+
+
+def canonical_adjective(adjective):
+    """The adjective table's spelling of adjective, or None if it is not in the table"""
+    if not isinstance(adjective, str):
+        return None
+    word = ADJECTIVE_WORDS.get(adjective)
+    if word is None:
+        word = ADJECTIVE_WORDS.get(normalize_adjective(adjective))
+    return word
+
+
+@lru_cache(maxsize=1024)
+def generic_progression(career):
+    """Progression for careers without a defined path"""
+    logger.info(f"Generating generic career path for: {career}")
+    return (
+        {"title": f"Junior {career}", "years": 0, "salary": 40000},
+        {"title": career, "years": 2, "salary": 60000},
+        {"title": f"Senior {career}", "years": 5, "salary": 80000},
+        {"title": f"Lead {career}", "years": 8, "salary": 100000}
+    )
+
+
+def get_career_progression(career):
+    """
+    Return the career progression path for a given career.
+
+    Args:
+        career (str): The career title to get the progression for
+    Returns:
+        tuple of dict: Career stages with title, years of experience and salary.
+        The stages are shared between requests and must not be modified.
+    """
+    progression = CAREER_PROGRESSIONS.get(career)
+    if progression is None:
+        progression = generic_progression(career)
+    return progression
@@ -0,0 +1,95 @@
+# migrate_assessments.py
+"""Convert behavioral_assessments from text columns to encoded columns.
+
+Older databases store question_type, adjective and factor as strings on
+every row. This replaces them, in one transaction, with small integer codes
+for question type and factor and an adjective_id into the adjectives
+vocabulary, and stores every adjective of data/adjective_factors.csv that
+is missing. Running it on a migrated database only adds missing adjectives.
+
+Usage:
+    python migrate_assessments.py
+"""
+import argparse
+import logging
+import time
+
+from sqlalchemy import inspect, text
+
+from extensions import db
+from models import Adjective, BehavioralAssessment
+from assessments import FACTOR_CODES, QUESTION_TYPE_CODES, adjective_vocabulary
+from bulk_load import insert_statement
+
+logger = logging.getLogger(__name__)
+
+
+def needs_migration(connection):
+    columns = {c['name'] for c in inspect(connection).get_columns(BehavioralAssessment.__tablename__)}
+    return 'adjective' in columns and 'adjective_id' not in columns
+
+
+def code_case(column, codes):
+    """SQL CASE mapping a text column onto its code; anything else becomes NULL"""
+    whens = " ".join(f"WHEN '{name}' THEN {code}" for name, code in codes.items())
+    return f"CASE {column} {whens} END"
+
+
+def seed_adjectives(connection):
+    """Store the vocabulary's adjectives; existing rows keep their ids. Returns the number added."""
+    stored = set(connection.execute(text("SELECT word FROM adjectives")).scalars())
+    missing = [{'word': word} for word in adjective_vocabulary.words if word not in stored]
+    if missing:
+        # Concurrent workers may seed at the same time, so conflicts are skipped
+        connection.execute(insert_statement(Adjective, 'word', update=False), missing)
+    return len(missing)
+
+
+def migrate(connection):
+    """Encode behavioral_assessments in place; returns the number of rows.
+
+    Question types and factors outside the known enums are stored as NULL and
+    count for nothing when scoring, as they did before. Needs SQLite 3.35+
+    (DROP COLUMN) or PostgreSQL.
+    """
+    Adjective.__table__.create(connection, checkfirst=True)
+    seed_adjectives(connection)
+    if not needs_migration(connection):
+        return 0
+
+    table = BehavioralAssessment.__tablename__
+    connection.execute(text(
+        f"INSERT INTO adjectives (word) SELECT DISTINCT adjective FROM {table} "
+        f"WHERE adjective IS NOT NULL AND adjective NOT IN (SELECT word FROM adjectives)"
+    ))
+
+    connection.execute(text(f"ALTER TABLE {table} ADD COLUMN question_type_code SMALLINT"))
+    connection.execute(text(f"ALTER TABLE {table} ADD COLUMN factor_code SMALLINT"))
+    connection.execute(text(f"ALTER TABLE {table} ADD COLUMN adjective_id INTEGER REFERENCES adjectives (id)"))
+    copied = connection.execute(text(
+        f"UPDATE {table} SET "
+        f"question_type_code = {code_case('question_type', QUESTION_TYPE_CODES)}, "
+        f"factor_code = {code_case('factor', FACTOR_CODES)}, "
+        f"adjective_id = (SELECT adjectives.id FROM adjectives WHERE adjectives.word = {table}.adjective)"
+    )).rowcount
+
+    for column in ('question_type', 'factor', 'adjective'):
+        connection.execute(text(f"ALTER TABLE {table} DROP COLUMN {column}"))
+    connection.execute(text(f"ALTER TABLE {table} RENAME COLUMN question_type_code TO question_type"))
+    connection.execute(text(f"ALTER TABLE {table} RENAME COLUMN factor_code TO factor"))
+
+    for index in BehavioralAssessment.__table__.indexes:
+        index.create(connection, checkfirst=True)
+    return copied
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.parse_args()
+
+    from app import app
+    with app.app_context():
+        started = time.perf_counter()
+        with db.engine.begin() as connection:
+            copied = migrate(connection)
+        print(f"Migrated {copied} assessment answers in {time.perf_counter() - started:.2f}s")
@@ -0,0 +1,122 @@
+# migrate_indexes.py
+"""Add the indexes and foreign keys declared in models.py to an existing database.
+
+create_all only creates missing tables, so databases created before an
+index or foreign key was declared never get it. This creates every missing
+index (courses.recommended_career, courses.university_id, ...) and adds
+missing foreign keys (users.university_id -> universities.id).
+
+SQLite cannot add a constraint to an existing table, so a table missing a
+foreign key is rebuilt: created again under a temporary name from its
+model, filled with the old rows and renamed into place. PostgreSQL gets an
+ALTER TABLE ... ADD CONSTRAINT ... NOT VALID instead, which leaves existing
+rows unchecked, and universities.id is narrowed to VARCHAR(10) to match
+the columns that reference it (SQLite has no column lengths to change).
+Everything runs in one transaction; running it again does nothing.
+
+Usage:
+    python migrate_indexes.py
+"""
+import argparse
+import logging
+import time
+
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateTable
+
+from extensions import db
+import models  # noqa: F401 (registers every table)
+
+logger = logging.getLogger(__name__)
+
+
+def missing_foreign_keys(inspector, table):
+    """Foreign keys of table's model that the live table does not have"""
+    existing = {
+        (tuple(fk['constrained_columns']), fk['referred_table'])
+        for fk in inspector.get_foreign_keys(table.name)
+    }
+    return [
+        constraint for constraint in table.foreign_key_constraints
+        if (tuple(constraint.column_keys), constraint.referred_table.name) not in existing
+    ]
+
+
+def rebuild_sqlite_table(connection, table):
+    """Recreate a SQLite table from its model, keeping its rows"""
+    columns = [c['name'] for c in inspect(connection).get_columns(table.name)]
+    shared = ", ".join(f'"{c}"' for c in table.columns.keys() if c in columns)
+    temporary = f"_rebuild_{table.name}"
+    ddl = str(CreateTable(table).compile(dialect=connection.dialect)).strip()
+    connection.execute(text(ddl.replace(f"CREATE TABLE {table.name} ", f"CREATE TABLE {temporary} ", 1)))
+    connection.execute(text(f"INSERT INTO {temporary} ({shared}) SELECT {shared} FROM {table.name}"))
+    connection.execute(text(f"DROP TABLE {table.name}"))
+    connection.execute(text(f"ALTER TABLE {temporary} RENAME TO {table.name}"))
+
+
+def create_indexes(bind):
+    """Create every index declared on the models that does not exist yet; returns their names"""
+    inspector = inspect(bind)
+    created = []
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(bind)
+                created.append(index.name)
+    return created
+
+
+def migrate(connection):
+    """Add missing foreign keys and indexes; returns a list of the changes made"""
+    changes = []
+    dialect = connection.dialect.name
+    inspector = inspect(connection)
+
+    if dialect == 'postgresql':
+        id_type = {c['name']: c['type'] for c in inspector.get_columns('universities')}.get('id')
+        if id_type is not None and getattr(id_type, 'length', None) != 10:
+            connection.execute(text("ALTER TABLE universities ALTER COLUMN id TYPE VARCHAR(10)"))
+            changes.append("universities.id -> VARCHAR(10)")
+
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        missing = missing_foreign_keys(inspector, table)
+        if not missing:
+            continue
+        described = ", ".join(
+            f"{table.name}.{'/'.join(fk.column_keys)} -> {fk.referred_table.name}" for fk in missing
+        )
+        if dialect == 'sqlite':
+            rebuild_sqlite_table(connection, table)
+        elif dialect == 'postgresql':
+            for fk in missing:
+                columns = ", ".join(fk.column_keys)
+                referred = ", ".join(element.column.name for element in fk.elements)
+                connection.execute(text(
+                    f"ALTER TABLE {table.name} ADD CONSTRAINT fk_{table.name}_{'_'.join(fk.column_keys)} "
+                    f"FOREIGN KEY ({columns}) REFERENCES {fk.referred_table.name} ({referred}) NOT VALID"
+                ))
+        else:
+            raise NotImplementedError(f"Adding foreign keys is not supported on {dialect}")
+        changes.append(f"foreign key {described}")
+
+    changes.extend(f"index {name}" for name in create_indexes(connection))
+    return changes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.parse_args()
+
+    from app import app
+    with app.app_context():
+        started = time.perf_counter()
+        with db.engine.begin() as connection:
+            changes = migrate(connection)
+        for change in changes:
+            print(f"Added {change}")
+        print(f"{len(changes)} changes in {time.perf_counter() - started:.2f}s")
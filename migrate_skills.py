@@ -0,0 +1,75 @@
+# migrate_skills.py
+"""Add skill bitsets to users and courses.
+
+Older databases only have the comma separated skills strings, written with
+", " for users and "," or a single skill for courses. This adds a
+skill_bits column to both tables and, in one transaction, fills it from
+the strings using the interned vocabulary in data/skills.csv, rewriting
+the strings with ", " separators on the way. Running it again refreshes
+the bitsets, which is also what to do after appending skills to the
+vocabulary.
+
+Usage:
+    python migrate_skills.py
+"""
+import argparse
+import logging
+import time
+
+from sqlalchemy import inspect, text
+
+from extensions import db
+from models import Course, User
+from skills import format_skills, skill_vocabulary
+
+logger = logging.getLogger(__name__)
+
+# (model, skills column)
+SKILL_TABLES = ((User, 'skills'), (Course, 'key_skills'))
+
+
+def missing_columns(connection):
+    """Tables that do not have a skill_bits column yet"""
+    inspector = inspect(connection)
+    return [
+        model.__tablename__ for model, _ in SKILL_TABLES
+        if 'skill_bits' not in {c['name'] for c in inspector.get_columns(model.__tablename__)}
+    ]
+
+
+def migrate(connection):
+    """Add and fill skill_bits; returns the number of rows written per table"""
+    missing = missing_columns(connection)
+    for table in missing:
+        binary = db.LargeBinary().compile(dialect=connection.dialect)
+        connection.execute(text(f"ALTER TABLE {table} ADD COLUMN skill_bits {binary}"))
+
+    written = {}
+    for model, column in SKILL_TABLES:
+        table = model.__tablename__
+        rows = [
+            {'row_id': row_id, 'skills': format_skills(skills), 'skill_bits': skill_vocabulary.pack(skills)}
+            for row_id, skills in connection.execute(
+                text(f"SELECT id, {column} FROM {table} WHERE {column} IS NOT NULL")
+            )
+        ]
+        if rows:
+            connection.execute(
+                text(f"UPDATE {table} SET {column} = :skills, skill_bits = :skill_bits WHERE id = :row_id"),
+                rows
+            )
+        written[table] = len(rows)
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.parse_args()
+
+    from app import app
+    with app.app_context():
+        started = time.perf_counter()
+        with db.engine.begin() as connection:
+            written = migrate(connection)
+        counts = ", ".join(f"{n} {table}" for table, n in written.items())
+        print(f"Wrote skill bitsets for {counts} in {time.perf_counter() - started:.2f}s")
@@ -0,0 +1,140 @@
+"""
+Compact, array-backed export of the trained career pipeline.
+
+The pickled pipeline stores 200 separate sklearn Tree objects; unpickling
+rebuilds each one and copies its node arrays into every worker's private
+memory. The export flattens the forest into a handful of flat tables (one
+row per node, one probability row per leaf) saved uncompressed with
+joblib, so ``load_compact(path, mmap=True)`` maps them read-only and the
+workers on a host share the same pages. The fitted preprocessor is small
+and is kept as is.
+"""
+import os
+
+import joblib
+import numpy as np
+
+FORMAT = 'compact-forest'
+FORMAT_VERSION = 1
+SUFFIX = '.forest'
+
+
+def flatten_forest(forest):
+    """Concatenate a fitted RandomForestClassifier's trees into flat node tables.
+
+    Node indices are global across trees. Leaves point at themselves, so a
+    traversal that keeps stepping after reaching a leaf stays there; each
+    leaf's class probabilities are one row of ``leaf_values``.
+    """
+    features, thresholds, lefts, rights, leaf_rows, values = [], [], [], [], [], []
+    roots = []
+    offset = leaves = 0
+    for estimator in forest.estimators_:
+        tree = estimator.tree_
+        n = tree.node_count
+        is_leaf = tree.children_left == -1
+        own = np.arange(offset, offset + n)
+
+        roots.append(offset)
+        features.append(np.where(is_leaf, 0, tree.feature))
+        thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+        lefts.append(np.where(is_leaf, own, tree.children_left + offset))
+        rights.append(np.where(is_leaf, own, tree.children_right + offset))
+
+        slots = np.full(n, -1)
+        slots[is_leaf] = np.arange(leaves, leaves + is_leaf.sum())
+        leaf_rows.append(slots)
+
+        # Same normalisation as DecisionTreeClassifier.predict_proba
+        counts = tree.value[is_leaf, 0, :]
+        totals = counts.sum(axis=1, keepdims=True)
+        totals[totals == 0] = 1
+        values.append(counts / totals)
+
+        offset += n
+        leaves += is_leaf.sum()
+
+    return {
+        'roots': np.asarray(roots, dtype=np.int32),
+        'feature': np.concatenate(features).astype(np.int16),
+        # Thresholds stay float64: sklearn compares float32 inputs against them
+        'threshold': np.concatenate(thresholds).astype(np.float64),
+        'left': np.concatenate(lefts).astype(np.int32),
+        'right': np.concatenate(rights).astype(np.int32),
+        'leaf_row': np.concatenate(leaf_rows).astype(np.int32),
+        'leaf_values': np.concatenate(values).astype(np.float32),
+        'max_depth': int(max(e.tree_.max_depth for e in forest.estimators_))
+    }
+
+
+def export_pipeline(pipeline, path):
+    """Write the pipeline's preprocessor and flattened forest to path; returns its size in bytes"""
+    forest = pipeline.named_steps['classifier']
+    artifact = {
+        'format': FORMAT,
+        'format_version': FORMAT_VERSION,
+        'preprocessor': pipeline.named_steps['preprocessor'],
+        'classes': np.asarray(forest.classes_),
+        'n_features': int(forest.n_features_in_),
+        'forest': flatten_forest(forest)
+    }
+    # Uncompressed, so the tables can be memory-mapped on load
+    joblib.dump(artifact, path + '.tmp')
+    os.replace(path + '.tmp', path)
+    return os.path.getsize(path)
+
+
+class CompactPipeline:
+    """Drop-in for the fitted pipeline's ``classes_`` and ``predict_proba``"""
+
+    def __init__(self, artifact):
+        if artifact.get('format') != FORMAT or artifact.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Not a {FORMAT} v{FORMAT_VERSION} artifact")
+        self.preprocessor = artifact['preprocessor']
+        self.classes_ = artifact['classes']
+        self.n_features = artifact['n_features']
+        forest = artifact['forest']
+        self.roots = forest['roots']
+        self.feature = forest['feature']
+        self.threshold = forest['threshold']
+        self.left = forest['left']
+        self.right = forest['right']
+        self.leaf_row = forest['leaf_row']
+        self.leaf_values = forest['leaf_values']
+        self.max_depth = forest['max_depth']
+
+    def transform(self, X):
+        Xt = self.preprocessor.transform(X)
+        if hasattr(Xt, 'toarray'):
+            Xt = Xt.toarray()
+        # The trees were grown on float32 inputs
+        return np.asarray(Xt, dtype=np.float32)
+
+    def predict_proba(self, X):
+        """Mean leaf probabilities over all trees, shape (rows, classes)"""
+        Xt = self.transform(X)
+        rows = np.arange(len(Xt))[:, None]
+        # Every row walks every tree at once, one level per step
+        nodes = np.broadcast_to(self.roots, (len(Xt), len(self.roots)))
+        for _ in range(self.max_depth):
+            go_left = Xt[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return self.leaf_values[self.leaf_row[nodes]].mean(axis=1, dtype=np.float64)
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+    def nbytes(self):
+        """Bytes held by the node and leaf tables"""
+        return sum(a.nbytes for a in (
+            self.roots, self.feature, self.threshold, self.left, self.right, self.leaf_row, self.leaf_values
+        ))
+
+
+def is_compact(path):
+    return path.endswith(SUFFIX)
+
+
+def load_compact(path, mmap=True):
+    """Load an exported artifact; with mmap its tables are read-only views of the file"""
+    return CompactPipeline(joblib.load(path, mmap_mode='r' if mmap else None))
@@ -1,30 +1,115 @@
-import pandas as pd
+from functools import lru_cache
+
 import numpy as np
-from sklearn.preprocessing import StandardScaler
+import pandas as pd
 
-def create_derived_features(df):
-    """Create enhanced features from raw data"""
-    df['analytical_score'] = df['Dominance'] * 0.3 + df['Formality'] * 0.7
-    df['leadership_score'] = df['Dominance'] * 0.6 + df['Extraversion'] * 0.4
-    df['team_player_score'] = df['Patience'] * 0.5 + df['Extraversion'] * 0.5
-    
-    df['age_group'] = pd.cut(
-        df['Age'], 
-        bins=[0, 22, 25, 30, 35, 100],
-        labels=['early_career', 'graduate', 'developing', 'experienced', 'senior']
+TRAITS = ('Dominance', 'Extraversion', 'Patience', 'Formality')
+TRAIT_SCORES = ('analytical_score', 'leadership_score', 'team_player_score')
+# Weight of each trait (rows, in TRAITS order) in each derived score (columns)
+TRAIT_WEIGHTS = np.array([
+    [0.3, 0.6, 0.0],
+    [0.0, 0.4, 0.5],
+    [0.0, 0.0, 0.5],
+    [0.7, 0.0, 0.0]
+])
+TRAIT_WEIGHTS.setflags(write=False)
+
+# Right-closed age bins, as pd.cut builds them: (0, 22], (22, 25], ...
+AGE_BINS = np.array([0, 22, 25, 30, 35, 100])
+AGE_BINS.setflags(write=False)
+AGE_GROUPS = ('early_career', 'graduate', 'developing', 'experienced', 'senior')
+
+# Bits set in each byte value, for popcounts of packed skill bitsets
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def trait_scores(traits):
+    """Analytical, leadership and team player scores for (n, 4) or (4,) traits"""
+    return np.asarray(traits, dtype=np.float64) @ TRAIT_WEIGHTS
+
+
+def age_group_codes(ages):
+    """Index into AGE_GROUPS of each age, -1 for missing or out of range ages"""
+    ages = np.asarray(ages, dtype=np.float64)
+    codes = np.searchsorted(AGE_BINS, ages, side='left') - 1
+    return np.where((ages > AGE_BINS[0]) & (ages <= AGE_BINS[-1]), codes, -1)
+
+
+def derived_features(df):
+    """Compute the derived feature columns of a frame (or mapping of columns) as new arrays.
+
+    Works the same for one row or a large batch, and reads the input
+    columns without copying or modifying them. ``age_group`` is a
+    Categorical over AGE_GROUPS, missing where pd.cut would give NaN.
+    """
+    traits = np.column_stack([np.asarray(df[name], dtype=np.float64) for name in TRAITS])
+    scores = trait_scores(traits)
+    features = {name: scores[:, i] for i, name in enumerate(TRAIT_SCORES)}
+    features['age_group'] = pd.Categorical.from_codes(
+        age_group_codes(df['Age']), categories=AGE_GROUPS, ordered=True
     )
-    
-    return df
+    return features
+
+
+def create_derived_features(df):
+    """Create enhanced features from raw data, returned as a new frame; df is left unchanged"""
+    derived = pd.DataFrame(derived_features(df), index=df.index)
+    return pd.concat([df, derived], axis=1)
+
+
+@lru_cache(maxsize=4096)
+def parse_skills(skills):
+    """Split a comma separated skills string into a set of names, whatever the spacing"""
+    if not skills:
+        return frozenset()
+    return frozenset(s.strip() for s in skills.split(',') if s.strip())
+
+
+def skill_bitsets(skill_sets, vocabulary):
+    """Pack skill sets into bitsets, shape (n, words) of uint64.
+
+    ``vocabulary`` maps each skill name to its bit; skills it does not
+    know are dropped. A single set gives a single (words,) row.
+    """
+    single = isinstance(skill_sets, (set, frozenset))
+    if single:
+        skill_sets = [skill_sets]
+    words = max(1, -(-len(vocabulary) // 64))
+    bits = np.zeros((len(skill_sets), words * 64), dtype=np.bool_)
+    for row, skills in enumerate(skill_sets):
+        bits[row, [vocabulary[s] for s in skills if s in vocabulary]] = True
+    # Little-endian bit order within each byte and word, so bit i is word
+    # i // 64, bit i % 64
+    packed = np.packbits(bits, axis=1, bitorder='little').view('<u8').astype(np.uint64)
+    return packed[0] if single else packed
+
+
+def popcount(bitsets):
+    """Number of set bits in each bitset (the last axis holds the words)"""
+    bitsets = np.ascontiguousarray(bitsets, dtype=np.uint64)
+    return _POPCOUNT[bitsets.view(np.uint8)].sum(axis=-1, dtype=np.int64)
+
+
+def skill_match_bits(user_bits, course_bits):
+    """Fraction of each course's skills each user has, from bitsets.
+
+    Shapes broadcast: one user against many courses, many users against
+    one course, or (n, 1, words) users against (m, words) courses for an
+    (n, m) matrix. Courses without skills score 0.
+    """
+    user_bits = np.asarray(user_bits, dtype=np.uint64)
+    course_bits = np.asarray(course_bits, dtype=np.uint64)
+    shared = popcount(user_bits & course_bits)
+    total = popcount(course_bits)
+    return np.divide(shared, total, out=np.zeros(np.broadcast(shared, total).shape), where=total > 0)
+
 
 def calculate_skill_match(user_skills, course_skills):
     """Calculate skill match score"""
-    if not user_skills or not course_skills:
-        return 0.0
-    
-    user_skill_list = set(s.strip() for s in user_skills.split(','))
-    course_skill_list = set(s.strip() for s in course_skills.split(','))
-    
-    if not course_skill_list:
+    user_skill_list = parse_skills(user_skills)
+    course_skill_list = parse_skills(course_skills)
+
+    if not user_skill_list or not course_skill_list:
         return 0.0
-        
-    return len(user_skill_list.intersection(course_skill_list)) / len(course_skill_list)
\ No newline at end of file
+
+    return len(user_skill_list & course_skill_list) / len(course_skill_list)
@@ -1,71 +1,389 @@
-import pandas as pd
+"""
+Train the career recommendation model.
+
+Fits the preprocessing + RandomForest pipeline on the career dataset and
+writes it where model_service loads it from, plus a JSON training report
+with the data hash, scores and wall-clock time of every stage.
+
+The preprocessed feature matrices are cached under --cache-dir, keyed by
+the SHA-256 of the data file and the split settings, so re-running on
+unchanged data skips feature engineering and preprocessing. Fitting and
+cross-validation use --n-jobs cores; results do not depend on it.
+
+With --warm-start, and a data file that only has rows appended since the
+model in --output was trained, the existing pipeline is kept (including
+its fitted preprocessor) and --add-trees new trees are grown on the full
+data instead of retraining from scratch. The appended rows are split on
+their own, so rows the model was already trained on never reach the test
+split.
+
+Every run also exports the compact, memory-mappable form of the pipeline
+that the app serves (ml/compact_forest.py) next to the pickle;
+--export-only re-exports an existing pickle without training.
+
+Run from anywhere:
+
+    python ml/train_model.py [--n-jobs -1] [--warm-start --add-trees 50]
+    python ml/train_model.py --export-only
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+import joblib
 import numpy as np
-from sklearn.model_selection import train_test_split, cross_val_score
+import pandas as pd
+import sklearn
+from sklearn.compose import ColumnTransformer
 from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import cross_val_score, train_test_split
 from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import StandardScaler, OneHotEncoder
-from sklearn.compose import ColumnTransformer
-import joblib
-from feature_engineering import create_derived_features
-
-def train_model():
-    df = pd.read_csv('../data/career_recommendation_with_courses.csv')
-    
-    df = create_derived_features(df)
-    
-    categorical_features = ['Course', 'Universities_ID', 'Faculty/Department', 'age_group']
-    numerical_features = [
-        'Duration', 'analytical_score', 'leadership_score', 'team_player_score',
-        'Dominance', 'Extraversion', 'Patience', 'Formality'
-    ]
-    
-    preprocessor = ColumnTransformer(
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from ml.compact_forest import SUFFIX, export_pipeline  # noqa: E402
+from ml.feature_engineering import create_derived_features  # noqa: E402
+
+DATA_PATH = os.path.join(ROOT, 'data', 'career_recommendation_with_courses.csv')
+MODEL_PATH = os.path.join(ROOT, 'models', 'career_recommendation_model.pkl')
+CACHE_DIR = os.path.join(ROOT, 'models', 'feature_cache')
+
+CATEGORICAL_FEATURES = ['Course', 'Universities_ID', 'Faculty/Department', 'age_group']
+NUMERICAL_FEATURES = [
+    'Duration', 'analytical_score', 'leadership_score', 'team_player_score',
+    'Dominance', 'Extraversion', 'Patience', 'Formality'
+]
+TARGET = 'Recommended Career'
+
+TEST_SIZE = 0.2
+RANDOM_STATE = 42
+# Bump when create_derived_features or the preprocessor change, so cached
+# matrices built by the old code are not reused
+FEATURES_VERSION = 1
+
+
+def build_preprocessor():
+    return ColumnTransformer(
         transformers=[
-            ('num', StandardScaler(), numerical_features),
-            ('cat', OneHotEncoder(handle_unknown='ignore'), categorical_features)
+            ('num', StandardScaler(), NUMERICAL_FEATURES),
+            ('cat', OneHotEncoder(handle_unknown='ignore'), CATEGORICAL_FEATURES)
         ])
-    
-    pipeline = Pipeline([
-        ('preprocessor', preprocessor),
-        ('classifier', RandomForestClassifier(
-            n_estimators=200,
-            max_depth=20,
-            min_samples_split=5,
-            min_samples_leaf=2,
-            class_weight='balanced',
-            random_state=42
-        ))
-    ])
-    
-    X = df[categorical_features + numerical_features]
-    y = df['Recommended Career']
-    
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42
+
+
+def build_classifier(n_estimators=200, n_jobs=None):
+    return RandomForestClassifier(
+        n_estimators=n_estimators,
+        max_depth=20,
+        min_samples_split=5,
+        min_samples_leaf=2,
+        class_weight='balanced',
+        random_state=RANDOM_STATE,
+        n_jobs=n_jobs
     )
-    
-    pipeline.fit(X_train, y_train)
-    
-    train_score = pipeline.score(X_train, y_train)
-    test_score = pipeline.score(X_test, y_test)
-    cv_scores = cross_val_score(pipeline, X_train, y_train, cv=5)
-    
+
+
+def report_path_for(model_path):
+    return os.path.splitext(model_path)[0] + '.report.json'
+
+
+def compact_path_for(model_path):
+    return os.path.splitext(model_path)[0] + SUFFIX
+
+
+def export_compact(model_path, pipeline=None):
+    """Write the compact artifact for the pipeline (loaded from model_path if not given)"""
+    if pipeline is None:
+        pipeline = joblib.load(model_path)
+    path = compact_path_for(model_path)
+    size = export_pipeline(pipeline, path)
+    return {'path': os.path.abspath(path), 'sha256': file_digest(path), 'bytes': size}
+
+
+class StageTimer:
+    """Wall-clock seconds per named stage, in the order they ran"""
+
+    def __init__(self):
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = round(time.perf_counter() - started, 3)
+
+
+def file_digest(path, length=None):
+    """SHA-256 of the file, or of its first length bytes"""
+    digest = hashlib.sha256()
+    remaining = length
+    with open(path, 'rb') as f:
+        while remaining is None or remaining > 0:
+            chunk = f.read(1 << 20 if remaining is None else min(1 << 20, remaining))
+            if not chunk:
+                break
+            digest.update(chunk)
+            if remaining is not None:
+                remaining -= len(chunk)
+    return digest.hexdigest()
+
+
+def load_frame(data_path):
+    df = create_derived_features(pd.read_csv(data_path))
+    return df[CATEGORICAL_FEATURES + NUMERICAL_FEATURES], df[TARGET]
+
+
+def split(X, y):
+    return train_test_split(X, y, test_size=TEST_SIZE, random_state=RANDOM_STATE)
+
+
+def split_segments(X, y, segments):
+    """Split each run of rows on its own and join the parts.
+
+    segments are the row counts of the original data and of each batch of
+    appended rows, in file order. Splitting them separately keeps every
+    earlier row on the side of the split it was trained or tested on, so
+    the test score after a warm start is still held out. A single row goes
+    to the training side.
+    """
+    parts, start = [], 0
+    for rows in segments:
+        X_part, y_part = X.iloc[start:start + rows], y.iloc[start:start + rows]
+        if rows > 1:
+            parts.append(split(X_part, y_part))
+        else:
+            parts.append((X_part, X_part.iloc[:0], y_part, y_part.iloc[:0]))
+        start += rows
+    return [pd.concat([part[i] for part in parts]) for i in range(4)]
+
+
+def cached_matrices(data_path, data_hash, cache_dir, timer):
+    """Fitted preprocessor and transformed train/test matrices, from the cache if possible.
+
+    Returns (entry, hit) where entry has the preprocessor, X_train, X_test,
+    y_train, y_test and the number of rows.
+    """
+    key = hashlib.sha256(
+        f"{data_hash}:{FEATURES_VERSION}:{TEST_SIZE}:{RANDOM_STATE}:{sklearn.__version__}".encode()
+    ).hexdigest()[:16]
+    path = os.path.join(cache_dir, f"features-{key}.joblib") if cache_dir else None
+
+    if path and os.path.exists(path):
+        with timer.stage('load_cached_features'):
+            try:
+                return joblib.load(path), True
+            except Exception as e:
+                print(f"Ignoring unreadable feature cache {path}: {str(e)}")
+
+    with timer.stage('feature_engineering'):
+        X, y = load_frame(data_path)
+        X_train, X_test, y_train, y_test = split(X, y)
+    with timer.stage('preprocess'):
+        preprocessor = build_preprocessor()
+        entry = {
+            'preprocessor': preprocessor,
+            'X_train': preprocessor.fit_transform(X_train),
+            'X_test': preprocessor.transform(X_test),
+            'y_train': y_train.to_numpy(),
+            'y_test': y_test.to_numpy(),
+            'rows': len(X)
+        }
+    if path:
+        with timer.stage('write_feature_cache'):
+            os.makedirs(cache_dir, exist_ok=True)
+            joblib.dump(entry, path + '.tmp')
+            os.replace(path + '.tmp', path)
+    return entry, False
+
+
+def appended_since(previous, data_path, data_size):
+    """Whether data_path is the data the previous report was trained on plus appended rows"""
+    if not previous or data_size < previous['data']['bytes']:
+        return False
+    return file_digest(data_path, previous['data']['bytes']) == previous['data']['sha256']
+
+
+def fit_from_scratch(entry, n_jobs, n_estimators, cv, timer):
+    preprocessor = entry['preprocessor']
+    X_train, y_train = entry['X_train'], entry['y_train']
+
+    with timer.stage('fit'):
+        classifier = build_classifier(n_estimators, n_jobs=n_jobs).fit(X_train, y_train)
+    cv_scores = None
+    if cv > 1:
+        # Folds run in parallel, one core each, rather than nesting pools. The
+        # preprocessor was fitted on the whole training split; the forest is
+        # insensitive to the scaling and unknown categories are ignored, so
+        # the scores match refitting it per fold.
+        with timer.stage('cross_validate'):
+            cv_scores = cross_val_score(build_classifier(n_estimators), X_train, y_train, cv=cv, n_jobs=n_jobs)
+    return Pipeline([('preprocessor', preprocessor), ('classifier', classifier)]), cv_scores
+
+
+def fit_warm_start(model_path, data_path, previous_segments, add_trees, n_jobs, timer):
+    """Grow add_trees more trees of the existing pipeline on the full, appended data.
+
+    previous_segments are the segments of the previous run; the appended
+    rows become a new one (see split_segments).
+    """
+    with timer.stage('load_model'):
+        pipeline = joblib.load(model_path)
+    with timer.stage('feature_engineering'):
+        X, y = load_frame(data_path)
+        segments = previous_segments + [len(X) - sum(previous_segments)]
+        X_train, X_test, y_train, y_test = split_segments(X, y, segments)
+
+    classifier = pipeline.named_steps['classifier']
+    unknown = set(y.unique()) - set(classifier.classes_)
+    if unknown:
+        raise SystemExit(
+            f"The appended rows add careers the model does not know ({', '.join(sorted(unknown))}); "
+            "retrain without --warm-start"
+        )
+    # The existing trees expect the existing feature layout, so the fitted
+    # preprocessor is reused as is; new categories are ignored by it
+    with timer.stage('preprocess'):
+        preprocessor = pipeline.named_steps['preprocessor']
+        entry = {
+            'X_train': preprocessor.transform(X_train),
+            'X_test': preprocessor.transform(X_test),
+            'y_train': y_train.to_numpy(),
+            'y_test': y_test.to_numpy(),
+            'rows': len(X),
+            'segments': segments
+        }
+    with timer.stage('fit'):
+        classifier.set_params(warm_start=True, n_jobs=n_jobs, n_estimators=classifier.n_estimators + add_trees)
+        classifier.fit(entry['X_train'], entry['y_train'])
+        classifier.set_params(warm_start=False)
+    return pipeline, entry
+
+
+def feature_importance(pipeline, top=10):
+    names = pipeline.named_steps['preprocessor'].get_feature_names_out()
+    importance = pipeline.named_steps['classifier'].feature_importances_
+    ranked = sorted(zip(names, importance), key=lambda x: x[1], reverse=True)[:top]
+    return [(name, round(float(value), 4)) for name, value in ranked]
+
+
+def train_model(data_path=DATA_PATH, output=MODEL_PATH, report_path=None, n_jobs=-1, cv=5,
+                n_estimators=200, cache_dir=CACHE_DIR, warm_start=False, add_trees=50):
+    report_path = report_path or report_path_for(output)
+    timer = StageTimer()
+    started = time.perf_counter()
+
+    with timer.stage('hash_data'):
+        data_size = os.path.getsize(data_path)
+        data_hash = file_digest(data_path)
+
+    previous = None
+    if os.path.exists(report_path):
+        with open(report_path) as f:
+            previous = json.load(f)
+
+    mode, cache_hit, cv_scores = 'full', False, None
+    if warm_start:
+        if previous and previous['data']['sha256'] == data_hash and os.path.exists(output):
+            print("Data unchanged since the last training run; nothing to do")
+            return previous
+        if not os.path.exists(output) or not appended_since(previous, data_path, data_size):
+            print("Data is not the previous training data plus appended rows; training from scratch")
+        else:
+            mode = 'warm_start'
+            previous_segments = previous['data'].get('segments', [previous['data']['rows']])
+            pipeline, entry = fit_warm_start(output, data_path, previous_segments, add_trees, n_jobs, timer)
+
+    if mode == 'full':
+        entry, cache_hit = cached_matrices(data_path, data_hash, cache_dir, timer)
+        pipeline, cv_scores = fit_from_scratch(entry, n_jobs, n_estimators, cv, timer)
+
+    classifier = pipeline.named_steps['classifier']
+    with timer.stage('evaluate'):
+        train_score = classifier.score(entry['X_train'], entry['y_train'])
+        test_score = classifier.score(entry['X_test'], entry['y_test'])
+
+    # Predictions at serving time are one small batch per request; a pool of
+    # threads per call would only add overhead there
+    classifier.set_params(n_jobs=None)
+    with timer.stage('save_model'):
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        joblib.dump(pipeline, output + '.tmp')
+        os.replace(output + '.tmp', output)
+    with timer.stage('export_compact'):
+        compact = export_compact(output, pipeline)
+
+    report = {
+        'mode': mode,
+        'model_path': os.path.abspath(output),
+        'model_sha256': file_digest(output),
+        'model_bytes': os.path.getsize(output),
+        'compact': compact,
+        'data': {
+            'path': os.path.abspath(data_path), 'sha256': data_hash, 'bytes': data_size, 'rows': entry['rows'],
+            'segments': entry.get('segments', [entry['rows']])
+        },
+        'feature_cache_hit': cache_hit,
+        'n_jobs': n_jobs,
+        'n_estimators': classifier.n_estimators,
+        'random_state': RANDOM_STATE,
+        'sklearn_version': sklearn.__version__,
+        'scores': {
+            'train': round(float(train_score), 4),
+            'test': round(float(test_score), 4),
+            'cv': [round(float(s), 4) for s in cv_scores] if cv_scores is not None else None,
+            'cv_mean': round(float(np.mean(cv_scores)), 4) if cv_scores is not None else None
+        },
+        'feature_importance': feature_importance(pipeline),
+        'timings': timer.stages,
+        'total_seconds': round(time.perf_counter() - started, 3)
+    }
+    if mode == 'warm_start':
+        report['previous_rows'] = previous['data']['rows']
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
+
     print("\nModel Performance:")
-    print(f"Train Score: {train_score:.4f}")
-    print(f"Test Score: {test_score:.4f}")
-    print(f"CV Scores Mean: {cv_scores.mean():.4f}")
-    
-    joblib.dump(pipeline, '../models/career_recommendation_model.pkl')
-   
-    feature_importance = pipeline.named_steps['classifier'].feature_importances_
-
-    categorical_features_encoded = pipeline.named_steps['preprocessor'].named_transformers_['cat'].get_feature_names_out(categorical_features)
-    all_features = list(categorical_features_encoded) + numerical_features
-    
+    print(f"Train Score: {report['scores']['train']:.4f}")
+    print(f"Test Score: {report['scores']['test']:.4f}")
+    if cv_scores is not None:
+        print(f"CV Scores Mean: {report['scores']['cv_mean']:.4f}")
+
     print("\nFeature Importance:")
-    for feature, importance in sorted(zip(all_features, feature_importance), 
-                                    key=lambda x: x[1], reverse=True)[:10]:
+    for feature, importance in report['feature_importance']:
         print(f"{feature}: {importance:.4f}")
-    
+
+    print("\nTimings (s):")
+    for stage, seconds in timer.stages.items():
+        print(f"{stage}: {seconds:.3f}")
+    print(f"Report written to {report_path}")
+    return report
+
+
 if __name__ == "__main__":
-    train_model()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--data', default=DATA_PATH)
+    parser.add_argument('--output', default=MODEL_PATH)
+    parser.add_argument('--report', default=None, help="defaults to the model path with .report.json")
+    parser.add_argument('--n-jobs', type=int, default=-1)
+    parser.add_argument('--cv', type=int, default=5, help="cross-validation folds; 0 to skip")
+    parser.add_argument('--n-estimators', type=int, default=200)
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    parser.add_argument('--no-cache', action='store_true')
+    parser.add_argument('--warm-start', action='store_true')
+    parser.add_argument('--add-trees', type=int, default=50)
+    parser.add_argument('--export-only', action='store_true', help="only export the compact form of --output")
+    args = parser.parse_args()
+    if args.export_only:
+        compact = export_compact(args.output)
+        print(f"Exported {compact['path']} ({compact['bytes']} bytes)")
+    else:
+        train_model(args.data, args.output, args.report, args.n_jobs, args.cv, args.n_estimators,
+                    None if args.no_cache else args.cache_dir, args.warm_start, args.add_trees)
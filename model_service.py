@@ -0,0 +1,219 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+import warnings
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from ml.compact_forest import SUFFIX, is_compact, load_compact
+from ml.feature_engineering import TRAITS, derived_features
+from password_service import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+# The compact export written by ml/train_model.py; the full pickle next to
+# it can be served too, by pointing MODEL_PATH at it
+DEFAULT_MODEL_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'models', 'career_recommendation_model' + SUFFIX
+)
+
+# Columns the pipeline in ml/train_model.py was fitted on
+CATEGORICAL_FEATURES = ['Course', 'Universities_ID', 'Faculty/Department', 'age_group']
+NUMERICAL_FEATURES = [
+    'Duration', 'analytical_score', 'leadership_score', 'team_player_score',
+    'Dominance', 'Extraversion', 'Patience', 'Formality'
+]
+# Users have no course yet: the one-hot course columns are left empty and
+# the duration is the median of the training data
+DEFAULT_DURATION = 2
+
+
+def user_features(ages, traits):
+    """Build the model's input frame for users given their ages and (n, 4) traits"""
+    traits = np.asarray(traits, dtype=np.float64).reshape(-1, 4)
+    columns = dict(zip(TRAITS, traits.T))
+    columns['Age'] = np.array([age if age is not None else np.nan for age in ages], dtype=np.float64)
+    columns.update(derived_features(columns))
+    columns.update({'Course': None, 'Universities_ID': None, 'Faculty/Department': None, 'Duration': DEFAULT_DURATION})
+    return pd.DataFrame({name: columns[name] for name in CATEGORICAL_FEATURES + NUMERICAL_FEATURES})
+
+
+def resident_memory():
+    """This process's resident set size in bytes, or None where it can't be read"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class LoadedModel:
+    """A fitted pipeline plus what is needed to line its classes up with a catalogue"""
+
+    def __init__(self, pipeline, version):
+        self.pipeline = pipeline
+        self.version = version
+        self.classes = {career: i for i, career in enumerate(pipeline.classes_)}
+        self._columns = (None, None)
+
+    def class_columns(self, snapshot):
+        """Class index of each catalogue career (-1 if the model does not know it)"""
+        version, columns = self._columns
+        if version != snapshot.version:
+            columns = np.array([self.classes.get(name, -1) for name in snapshot.career_names], dtype=np.intp)
+            self._columns = (snapshot.version, columns)
+        return columns
+
+    def career_scores(self, snapshot, ages, traits):
+        """Score each catalogue row's career for each user, shape (users, rows).
+
+        The score is the career's predicted probability relative to the
+        user's most likely career, so it shares the 0..1 scale of the
+        heuristic scores; careers the model does not know score 0.
+        """
+        proba = self.pipeline.predict_proba(user_features(ages, traits))
+        proba = proba / proba.max(axis=1, keepdims=True)
+        columns = self.class_columns(snapshot)
+        by_career = np.where(columns >= 0, proba[:, columns], 0.0)
+        return by_career[:, snapshot.career_codes]
+
+
+class ModelService:
+    """The trained career model, loaded once per process and shared by its threads.
+
+    ``warm()`` loads the pipeline in a background thread at start-up; until it
+    is ready, or if the file is missing or fails to load, ``active()`` returns
+    None and callers fall back to the heuristic scores. Paths ending in
+    ``.forest`` are compact exports (see ml/compact_forest.py), anything else
+    a joblib pickle of the pipeline. With ``mmap`` the compact tables are
+    memory-mapped, so the workers on one host share their pages; a pickle's
+    trees are rebuilt in each worker either way.
+
+    Each worker records how long its load took and how much its resident
+    memory grew, in ``stats()``.
+
+    ``blend_weight`` is the share of the model's score in a career's rating;
+    0, the default, disables the model.
+    """
+
+    def __init__(self, path=DEFAULT_MODEL_PATH, blend_weight=0.0, mmap=True):
+        self.path = path
+        self.blend_weight = blend_weight
+        self.mmap = mmap
+        self._model = None
+        self._state = 'unloaded'
+        self._load_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._latency = LatencyHistogram()
+        self._rows = 0
+        self._failures = 0
+        self._load_seconds = None
+        self._load_rss = None
+
+    def configure(self, path=None, blend_weight=None, mmap=None):
+        if path is not None and path != self.path:
+            self.path = path
+            self._model, self._state = None, 'unloaded'
+        if blend_weight is not None:
+            self.blend_weight = blend_weight
+        if mmap is not None:
+            self.mmap = mmap
+
+    def load(self):
+        """Load the model now unless it was already tried; returns the LoadedModel or None"""
+        with self._load_lock:
+            if self._state in ('unloaded', 'loading'):
+                self._load()
+        return self._model
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            self._state = 'missing'
+            logger.warning(f"Career model not found at {self.path}; using heuristic scores only")
+            return
+        try:
+            rss_before = resident_memory()
+            started = time.perf_counter()
+            with open(self.path, 'rb') as f:
+                version = hashlib.sha256(f.read()).hexdigest()
+            with warnings.catch_warnings():
+                # Pickles from an older scikit-learn load fine; don't warn in every worker
+                warnings.simplefilter('ignore')
+                if is_compact(self.path):
+                    pipeline = load_compact(self.path, mmap=self.mmap)
+                else:
+                    pipeline = joblib.load(self.path)
+            self._model = LoadedModel(pipeline, version)
+            self._load_seconds = time.perf_counter() - started
+            rss_after = resident_memory()
+            if rss_before is not None and rss_after is not None:
+                self._load_rss = rss_after - rss_before
+            self._state = 'ready'
+            logger.info(
+                f"Loaded career model {version[:12]} in {self._load_seconds:.3f}s "
+                f"(pid {os.getpid()}, resident memory +{(self._load_rss or 0) / 2 ** 20:.1f} MB)"
+            )
+        except Exception as e:
+            self._state = 'failed'
+            logger.error(f"Failed to load career model from {self.path}: {str(e)}")
+
+    def warm(self):
+        """Start loading in the background so the first request does not wait"""
+        if self.blend_weight <= 0 or self._state != 'unloaded':
+            return
+        self._state = 'loading'
+        threading.Thread(target=self.load, name='career-model-loader', daemon=True).start()
+
+    def active(self):
+        """The model to blend in, or None to use the heuristic alone"""
+        if self.blend_weight <= 0:
+            return None
+        return self._model
+
+    def career_scores(self, model, snapshot, ages, traits):
+        """Run one batched prediction of career scores, shape (users, rows).
+
+        If the model fails it is switched off for this process and None is
+        returned, so callers (and later requests) use the heuristic alone.
+        """
+        started = time.perf_counter()
+        try:
+            result = model.career_scores(snapshot, ages, traits)
+        except Exception as e:
+            with self._stats_lock:
+                self._failures += 1
+            if self._model is model:
+                self._model, self._state = None, 'failed'
+            logger.error(f"Career model prediction failed, falling back to heuristic scores: {str(e)}")
+            return None
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._stats_lock:
+            self._latency.observe(elapsed_ms)
+            self._rows += len(ages)
+        return result
+
+    def stats(self):
+        with self._stats_lock:
+            model = self._model
+            rss = resident_memory()
+            return {
+                'state': self._state,
+                'version': model.version if model else None,
+                'format': 'compact' if is_compact(self.path) else 'pickle',
+                'mmap': self.mmap and is_compact(self.path),
+                'blend_weight': self.blend_weight,
+                'pid': os.getpid(),
+                'load_seconds': round(self._load_seconds, 4) if self._load_seconds else None,
+                'load_rss_mb': round(self._load_rss / 2 ** 20, 2) if self._load_rss is not None else None,
+                'rss_mb': round(rss / 2 ** 20, 1) if rss is not None else None,
+                'predicted_rows': self._rows,
+                'failures': self._failures,
+                'latency': self._latency.as_dict()
+            }
+
+
+model_service = ModelService()
@@ -1,4 +1,7 @@
+from sqlalchemy.orm import validates
+
 from extensions import db
+from skills import format_skills, skill_vocabulary
 
 class User(db.Model):
     __tablename__ = 'users'
@@ -7,18 +10,26 @@ class User(db.Model):
     last_name = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(150), unique=True, nullable=False)
     age = db.Column(db.Integer, nullable=False)
-    skills = db.Column(db.String(200))
+    skills = db.Column(db.String(200))  # ", " separated, in the order the user gave
+    skill_bits = db.Column(db.LargeBinary)  # skill_vocabulary.pack(skills), kept in step by set_skills
     career_interests = db.Column(db.String(200))
     password = db.Column(db.LargeBinary, nullable=False)
     reference_profile_id = db.Column(db.Integer, db.ForeignKey('reference_profiles.id'))
     course = db.Column(db.String(100))
-    university_id = db.Column(db.String(10))
+    university_id = db.Column(db.String(10), db.ForeignKey('universities.id'))
     faculty = db.Column(db.String(100))
     duration = db.Column(db.Integer)
 
+    @validates('skills')
+    def set_skills(self, key, skills):
+        """Normalise the skills (a list or string) and store their bitset alongside"""
+        skills = format_skills(skills)
+        self.skill_bits = skill_vocabulary.pack(skills) if skills is not None else None
+        return skills
+
 class University(db.Model):
     __tablename__ = 'universities'
-    id = db.Column(db.String, primary_key=True)
+    id = db.Column(db.String(10), primary_key=True)
     name = db.Column(db.String, nullable=False)
     tel_number = db.Column(db.String) 
     website = db.Column(db.String)    
@@ -35,11 +46,13 @@ class Course(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100))
     credits = db.Column(db.Integer)
-    university_id = db.Column(db.String(10))  
+    university_id = db.Column(db.String(10), db.ForeignKey('universities.id'), index=True)
     faculty = db.Column(db.String(100))
     duration = db.Column(db.Integer)
-    recommended_career = db.Column(db.String(100))
+    recommended_career = db.Column(db.String(100), index=True)
     key_skills = db.Column(db.String(200))
+    skill_bits = db.Column(db.LargeBinary)  # skill_vocabulary.pack(key_skills)
+    university = db.relationship('University', lazy='joined', innerjoin=False)
 
 class Mentorship(db.Model):
     __tablename__ = 'mentorships'
@@ -67,11 +80,31 @@ class ReferenceProfile(db.Model):
     formality = db.Column(db.Integer)
 
 
+class Adjective(db.Model):
+    __tablename__ = 'adjectives'
+    id = db.Column(db.Integer, primary_key=True)
+    word = db.Column(db.String(50), unique=True, nullable=False)
+
+
 class BehavioralAssessment(db.Model):
     __tablename__ = 'behavioral_assessments'
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'))
-    question_type = db.Column(db.String(50))  # "Expected" or "Self-description"
-    adjective = db.Column(db.String(50))
-    factor = db.Column(db.String(50))  # "Dominance", "Extraversion", "Patience", "Formality" 
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), index=True)
+    question_type = db.Column(db.SmallInteger)  # index into assessments.QUESTION_TYPES
+    adjective_id = db.Column(db.Integer, db.ForeignKey('adjectives.id'))
+    factor = db.Column(db.SmallInteger)  # index into assessments.FACTORS
+
 
+
+class UserRecommendation(db.Model):
+    __tablename__ = 'user_recommendations'
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    rank = db.Column(db.Integer, nullable=False)  # 1 = best match
+    career = db.Column(db.String(100), nullable=False)
+    rating = db.Column(db.Float, nullable=False)
+    personality_match = db.Column(db.Float)
+    skills_match = db.Column(db.Float)
+    catalogue_version = db.Column(db.String(64), nullable=False)  # recommendation.scoring_version()
+    inputs_key = db.Column(db.String(40), nullable=False)  # recommendation.recommendation_inputs_key(): reference_profile_id, skills and age
+    computed_at = db.Column(db.DateTime, nullable=False)
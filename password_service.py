@@ -0,0 +1,160 @@
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+
+import bcrypt
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (in milliseconds) of the latency histogram buckets
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class PasswordServiceBusy(Exception):
+    """Raised when a hash or verify could not be admitted before its deadline"""
+
+
+def _hashpw(password, rounds):
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds))
+
+
+def _checkpw(password, hashed):
+    return bcrypt.checkpw(password, hashed)
+
+
+class LatencyHistogram:
+    """Per-bucket (non-cumulative) counts plus count and sum, in milliseconds"""
+
+    def __init__(self, bounds=LATENCY_BUCKETS_MS):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+
+    def observe(self, ms):
+        index = next((i for i, bound in enumerate(self.bounds) if ms <= bound), len(self.bounds))
+        self.buckets[index] += 1
+        self.count += 1
+        self.total_ms += ms
+
+    def as_dict(self):
+        labels = [f"le_{bound}" for bound in self.bounds] + ["le_inf"]
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total_ms / self.count, 2) if self.count else 0.0,
+            'buckets': dict(zip(labels, self.buckets))
+        }
+
+
+class PasswordHasher:
+    """bcrypt hashing and verification off the request thread.
+
+    Work runs in a ProcessPoolExecutor of ``workers`` processes (inline when
+    workers is 0). At most ``max_pending`` operations may be queued or running
+    per process; a caller waits up to ``queue_timeout`` seconds for a slot and
+    then up to ``result_timeout`` seconds for its result, and
+    PasswordServiceBusy is raised past either deadline so the route can
+    answer 429 instead of tying up the worker. A slot is only freed when its
+    job is done, so jobs a caller gave up on still count against max_pending.
+
+    The pool is created lazily, in the process that first uses it, so it is
+    never shared across a gunicorn fork. Its processes are started by a fork
+    server rather than forked from the app, whose background threads (model
+    warm-up, scoring coalescer, log listener) may hold locks at fork time.
+    The fork server preloads only bcrypt. Each pool process still imports
+    the parent's __main__ module as __mp_main__, as with spawn: under
+    gunicorn that is gunicorn's small entry point, but under
+    ``python app.py`` every pool process runs app.py's module-level set-up
+    once (not its __main__ block). Set workers to 0 to hash inline there.
+    """
+
+    def __init__(self, rounds=12, workers=2, max_pending=16, queue_timeout=2.0, result_timeout=5.0):
+        self.rounds = rounds
+        self.workers = workers
+        self.queue_timeout = queue_timeout
+        self.result_timeout = result_timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._pool = None
+        self._pool_pid = None
+        self._pool_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._histograms = {'hash': LatencyHistogram(), 'verify': LatencyHistogram()}
+        self._rejected = 0
+        self._rehashed = 0
+
+    def hash(self, password):
+        """Return a bcrypt hash of the password (str) at the configured cost"""
+        return self._run('hash', _hashpw, password.encode('utf-8'), self.rounds)
+
+    def verify(self, password, hashed):
+        """Check a password (str) against a stored bcrypt hash"""
+        return self._run('verify', _checkpw, password.encode('utf-8'), hashed)
+
+    def needs_rehash(self, hashed):
+        """True if a stored hash was made with a different cost than configured"""
+        try:
+            return int(hashed.split(b'$')[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def record_rehash(self):
+        with self._stats_lock:
+            self._rehashed += 1
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                'rounds': self.rounds,
+                'workers': self.workers,
+                'rejected': self._rejected,
+                'rehashed': self._rehashed,
+                'latency': {op: h.as_dict() for op, h in self._histograms.items()}
+            }
+
+    def _executor(self):
+        if self._pool is None or self._pool_pid != os.getpid():
+            with self._pool_lock:
+                if self._pool is None or self._pool_pid != os.getpid():
+                    context = multiprocessing.get_context('forkserver')
+                    context.set_forkserver_preload(['bcrypt'])
+                    self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+                    self._pool_pid = os.getpid()
+        return self._pool
+
+    def _run(self, operation, fn, *args):
+        started = time.perf_counter()
+
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            self._reject(operation, f"no capacity within {self.queue_timeout}s")
+        if self.workers <= 0:
+            try:
+                result = fn(*args)
+            finally:
+                self._slots.release()
+        else:
+            try:
+                future = self._executor().submit(fn, *args)
+            except BaseException:
+                self._slots.release()
+                raise
+            # cancel() cannot stop a running job, so the slot is held until it ends
+            future.add_done_callback(lambda _: self._slots.release())
+            try:
+                result = future.result(timeout=self.result_timeout)
+            except FutureTimeoutError:
+                future.cancel()
+                self._reject(operation, f"no result within {self.result_timeout}s")
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._stats_lock:
+            self._histograms[operation].observe(elapsed_ms)
+        return result
+
+    def _reject(self, operation, reason):
+        with self._stats_lock:
+            self._rejected += 1
+        logger.warning(f"Password {operation} rejected: {reason}")
+        raise PasswordServiceBusy(operation)
@@ -0,0 +1,69 @@
+import re
+from collections import OrderedDict
+
+from sqlalchemy import event, inspect
+
+# "SCAN users", "SCAN u", "SCAN users USING COVERING INDEX ..." in SQLite's
+# EXPLAIN QUERY PLAN output; SEARCH lines use an index or the primary key
+SCAN = re.compile(r'^SCAN (\w+)(?: AS (\w+))?')
+ALIAS = re.compile(r'\b(\w+)(?: AS)? (\w+)\b')
+
+
+class QueryPlanAudit:
+    """Record the statements run on a SQLite engine and check their query plans.
+
+    Use as a context manager around the code to audit; every distinct
+    SELECT, UPDATE and DELETE it runs is kept with its first parameters.
+    ``full_scans(min_rows)`` then runs EXPLAIN QUERY PLAN for each one and
+    returns the statements that scan a whole table holding at least
+    ``min_rows`` rows, so tiny lookup tables can be scanned freely.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = OrderedDict()
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self._record)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(self.engine, 'before_cursor_execute', self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE', 'WITH')):
+            return
+        if executemany:
+            parameters = parameters[0] if parameters else ()
+        self.statements.setdefault(statement, parameters)
+
+    def plans(self):
+        """(statement, [plan detail lines]) for every recorded statement"""
+        results = []
+        with self.engine.connect() as connection:
+            for statement, parameters in self.statements.items():
+                rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+                results.append((statement, [row[-1] for row in rows]))
+        return results
+
+    def full_scans(self, min_rows=1000):
+        """(statement, table, rows, plan) for each full scan of a table with at least min_rows rows"""
+        tables = set(inspect(self.engine).get_table_names())
+        sizes = {}
+        found = []
+        for statement, plan in self.plans():
+            aliases = {alias: table for table, alias in ALIAS.findall(statement) if table in tables}
+            for detail in plan:
+                match = SCAN.match(detail)
+                if not match:
+                    continue
+                name = match.group(1)
+                table = name if name in tables else aliases.get(name)
+                if table is None:
+                    continue  # a subquery, CTE or constant row
+                if table not in sizes:
+                    with self.engine.connect() as connection:
+                        sizes[table] = connection.exec_driver_sql(f"SELECT count(*) FROM {table}").scalar()
+                if sizes[table] >= min_rows:
+                    found.append((statement, table, sizes[table], plan))
+        return found
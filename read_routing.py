@@ -0,0 +1,117 @@
+import re
+import threading
+import time
+
+from flask import current_app
+from flask_sqlalchemy.session import Session
+from sqlalchemy import TextClause, event
+
+# Key of the read engine in app.extensions
+READ_ENGINE = 'read_engine'
+
+# text() statements that only read; anything else counts as a write
+READ_STATEMENT = re.compile(r'\s*\(*\s*SELECT\b', re.IGNORECASE)
+
+
+class RecentWrites:
+    """Users who wrote in the last ``window`` seconds.
+
+    Their reads go to the primary until the window ends, so a replica that
+    lags behind never hides a user's own changes from them. Like UserCache
+    this is per process: with several workers a write pins the user only in
+    the worker that handled it.
+    """
+
+    def __init__(self, window=5.0):
+        self.window = window
+        self._until = {}
+        self._lock = threading.Lock()
+        self._counters = {'writes': 0, 'pinned_reads': 0}
+
+    def configure(self, window=None):
+        if window is not None:
+            self.window = window
+
+    def record(self, user_id):
+        if user_id is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._until[user_id] = now + self.window
+            self._counters['writes'] += 1
+            # Drop expired users now and then so the dict stays small
+            if len(self._until) > 1024:
+                self._until = {u: t for u, t in self._until.items() if t > now}
+
+    def pinned(self, user_id):
+        """Whether user_id wrote within the window"""
+        if user_id is None:
+            return False
+        with self._lock:
+            until = self._until.get(user_id)
+            if until is None:
+                return False
+            if until <= time.monotonic():
+                del self._until[user_id]
+                return False
+            self._counters['pinned_reads'] += 1
+            return True
+
+    def stats(self):
+        with self._lock:
+            return {'window_s': self.window, 'pinned_users': len(self._until), **self._counters}
+
+
+recent_writes = RecentWrites()
+
+
+def is_write(clause):
+    """Whether a statement executed through the session may write"""
+    if isinstance(clause, TextClause):
+        return not READ_STATEMENT.match(clause.text)
+    return getattr(clause, 'is_dml', False)
+
+
+class RoutingSession(Session):
+    """db.session that sends the reads of read-only requests to the app's read engine.
+
+    A request is read-only while ``info['read_only']`` is set (see
+    database.read_only). Flushes, INSERT/UPDATE/DELETE statements and text()
+    statements other than SELECT always go to the primary, and once a
+    session has written, the rest of its reads do too. ``info['user_id']``
+    names the user a request acts for: their commits are recorded in
+    recent_writes, and while they are pinned their reads stay on the
+    primary. Without a read engine (app.extensions[READ_ENGINE]) everything
+    uses the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            if is_write(clause):
+                self.info['wrote'] = True
+            elif (
+                self.info.get('read_only')
+                and not self.info.get('wrote')
+                and not recent_writes.pinned(self.info.get('user_id'))
+            ):
+                engine = current_app.extensions.get(READ_ENGINE)
+                if engine is not None:
+                    return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, 'before_flush')
+def _mark_flush(session, flush_context, instances):
+    # Set before the flush asks for a bind, so its statements go to the primary
+    session.info['wrote'] = True
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _record_write(session):
+    if session.info.pop('wrote', False):
+        recent_writes.record(session.info.get('user_id'))
+
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def _forget_write(session):
+    session.info.pop('wrote', None)
@@ -1,128 +1,304 @@
-import pandas as pd
-import math
 import logging
+import hashlib
+from datetime import datetime
 logger = logging.getLogger(__name__)
-from models import User, BehavioralAssessment, ReferenceProfile
-import joblib
-from ml.feature_engineering import create_derived_features, calculate_skill_match
+from sqlalchemy import delete, insert
+from extensions import db
+from models import User, BehavioralAssessment, ReferenceProfile, UserRecommendation
+from career_catalogue import catalogue
+from assessments import factor_scores
+from reference_profiles import profile_index
+from model_service import model_service
+from coalescer import BatchCoalescer
+from scoring import (
+    top_k_careers, blend_scores,
+    personality_scores, skills_scores, combined_scores
+)
+from skills import user_skill_bits
 
 # recommendation.py
 def calculate_reference_profile(user_id):
-    """Calculate the best matching reference profile for a user"""
-    factors = {"Dominance": 0, "Extraversion": 0, "Patience": 0, "Formality": 0}
-    assessments = BehavioralAssessment.query.filter_by(user_id=user_id).all()
+    """Calculate the best matching reference profile for a user's stored assessment"""
+    answers = (
+        db.session.query(BehavioralAssessment.question_type, BehavioralAssessment.factor)
+        .filter_by(user_id=user_id)
+        .all()
+    )
     
-    if not assessments:
+    if not answers:
         logger.warning(f"No assessments found for user {user_id}")
         return None
 
-    # Calculate factor scores
-    for assessment in assessments:
-        if assessment.question_type == "Expected":
-            factors[assessment.factor] += 1
-        elif assessment.question_type == "Self-description":
-            factors[assessment.factor] += 2
-   
-    # Get all reference profiles
-    profiles = ReferenceProfile.query.all()
-    if not profiles:
-        logger.warning("No reference profiles found in database")
-        return None
-
-    # Find best matching profile
-    best_profile = None
-    lowest_distance = float('inf')
-
-    for profile in profiles:
-        if not all(hasattr(profile, attr) for attr in ['dominance', 'extraversion', 'patience', 'formality']):
-            continue
-            
-        distance = math.sqrt(
-            (factors["Dominance"] - profile.dominance) ** 2 +
-            (factors["Extraversion"] - profile.extraversion) ** 2 +
-            (factors["Patience"] - profile.patience) ** 2 +
-            (factors["Formality"] - profile.formality) ** 2
-        )
-        
-        if distance < lowest_distance:
-            lowest_distance = distance
-            best_profile = profile
-
+    best_profile = profile_index.match(factor_scores(answers))
     if best_profile:
-        logger.info(f"Found matching profile {best_profile.name} for user {user_id}")
-        return best_profile.id
+        logger.debug("Found matching profile %s for user %s", best_profile['name'], user_id)
+        return best_profile['id']
     else:
         logger.warning(f"No suitable profile found for user {user_id}")
         return None
 
-def career_recommendation(user_id):
+def format_recommendations(snapshot, scores, personality, skills_match, k):
+    """Pick the k best careers from one user's score arrays, as percentages"""
+    return [
+        {
+            'career': snapshot.career(row),
+            'rating': round(float(scores[row]) * 100, 2),
+            'personality_match': round(float(personality[row]) * 100, 2),
+            'skills_match': round(float(skills_match[row]) * 100, 2)
+        }
+        for row in top_k_careers(snapshot, scores, k)
+    ]
+
+def score_requests(snapshot, model, requests):
+    """Score (traits, skill set, age, k) requests as one matrix operation.
+
+    Returns each request's k best careers. With a model from model_service,
+    its career scores (one prediction for the whole batch) are blended into
+    the ratings.
+    """
+    traits = [request[0] for request in requests]
+    personality = personality_scores(snapshot, traits)
+    skills_match = skills_scores(snapshot, [request[1] for request in requests])
+    scores = combined_scores(personality, skills_match)
+    if model is not None:
+        model_scores = model_service.career_scores(model, snapshot, [request[2] for request in requests], traits)
+        if model_scores is not None:
+            scores = blend_scores(scores, model_scores, model_service.blend_weight)
+    
+    return [
+        format_recommendations(snapshot, scores[i], personality[i], skills_match[i], request[3])
+        for i, request in enumerate(requests)
+    ]
+
+# Concurrent score_user calls with a model in this process are scored together
+scoring_coalescer = BatchCoalescer(lambda key, requests: score_requests(key[0], key[1], requests))
+
+def score_user(user, k, snapshot, model=None):
+    """Return the k best careers for an already loaded User.
+
+    With a model, the scoring goes through scoring_coalescer, so users
+    scored at the same moment share one matrix operation and one model
+    prediction. The heuristic alone is cheaper than waiting for a batch and
+    is scored straight away.
+    """
+    profile = profile_index.get(user.reference_profile_id)
+    if not profile:
+        logger.warning(f"No profile found for user {user.id}")
+        return []
+    
+    request = (profile_index.traits(profile), user_skill_bits(user.skill_bits, user.skills), user.age, k)
+    if model is None:
+        return score_requests(snapshot, None, [request])[0]
+    return scoring_coalescer.submit((snapshot, model), request)
+
+def career_recommendation_top_k(user_id, k=1):
+    """Return the k best careers for a user, best first.
+
+    Each entry holds the career, its overall rating and the personality and
+    skills sub-scores, all as percentages. Returns an empty list on failure.
+    """
     try:
         user = User.query.get(user_id)
         if not user:
             logger.error(f"User {user_id} not found")
-            return None, 0
-            
-        profile = ReferenceProfile.query.get(user.reference_profile_id)
-        if not profile:
-            logger.warning(f"No profile found for user {user_id}")
-            return None, 0
+            return []
             
-        # Read the career data with absolute path
-        import os
-        data_file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'career_recommendation_with_courses.csv')
+        try:
+            snapshot = catalogue.snapshot()
+        except FileNotFoundError:
+            logger.error(f"Career recommendation data file not found at {catalogue.path}")
+            return []
         
-        if not os.path.exists(data_file_path):
-            logger.error(f"Career recommendation data file not found at {data_file_path}")
-            return None, 0
-            
-        df = pd.read_csv(data_file_path)
-        
-        # Calculate skills match for each career
-        user_skills = set(user.skills.split(", ")) if user.skills else set()
+        return score_user(user, k, snapshot, model_service.active())
         
-        # Calculate personality match
-        personality_scores = []
-        for _, row in df.iterrows():
-            # Calculate personality distance
-            personality_distance = math.sqrt(
-                (row['Dominance'] - profile.dominance) ** 2 +
-                (row['Extraversion'] - profile.extraversion) ** 2 +
-                (row['Patience'] - profile.patience) ** 2 +
-                (row['Formality'] - profile.formality) ** 2
+    except Exception as e:
+        logger.error(f"Error in career recommendation: {str(e)}")
+        return []
+
+def career_recommendation(user_id):
+    """Return the best career for a user and its match percentage"""
+    recommendations = career_recommendation_top_k(user_id, 1)
+    if not recommendations:
+        return None, 0
+    
+    best_match = recommendations[0]
+    logger.debug(
+        "Career prediction for user %s: %s (%s%%)", user_id, best_match['career'], best_match['rating']
+    )
+    
+    return best_match['career'], best_match['rating']
+
+
+# Users per IN (...) query, kept under SQLite's bound-parameter limit
+COHORT_QUERY_SIZE = 500
+# Users scored per matrix operation, bounding the users x careers arrays
+COHORT_SCORING_SIZE = 256
+
+def load_cohort(user_ids):
+    """Load id, skills, skill bits, age and profile traits for users that have a reference profile.
+
+    Users and their profiles come back from a single joined query per
+    COHORT_QUERY_SIZE ids, as plain rows rather than ORM objects.
+    """
+    user_ids = list(dict.fromkeys(user_ids))
+    rows = []
+    for start in range(0, len(user_ids), COHORT_QUERY_SIZE):
+        chunk = user_ids[start:start + COHORT_QUERY_SIZE]
+        rows.extend(
+            db.session.query(
+                User.id, User.skills, User.skill_bits, User.age,
+                ReferenceProfile.dominance, ReferenceProfile.extraversion,
+                ReferenceProfile.patience, ReferenceProfile.formality
             )
-            
-            # Calculate skills match
-            career_skills = set(str(row['Key Skills']).split(",")) if pd.notna(row['Key Skills']) else set()
-            skills_match = len(user_skills.intersection(career_skills)) / len(career_skills) if career_skills else 0
-            
-            # Combined score (weighted average)
-            personality_weight = 0.7
-            skills_weight = 0.3
-            
-            # Normalize personality distance to 0-1 scale (inverse it so higher is better)
-            max_distance = math.sqrt(4 * 100)  # Maximum possible distance
-            personality_score = 1 - (personality_distance / max_distance)
-            
-            # Calculate final score
-            final_score = (personality_weight * personality_score) + (skills_weight * skills_match)
-            
-            personality_scores.append({
-                'career': row['Recommended Career'],
-                'score': final_score,
-                'skills_match': skills_match,
-                'personality_match': personality_score
-            })
-        
-        # Get best match
-        best_match = max(personality_scores, key=lambda x: x['score'])
-        
-        # Convert score to percentage
-        match_percentage = round(best_match['score'] * 100, 2)
+            .join(ReferenceProfile, User.reference_profile_id == ReferenceProfile.id)
+            .filter(User.id.in_(chunk))
+            .all()
+        )
+    return rows
+
+def career_recommendation_batch(user_ids, k=1, snapshot=None, model=None):
+    """Recommend careers for a whole cohort at once.
+
+    Returns a dict mapping every requested user id to its k best careers (as
+    career_recommendation_top_k does); users that are missing or have not
+    completed the assessment map to an empty list. ``model`` defaults to
+    model_service.active(); its predictions take one call per chunk.
+    """
+    results = {user_id: [] for user_id in user_ids}
+    cohort = load_cohort(user_ids)
+    if not cohort:
+        return results
+    
+    if snapshot is None:
+        snapshot = catalogue.snapshot()
+    if model is None:
+        model = model_service.active()
+    
+    for start in range(0, len(cohort), COHORT_SCORING_SIZE):
+        chunk = cohort[start:start + COHORT_SCORING_SIZE]
+        requests = [(row[4:], user_skill_bits(row.skill_bits, row.skills), row.age, k) for row in chunk]
+        for row, recommendations in zip(chunk, score_requests(snapshot, model, requests)):
+            results[row.id] = recommendations
+    
+    logger.info(f"Scored {len(cohort)} of {len(results)} users against {len(snapshot)} careers")
+    return results
+
+def recommendation_inputs_key(reference_profile_id, skills, age):
+    """Stamp of the user inputs a stored recommendation was computed from"""
+    return hashlib.sha1(f"{reference_profile_id}|{skills or ''}|{age}".encode('utf-8')).hexdigest()
+
+def scoring_version(snapshot, model):
+    """Stamp of the catalogue, and the model blended in, that scores come from"""
+    if model is None:
+        return snapshot.version
+    return hashlib.sha256(
+        f"{snapshot.version}|{model.version}|{model_service.blend_weight}".encode('utf-8')
+    ).hexdigest()
+
+def store_recommendations(results, catalogue_version, inputs_keys=None):
+    """Replace the stored UserRecommendation rows for the given users.
+
+    ``results`` is the dict returned by career_recommendation_batch and
+    ``inputs_keys`` maps user ids to recommendation_inputs_key(); when omitted
+    the keys are read from the users table. Each chunk of users is one delete
+    and one executemany insert; the caller commits.
+    """
+    computed_at = datetime.utcnow()
+    user_ids = list(results)
+    for start in range(0, len(user_ids), COHORT_QUERY_SIZE):
+        chunk = user_ids[start:start + COHORT_QUERY_SIZE]
+        if inputs_keys is None:
+            chunk_keys = {
+                user_id: recommendation_inputs_key(profile_id, skills, age)
+                for user_id, profile_id, skills, age in db.session.query(
+                    User.id, User.reference_profile_id, User.skills, User.age
+                ).filter(User.id.in_(chunk))
+            }
+        else:
+            chunk_keys = inputs_keys
+        db.session.execute(delete(UserRecommendation).where(UserRecommendation.user_id.in_(chunk)))
+        rows = [
+            {
+                'user_id': user_id,
+                'rank': rank,
+                'career': recommendation['career'],
+                'rating': recommendation['rating'],
+                'personality_match': recommendation['personality_match'],
+                'skills_match': recommendation['skills_match'],
+                'catalogue_version': catalogue_version,
+                'inputs_key': chunk_keys[user_id],
+                'computed_at': computed_at
+            }
+            for user_id in chunk if user_id in chunk_keys
+            for rank, recommendation in enumerate(results[user_id], start=1)
+        ]
+        if rows:
+            db.session.execute(insert(UserRecommendation), rows)
+
+# Careers kept per user in user_recommendations; requests for more recompute
+STORED_RECOMMENDATIONS = 10
+
+def refresh_user_recommendations(user, snapshot=None):
+    """Recompute and store a user's recommendations after their inputs changed.
+
+    Call after updating reference_profile_id, skills or age, before
+    committing. Returns the new recommendations.
+    """
+    if snapshot is None:
+        snapshot = catalogue.snapshot()
+    model = model_service.active()
+    recommendations = score_user(user, STORED_RECOMMENDATIONS, snapshot, model) if user.reference_profile_id else []
+    store_recommendations(
+        {user.id: recommendations},
+        scoring_version(snapshot, model),
+        {user.id: recommendation_inputs_key(user.reference_profile_id, user.skills, user.age)}
+    )
+    return recommendations
+
+def get_user_recommendations(user, k=1):
+    """Return a user's k best careers, served from user_recommendations.
+
+    Stored rows are used while they were computed from the current catalogue
+    version and model and the user's current reference profile, skills and
+    age. Otherwise the user is scored afresh but nothing is stored, so read
+    routes never write: the rows are replaced by refresh_user_recommendations
+    when the user's inputs change and by score_cohort.py after a new
+    catalogue or model. Returns an empty list on failure.
+    """
+    if not user.reference_profile_id:
+        return []
+    
+    try:
+        snapshot = catalogue.snapshot()
+        rows = (
+            UserRecommendation.query
+            .filter_by(user_id=user.id)
+            .order_by(UserRecommendation.rank)
+            .all()
+        )
         
-        logger.info(f"Career prediction for user {user_id}: {best_match['career']} ({match_percentage}%)")
+        model = model_service.active()
+        version = scoring_version(snapshot, model)
+        inputs_key = recommendation_inputs_key(user.reference_profile_id, user.skills, user.age)
+        if (
+            rows
+            and rows[0].catalogue_version == version
+            and rows[0].inputs_key == inputs_key
+            and (len(rows) >= k or len(rows) == len(snapshot.career_names))
+        ):
+            return [
+                {
+                    'career': row.career,
+                    'rating': row.rating,
+                    'personality_match': row.personality_match,
+                    'skills_match': row.skills_match
+                }
+                for row in rows[:k]
+            ]
         
-        return best_match['career'], match_percentage
+        return score_user(user, k, snapshot, model)
         
     except Exception as e:
-        logger.error(f"Error in career recommendation: {str(e)}")
-        return None, 0
\ No newline at end of file
+        db.session.rollback()
+        logger.error(f"Error getting stored recommendations for user {user.id}: {str(e)}")
+        return []
@@ -0,0 +1,89 @@
+import logging
+import threading
+
+import numpy as np
+
+from models import ReferenceProfile
+from assessments import FACTORS
+
+logger = logging.getLogger(__name__)
+
+
+class ReferenceProfileIndex:
+    """In-process copy of the reference_profiles table.
+
+    Holds the profiles as a (profiles, 4) trait matrix plus id/name/
+    description payloads, so matching a user is one vectorized distance and
+    argmin and looking a profile up costs no query. Loaded on first use in
+    each process; init_data reloads it only in the process that synced the
+    table, so other workers keep the old profiles until they restart.
+    """
+
+    def __init__(self):
+        self._data = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Read every reference profile (one query) and replace the index"""
+        profiles = ReferenceProfile.query.order_by(ReferenceProfile.id).all()
+        complete = [
+            p for p in profiles
+            if None not in (p.dominance, p.extraversion, p.patience, p.formality)
+        ]
+        payloads = {
+            p.id: {
+                "id": p.id,
+                "name": p.name,
+                "description": p.description,
+                "dominance": p.dominance,
+                "extraversion": p.extraversion,
+                "patience": p.patience,
+                "formality": p.formality
+            }
+            for p in profiles
+        }
+        traits = np.array(
+            [(p.dominance, p.extraversion, p.patience, p.formality) for p in complete],
+            dtype=np.float64
+        ).reshape(len(complete), len(FACTORS))
+        ids = [p.id for p in complete]
+        self._data = (ids, traits, payloads)
+        logger.info(f"Loaded {len(payloads)} reference profiles")
+
+    def invalidate(self):
+        """Drop this process's index; the next lookup in it reloads it"""
+        self._data = None
+
+    def _get_data(self):
+        data = self._data
+        if data is None:
+            with self._lock:
+                if self._data is None:
+                    self.load()
+                data = self._data
+        return data
+
+    def get(self, profile_id):
+        """Return a profile's payload dict, or None. Do not modify it."""
+        return self._get_data()[2].get(profile_id)
+
+    @staticmethod
+    def traits(profile):
+        """Return a payload's (Dominance, Extraversion, Patience, Formality)"""
+        return (profile["dominance"], profile["extraversion"], profile["patience"], profile["formality"])
+
+    def match(self, factors):
+        """Return the payload of the profile closest to factor scores in FACTORS order.
+
+        Euclidean distance over the four factors; the lowest id wins ties,
+        like the first-found rule of the original loop.
+        """
+        ids, traits, payloads = self._get_data()
+        if not ids:
+            return None
+        user = np.asarray(factors, dtype=np.float64)
+        distances = np.sqrt(((traits - user) ** 2).sum(axis=1))
+        return payloads[ids[int(np.argmin(distances))]]
+
+
+profile_index = ReferenceProfileIndex()
@@ -0,0 +1,67 @@
+# score_cohort.py
+"""Precompute career recommendations for many users into user_recommendations.
+
+Usage:
+    python score_cohort.py                 # every user with a completed assessment
+    python score_cohort.py --users 1 2 3   # only these users
+    python score_cohort.py --k 3
+"""
+import argparse
+import logging
+import time
+
+from app import app
+from extensions import db
+from models import User
+from career_catalogue import catalogue
+from model_service import model_service
+from recommendation import (
+    career_recommendation_batch, store_recommendations, scoring_version, STORED_RECOMMENDATIONS
+)
+
+logger = logging.getLogger(__name__)
+
+
+def score_cohort(user_ids=None, k=STORED_RECOMMENDATIONS, chunk_size=2000):
+    """Score users chunk by chunk, committing each chunk's recommendations"""
+    with app.app_context():
+        db.create_all()
+        
+        if user_ids is None:
+            user_ids = [
+                user_id for (user_id,) in
+                db.session.query(User.id).filter(User.reference_profile_id.isnot(None)).order_by(User.id)
+            ]
+            
+        snapshot = catalogue.snapshot()
+        model_service.load()
+        model = model_service.active()
+        version = scoring_version(snapshot, model)
+        started = time.perf_counter()
+        scored = 0
+        
+        for start in range(0, len(user_ids), chunk_size):
+            chunk = user_ids[start:start + chunk_size]
+            try:
+                results = career_recommendation_batch(chunk, k, snapshot=snapshot, model=model)
+                store_recommendations(results, version)
+                db.session.commit()
+                scored += sum(1 for recs in results.values() if recs)
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Error scoring users {chunk[0]}..{chunk[-1]}: {str(e)}")
+                
+        elapsed = time.perf_counter() - started
+        rate = scored / elapsed if elapsed else 0
+        print(f"Scored {scored} of {len(user_ids)} users in {elapsed:.2f}s ({rate:.0f} users/s), "
+              f"catalogue {snapshot.version[:12]}, model {model.version[:12] if model else 'off'}")
+        return scored
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, nargs='+', help="user ids to score (default: all assessed users)")
+    parser.add_argument('--k', type=int, default=STORED_RECOMMENDATIONS, help="careers to store per user")
+    parser.add_argument('--chunk-size', type=int, default=2000, help="users per transaction")
+    args = parser.parse_args()
+    score_cohort(args.users, args.k, args.chunk_size)
@@ -0,0 +1,110 @@
+import math
+
+import numpy as np
+
+from ml.feature_engineering import popcount
+from skills import skill_vocabulary
+
+# Weights and normalisation used by career_recommendation
+PERSONALITY_WEIGHT = 0.7
+SKILLS_WEIGHT = 0.3
+MAX_DISTANCE = math.sqrt(4 * 100)  # Maximum possible distance
+
+
+def personality_scores(snapshot, traits):
+    """Score every career against users' trait vectors.
+
+    ``traits`` is a sequence of 4 values for one user, or a (users, 4) array.
+    Returns an array of shape (careers,) or (users, careers). The squared
+    differences are summed in the same order as the original scalar loop so
+    results are bit-identical to it.
+    """
+    traits = np.asarray(traits, dtype=np.float64)
+    career_traits = snapshot.traits.astype(np.float64)
+    single = traits.ndim == 1
+    if single:
+        traits = traits[np.newaxis, :]
+
+    diff = career_traits[np.newaxis, :, :] - traits[:, np.newaxis, :]
+    squared = diff * diff
+    distance = np.sqrt(squared[..., 0] + squared[..., 1] + squared[..., 2] + squared[..., 3])
+    scores = 1 - (distance / MAX_DISTANCE)
+    return scores[0] if single else scores
+
+
+def user_bitsets(skill_sets):
+    """Skill bitsets, shape (words,) or (users, words), from sets of names or bitsets"""
+    if isinstance(skill_sets, (set, frozenset)):
+        return skill_vocabulary.bitset(skill_sets)
+    if isinstance(skill_sets, np.ndarray):
+        return skill_sets
+    bits = [user_bitsets(skills) for skills in skill_sets]
+    return np.array(bits, dtype=np.uint64).reshape(-1, skill_vocabulary.words)
+
+
+def skills_scores(snapshot, skill_sets):
+    """Fraction of each career's key skills a user has.
+
+    ``skill_sets`` is one user's skills, or a list of them for a batch, each
+    a set of skill names or a skill bitset. The overlap with each distinct
+    career skill set is a popcount of the AND of the bitsets. Returns an
+    array of shape (careers,) or (users, careers).
+    """
+    counts = snapshot.skill_set_counts
+    bits = user_bitsets(skill_sets)
+    overlap = popcount(bits[..., np.newaxis, :] & snapshot.skill_bits)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        by_set = np.where(counts > 0, overlap / counts, 0.0)
+    return by_set[..., snapshot.skill_rows]
+
+
+def combined_scores(personality, skills):
+    """Weighted average of the personality and skills scores"""
+    return (PERSONALITY_WEIGHT * personality) + (SKILLS_WEIGHT * skills)
+
+
+def blend_scores(scores, model_scores, weight):
+    """Mix model probabilities into the heuristic scores; weight is the model's share"""
+    return (1 - weight) * scores + weight * model_scores
+
+
+def score_careers(snapshot, traits, skills):
+    """Return (score, personality_match, skills_match) arrays for one user"""
+    personality = personality_scores(snapshot, traits)
+    skills_match = skills_scores(snapshot, skills)
+    return combined_scores(personality, skills_match), personality, skills_match
+
+
+def top_k_careers(snapshot, scores, k):
+    """Return row indices of the k best distinct careers, best first.
+
+    Each career is represented by its highest scoring row (the earliest one on
+    ties), and careers with equal scores are ordered by that row, so k=1 agrees
+    with ``np.argmax(scores)``. Uses argpartition rather than a full sort:
+    O(rows + k log k).
+    """
+    codes = snapshot.career_codes
+    n_careers = len(snapshot.career_names)
+    k = min(k, n_careers)
+    if k <= 0:
+        return []
+
+    best = np.full(n_careers, -np.inf)
+    np.maximum.at(best, codes, scores)
+
+    rows = np.arange(len(codes))
+    is_best = scores == best[codes]
+    first_row = np.full(n_careers, len(codes))
+    np.minimum.at(first_row, codes[is_best], rows[is_best])
+
+    # Everything strictly above the k-th best score is in; fill the rest with
+    # the earliest careers tied at that score
+    kth = best[np.argpartition(-best, k - 1)[k - 1]]
+    above = np.flatnonzero(best > kth)
+    tied = np.flatnonzero(best == kth)
+    tied = tied[np.argsort(first_row[tied], kind='stable')][:k - len(above)]
+    chosen = np.concatenate([above, tied])
+
+    order = np.lexsort((first_row[chosen], -best[chosen]))
+    return first_row[chosen[order]].tolist()
@@ -0,0 +1,96 @@
+import csv
+import os
+from types import MappingProxyType
+
+import numpy as np
+
+from ml.feature_engineering import parse_skills, skill_bitsets
+
+SKILLS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'skills.csv')
+
+
+class SkillVocabulary:
+    """Interned skill names, read once from data/skills.csv.
+
+    A skill's integer id is its bit in skill bitsets: ``bitset`` packs a set
+    of names into little-endian uint64 words and ``pack`` stores them as
+    bytes (User.skill_bits, Course.skill_bits). Ids are fixed by the file, so
+    new skills must be appended with the next id; stored bitsets shorter
+    than the current vocabulary are zero padded when read. Skills users may
+    pick are marked Selectable; courses and careers may use any skill.
+    """
+
+    def __init__(self, names, selectable):
+        self.names = tuple(names)
+        self.ids = MappingProxyType({name: i for i, name in enumerate(self.names)})
+        self.selectable = tuple(selectable)
+        self.selectable_set = frozenset(self.selectable)
+        self.words = max(1, -(-len(self.names) // 64))
+
+    @classmethod
+    def load(cls, path=SKILLS_PATH):
+        names, selectable = [], []
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                if int(row['Id']) != len(names):
+                    raise ValueError(f"{path}: skill ids must run 0, 1, 2, ... (got {row['Id']} for {row['Skill']})")
+                names.append(row['Skill'])
+                if row['Selectable'] == '1':
+                    selectable.append(row['Skill'])
+        return cls(names, selectable)
+
+    def __len__(self):
+        return len(self.names)
+
+    def invalid(self, skills):
+        """The skills a user may not pick, in the order given"""
+        return [skill for skill in skills if skill not in self.selectable_set]
+
+    def bitset(self, skills):
+        """Bitset of a set of names, or of a comma separated string; unknown names are dropped"""
+        if skills is None or isinstance(skills, str):
+            skills = parse_skills(skills)
+        return skill_bitsets(frozenset(skills), self.ids)
+
+    def pack(self, skills):
+        return self.bitset(skills).astype('<u8').tobytes()
+
+    def unpack(self, data):
+        """Bitset stored by pack, padded to the current vocabulary"""
+        bits = np.zeros(self.words, dtype=np.uint64)
+        stored = np.frombuffer(data, dtype='<u8')[:self.words]
+        bits[:len(stored)] = stored
+        return bits
+
+    def from_bitset(self, bits):
+        """Names of the skills set in a bitset, in id order"""
+        flags = np.unpackbits(np.asarray(bits, dtype='<u8').view(np.uint8), bitorder='little')
+        return [self.names[i] for i in np.flatnonzero(flags[:len(self.names)])]
+
+
+skill_vocabulary = SkillVocabulary.load()
+# Skills users can choose from, in display order
+AVAILABLE_SKILLS = skill_vocabulary.selectable
+
+
+def split_skills(skills):
+    """Skill names of a stored skills string, in order; ', ' and ',' both separate"""
+    if not skills:
+        return []
+    return [s.strip() for s in skills.split(',') if s.strip()]
+
+
+def format_skills(skills):
+    """Store a list of skill names (or a skills string) as a ', ' separated string"""
+    if skills is None:
+        return None
+    if isinstance(skills, str):
+        skills = split_skills(skills)
+    return ", ".join(s.strip() for s in skills if s and s.strip())
+
+
+def user_skill_bits(skill_bits, skills):
+    """A user's skill bitset: the stored one, or parsed from skills if it was never stored"""
+    if skill_bits is not None:
+        return skill_vocabulary.unpack(skill_bits)
+    return skill_vocabulary.bitset(skills)
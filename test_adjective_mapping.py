@@ -1,4 +1,5 @@
 # test_adjective_mapping.py
+from lookup_tables import get_factor
 
 def test_get_factor():
     adjectives = {
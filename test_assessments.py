@@ -0,0 +1,67 @@
+# test_assessments.py
+import pytest
+from sqlalchemy import text
+
+from extensions import db
+from models import Adjective, BehavioralAssessment
+from assessments import FACTOR_CODES, QUESTION_TYPE_CODES, adjective_vocabulary, factor_scores
+from init_data import init_adjectives
+from migrate_assessments import migrate, needs_migration
+
+
+def test_factor_scores():
+    answers = [(0, FACTOR_CODES["Patience"]), (1, FACTOR_CODES["Patience"]),
+               (1, FACTOR_CODES["Formality"]), (None, FACTOR_CODES["Dominance"]), (1, None)]
+    assert factor_scores(answers) == [0, 0, 3, 2]
+
+
+def test_vocabulary_is_closed(app):
+    init_adjectives(app)
+    stored = Adjective.query.count()
+    assert stored == len(adjective_vocabulary.words)
+
+    calm, bold, organized = adjective_vocabulary.ids(["calm", "Bold", "organized"])
+    assert adjective_vocabulary.ids([" CALM ", "organised"]) == [calm, organized]
+    assert len({calm, bold, organized}) == 3
+
+    with pytest.raises(KeyError):
+        adjective_vocabulary.ids(["calm", "sideways"])
+    with pytest.raises(KeyError):
+        adjective_vocabulary.ids([None])
+
+    # Reloading the CSV keeps the ids
+    init_adjectives(app)
+    assert Adjective.query.count() == stored
+    assert adjective_vocabulary.ids(["bold"]) == [bold]
+
+
+def test_migrates_text_columns(app):
+    with db.engine.begin() as connection:
+        BehavioralAssessment.__table__.drop(connection)
+        connection.execute(text(
+            "CREATE TABLE behavioral_assessments (id INTEGER PRIMARY KEY, user_id INTEGER, "
+            "question_type VARCHAR(50), adjective VARCHAR(50), factor VARCHAR(50))"
+        ))
+        connection.execute(text("INSERT INTO behavioral_assessments (user_id, question_type, adjective, factor) VALUES "
+                                "(1, 'Self-description', 'calm', 'Patience'), (1, 'Expected', 'bold', 'Dominance'), "
+                                "(2, 'Self-description', 'calm', 'Patience'), (2, 'Other', NULL, 'Sideways')"))
+        assert needs_migration(connection)
+        assert migrate(connection) == 4
+        assert not needs_migration(connection)
+        assert migrate(connection) == 0
+
+    # Every adjective is stored, not only those in old answers
+    adjective_vocabulary.clear()
+    assert Adjective.query.count() == len(adjective_vocabulary.words)
+    assert len(adjective_vocabulary.ids(adjective_vocabulary.words)) == len(adjective_vocabulary.words)
+
+    rows = db.session.query(
+        BehavioralAssessment.user_id, BehavioralAssessment.question_type, Adjective.word, BehavioralAssessment.factor
+    ).outerjoin(Adjective).order_by(BehavioralAssessment.id).all()
+    self_description, patience = QUESTION_TYPE_CODES["Self-description"], FACTOR_CODES["Patience"]
+    assert [tuple(row) for row in rows] == [
+        (1, self_description, "calm", patience),
+        (1, QUESTION_TYPE_CODES["Expected"], "bold", FACTOR_CODES["Dominance"]),
+        (2, self_description, "calm", patience),
+        (2, None, None, None),
+    ]
@@ -0,0 +1,85 @@
+# test_bulk_load.py
+from extensions import db
+from models import University, Course
+from bulk_load import bulk_load, stream_csv, sync_table
+from init_data import university_mapping
+
+
+def test_streams_chunks_upserts_and_rejects_bad_rows(app, tmp_path):
+    path = tmp_path / "universities.csv"
+    path.write_text(
+        "ID,Name,Tel Number,Website\n"
+        "UJ,University of Johannesburg,011,www.uj.ac.za\n"
+        ",Nameless,012,\n"
+        "UP,University of Pretoria,012,www.up.ac.za\n"
+        "UJ,University of Johannesburg (renamed),011,\n"
+        "UCT,University of Cape Town,021,www.uct.ac.za\n"
+    )
+
+    report = bulk_load('Universities', stream_csv(str(path), chunk_size=2), university_mapping,
+                       University, conflict_key='id')
+
+    assert (report.loaded, report.rejected, report.chunks) == (4, 1, 3)
+    assert report.rows_per_second > 0
+    assert University.query.count() == 3
+    assert db.session.get(University, 'UJ').name == "University of Johannesburg (renamed)"
+
+
+def test_database_errors_reject_only_offending_rows(app, tmp_path):
+    path = tmp_path / "universities.csv"
+    path.write_text("ID,Name\nUJ,Johannesburg\nUP,\nUCT,Cape Town\n")
+
+    # University.name is NOT NULL, so the UP row fails inside the database
+    report = bulk_load('Universities', stream_csv(str(path)),
+                       lambda row: {'id': row['ID'], 'name': row['Name']}, University)
+
+    assert (report.loaded, report.rejected) == (2, 1)
+    assert {u.id for u in University.query.all()} == {'UJ', 'UCT'}
+
+
+def test_sync_applies_only_the_diff_and_keeps_ids(app, tmp_path):
+    path = tmp_path / "courses.csv"
+    mapping = lambda row: {'name': row['Course'], 'recommended_career': row['Career'], 'duration': row['Duration']}
+    sync = lambda: sync_table('Courses', stream_csv(str(path)), mapping, Course,
+                              key_columns=('name', 'recommended_career'))
+
+    path.write_text("Course,Career,Duration\nBSc,Geologist,3\nBCom,Accountant,3\nBCom,Accountant,4\nLLB,Lawyer,4\n")
+    assert sync().inserted == 4
+    ids = {(c.name, c.duration): c.id for c in Course.query.all()}
+
+    report = sync()
+    assert (report.writes, report.unchanged) == (0, 4)
+
+    path.write_text("Course,Career,Duration\nBSc,Geologist,4\nBCom,Accountant,3\nBCom,Accountant,4\nBEd,Teacher,4\n")
+    report = sync()
+    assert (report.inserted, report.updated, report.deleted, report.unchanged) == (1, 1, 1, 2)
+
+    courses = {(c.name, c.duration): c.id for c in Course.query.all()}
+    assert courses[('BSc', 4)] == ids[('BSc', 3)]
+    assert courses[('BCom', 3)] == ids[('BCom', 3)]
+    assert ('LLB', 4) not in courses
+
+
+def test_sync_deletes_nothing_when_rows_are_rejected_or_the_source_is_empty(app, tmp_path):
+    path = tmp_path / "universities.csv"
+    sync = lambda: sync_table('Universities', stream_csv(str(path)), university_mapping, University,
+                              key_columns=('id',))
+
+    path.write_text("ID,Name,Tel Number,Website\nUJ,Johannesburg,,\nUP,Pretoria,,\nUCT,Cape Town,,\n")
+    assert sync().inserted == 3
+
+    # A renamed header rejects every row
+    path.write_text("Code,Name,Tel Number,Website\nUJ,Johannesburg,,\nUP,Pretoria,,\n")
+    report = sync()
+    assert (report.rejected, report.deleted) == (2, 0)
+
+    path.write_text("ID,Name,Tel Number,Website\nUJ,Johannesburg,,\n,Nameless,,\n")
+    report = sync()
+    assert (report.rejected, report.deleted) == (1, 0)
+
+    path.write_text("ID,Name,Tel Number,Website\n")
+    assert sync().deleted == 0
+    assert University.query.count() == 3
+
+    path.write_text("ID,Name,Tel Number,Website\nUJ,Johannesburg,,\nUP,Pretoria,,\n")
+    assert sync().deleted == 1
@@ -0,0 +1,79 @@
+# test_career_catalogue.py
+import os
+
+from career_catalogue import CareerCatalogue
+
+CSV_HEADER = "Age,Course,Universities_ID,Faculty/Department,Duration,Key Skills,Dominance,Extraversion,Patience,Formality,Recommended Career\n"
+
+
+def write_csv(path, rows):
+    with open(path, 'w') as f:
+        f.write(CSV_HEADER)
+        for row in rows:
+            f.write(row + "\n")
+
+
+def test_parses_once_and_reloads_on_change(tmp_path):
+    path = tmp_path / "careers.csv"
+    write_csv(path, [
+        '30,LLB,8,LAW,1,"Legal Research,Negotiation",2,3,2,7,Public Defender',
+        '23,LLB,6,LAW,2,"Legal Research,Negotiation",9,2,3,3,Public Defender',
+    ])
+    catalogue = CareerCatalogue(str(path), check_interval=0)
+
+    first = catalogue.snapshot()
+    assert catalogue.snapshot() is first
+    assert len(first) == 2
+    assert first.career_names == ("Public Defender",)
+    assert first.traits[1].tolist() == [9, 2, 3, 3]
+    assert first.skill_names == ("Legal Research", "Negotiation")
+    assert first.skill_counts.tolist() == [2, 2]
+
+    # Touching the file without changing it keeps the snapshot
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert catalogue.snapshot() is first
+
+    write_csv(path, ['34,BSc,3,SCIENCE,3,Research Methods,4,4,5,5,Agronomist'])
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000))
+    second = catalogue.snapshot()
+    assert second is not first
+    assert second.version != first.version
+    assert second.career(0) == "Agronomist"
+
+    stats = catalogue.stats()
+    assert stats['reloads'] == 2
+    assert stats['unchanged_checks'] == 1
+    assert stats['hits'] == 2
+    assert stats['parse_seconds_total'] > 0
+
+
+def test_keeps_snapshot_when_file_disappears(tmp_path):
+    path = tmp_path / "careers.csv"
+    write_csv(path, ['30,LLB,8,LAW,1,Negotiation,2,3,2,7,Public Defender'])
+    catalogue = CareerCatalogue(str(path), check_interval=0)
+    first = catalogue.snapshot()
+
+    os.remove(path)
+    assert catalogue.snapshot() is first
+
+
+def test_keeps_snapshot_when_file_is_malformed(tmp_path):
+    path = tmp_path / "careers.csv"
+    write_csv(path, ['30,LLB,8,LAW,1,Negotiation,2,3,2,7,Public Defender'])
+    catalogue = CareerCatalogue(str(path), check_interval=0)
+    first = catalogue.snapshot()
+
+    # A renamed column, then a half-written file
+    path.write_text(CSV_HEADER.replace("Recommended Career", "Career") + "30,LLB,8,LAW,1,Negotiation,2,3,2,7,X\n")
+    assert catalogue.snapshot() is first
+    assert catalogue.snapshot() is first
+    assert catalogue.stats()['parse_errors'] == 1
+
+    path.write_text(CSV_HEADER + '30,LLB,8,"LAW\n')
+    assert catalogue.snapshot() is first
+    assert catalogue.stats()['parse_errors'] == 2
+
+    write_csv(path, ['34,BSc,3,SCIENCE,3,Research Methods,4,4,5,5,Agronomist'])
+    assert catalogue.snapshot().career(0) == "Agronomist"
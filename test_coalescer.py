@@ -0,0 +1,62 @@
+# test_coalescer.py
+import threading
+
+import pytest
+
+from coalescer import BatchCoalescer
+
+
+def run_concurrently(coalescer, calls):
+    results = [None] * len(calls)
+    barrier = threading.Barrier(len(calls))
+
+    def call(i, key, item):
+        barrier.wait()
+        try:
+            results[i] = coalescer.submit(key, item)
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=call, args=(i, *args)) for i, args in enumerate(calls)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_calls_share_batches():
+    batches = []
+    coalescer = BatchCoalescer(lambda key, items: batches.append(list(items)) or [x * 10 for x in items],
+                               window_ms=200, max_batch=4)
+
+    results = run_concurrently(coalescer, [("k", i) for i in range(8)])
+
+    assert results == [i * 10 for i in range(8)]
+    assert sorted(len(b) for b in batches) == [4, 4]
+    stats = coalescer.stats()
+    assert (stats['batches'], stats['items'], stats['batch_sizes']) == (2, 8, {'4': 2})
+    assert stats['queue_delay']['count'] == 8
+
+
+def test_other_keys_run_alone_and_errors_reach_every_caller():
+    def run(key, items):
+        if key == "bad":
+            raise ValueError(key)
+        return items
+
+    coalescer = BatchCoalescer(run, window_ms=50, max_batch=8)
+    results = run_concurrently(coalescer, [("bad", 1), ("bad", 2), ("bad", 3)])
+    assert all(isinstance(r, ValueError) for r in results)
+    assert coalescer.stats()['errors'] >= 1
+
+    assert run_concurrently(coalescer, [("a", 1), ("b", 2)]) == [1, 2]
+
+
+def test_zero_window_runs_inline():
+    coalescer = BatchCoalescer(lambda key, items: [threading.get_ident()] * len(items), window_ms=0)
+    assert coalescer.submit(None, 1) == threading.get_ident()
+    assert coalescer.stats()['batch_sizes'] == {'1': 1}
+
+    with pytest.raises(ZeroDivisionError):
+        BatchCoalescer(lambda key, items: 1 / 0, window_ms=0).submit(None, 1)
@@ -0,0 +1,60 @@
+# test_compact_forest.py
+import warnings
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from ml.compact_forest import export_pipeline, load_compact
+from ml.feature_engineering import create_derived_features
+from ml.train_model import CATEGORICAL_FEATURES, DATA_PATH, MODEL_PATH, NUMERICAL_FEATURES
+from model_service import ModelService, user_features
+
+
+@pytest.fixture(scope='module')
+def pipeline():
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            return joblib.load(MODEL_PATH)
+    except Exception as e:
+        pytest.skip(f"career model pickle could not be loaded: {str(e)}")
+
+
+@pytest.fixture(scope='module')
+def compact_path(pipeline, tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('model') / 'model.forest')
+    export_pipeline(pipeline, path)
+    return path
+
+
+@pytest.mark.parametrize('mmap', [False, True])
+def test_compact_predictions_match_the_pickle(pipeline, compact_path, mmap):
+    compact = load_compact(compact_path, mmap=mmap)
+    assert list(compact.classes_) == list(pipeline.classes_)
+
+    training = create_derived_features(pd.read_csv(DATA_PATH))[CATEGORICAL_FEATURES + NUMERICAL_FEATURES]
+    rng = np.random.default_rng(0)
+    users = user_features(list(rng.integers(18, 45, 300)) + [None], rng.integers(1, 11, (301, 4)))
+    for X in (training, users, users.iloc[:1]):
+        expected = pipeline.predict_proba(X)
+        actual = compact.predict_proba(X)
+        assert actual.shape == expected.shape
+        assert np.allclose(actual, expected, atol=1e-6)
+        assert (actual.argmax(axis=1) == expected.argmax(axis=1)).all()
+
+
+def test_mmap_tables_are_read_only_views(compact_path):
+    compact = load_compact(compact_path, mmap=True)
+    assert isinstance(compact.leaf_values, np.memmap)
+    assert not compact.leaf_values.flags.writeable
+
+
+def test_service_reports_load_cost(compact_path):
+    service = ModelService(path=compact_path)
+    assert service.load() is not None
+    stats = service.stats()
+    assert stats['format'] == 'compact' and stats['mmap']
+    assert stats['load_seconds'] > 0
+    assert stats['load_rss_mb'] is not None
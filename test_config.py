@@ -0,0 +1,75 @@
+# test_config.py
+import json
+import logging
+
+import pytest
+from flask import Flask
+
+from config import Config, DebugSampler, JsonFormatter
+
+
+@pytest.fixture
+def logs(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'LOG_FOLDER', str(tmp_path))
+    monkeypatch.setenv('FLASK_ENV', 'development')
+    root = logging.getLogger()
+    level = root.level
+    yield tmp_path / Config.LOG_FILENAME
+    Config.stop_logging()
+    root.setLevel(level)
+
+
+def record(level, message, lineno=1, args=()):
+    return logging.LogRecord('app', level, 'app.py', lineno, message, args, None)
+
+
+def test_debug_sampler_keeps_every_nth_per_call_site():
+    sampler = DebugSampler(every=3)
+    kept = [sampler.filter(record(logging.DEBUG, "noisy")) for _ in range(7)]
+    assert kept == [True, False, False, True, False, False, True]
+    assert sampler.filter(record(logging.DEBUG, "elsewhere", lineno=2))
+    assert all(sampler.filter(record(logging.INFO, "kept")) for _ in range(3))
+
+
+def test_json_formatter():
+    entry = json.loads(JsonFormatter().format(record(logging.INFO, "user %s", args=(7,))))
+    assert entry['level'] == "INFO" and entry['logger'] == "app" and entry['message'] == "user 7"
+
+
+def test_init_logging_writes_through_the_queue(logs, monkeypatch):
+    monkeypatch.setenv('LOG_JSON', 'true')
+    monkeypatch.setenv('LOG_DEBUG_SAMPLE', '2')
+    Config.init_logging(Flask(__name__))
+    Config.init_logging(Flask(__name__))  # replaces, rather than adds to, the first setup
+
+    logger = logging.getLogger('test_config')
+    for i in range(4):
+        logger.debug("debug %d", i)
+    logger.info("done")
+    logging.getLogger('sqlalchemy.engine').info("SELECT 1")
+    Config.stop_logging()
+
+    messages = [json.loads(line)['message'] for line in logs.read_text().splitlines()]
+    assert messages == ["debug 0", "debug 2", "done"]
+
+
+def test_levels_per_environment(logs, monkeypatch):
+    monkeypatch.setenv('FLASK_ENV', 'testing')
+    Config.init_logging(Flask(__name__))
+    assert logging.getLogger().level == logging.WARNING
+    logging.getLogger('test_config').warning("not written to a file")
+    Config.stop_logging()
+    assert not logs.exists()
+
+    monkeypatch.setenv('FLASK_ENV', 'production')
+    monkeypatch.setenv('LOG_LEVEL', 'debug')
+    Config.init_logging(Flask(__name__))
+    assert logging.getLogger().level == logging.DEBUG
+
+    monkeypatch.setenv('LOG_LEVEL', 'loud')
+    Config.init_logging(Flask(__name__))
+    assert logging.getLogger().level == logging.INFO
+
+
+def test_debug_sample_has_one_default():
+    assert DebugSampler().every == Config.LOG_DEBUG_SAMPLE
@@ -0,0 +1,48 @@
+# test_courses.py
+from sqlalchemy import event
+
+from extensions import db
+from models import Course, University
+from courses import course_index, get_courses_and_schools
+
+
+def count_queries(fn, *args):
+    statements = []
+    listener = lambda *a: statements.append(a[2])
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        result = fn(*args)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+    return result, len(statements)
+
+
+def test_courses_are_served_without_queries(app):
+    db.session.add_all([University(id=f"U{i}", name=f"University {i}") for i in range(60)])
+    for career, n in [("Geologist", 1), ("Accountant", 10), ("Software Engineer", 60)]:
+        db.session.add_all([
+            Course(name=f"{career} {i}", university_id=f"U{i}", duration=3,
+                   recommended_career=career, key_skills="Excel, Tax")
+            for i in range(n)
+        ])
+    db.session.commit()
+
+    _, queries = count_queries(course_index.build)
+    assert queries == 1
+
+    for career, n in [("Geologist", 1), ("Accountant", 10), ("Software Engineer", 60)]:
+        courses, queries = count_queries(get_courses_and_schools, career)
+        assert len(courses) == n
+        assert queries == 0
+        assert courses[-1] == {
+            "course": f"{career} {n - 1}", "school": f"University {n - 1}",
+            "duration": 3, "keySkills": ["Excel", "Tax"]
+        }
+
+
+def test_missing_university_does_not_fail(app):
+    db.session.add(Course(name="BSc Geology", university_id="NOPE", recommended_career="Geologist"))
+    db.session.commit()
+    course_index.build()
+    assert get_courses_and_schools("Geologist")[0]["school"] is None
+    assert get_courses_and_schools("Astronaut") == []
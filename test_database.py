@@ -0,0 +1,61 @@
+# test_database.py
+import threading
+
+import pytest
+from flask import Flask
+from sqlalchemy import text
+
+from database import create_engine, database_url, engine_options, init_database
+from extensions import db
+
+
+def pragma(connection, name):
+    return connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+
+def test_database_url(monkeypatch):
+    monkeypatch.delenv('DATABASE_URL', raising=False)
+    assert database_url() == 'sqlite:///db.sqlite'
+    monkeypatch.setenv('DATABASE_URL', 'postgres://u:p@host/careers')
+    assert database_url() == 'postgresql://u:p@host/careers'
+    assert database_url('sqlite://') == 'sqlite://'
+
+
+def test_postgres_pool_options():
+    options = engine_options('postgresql://u:p@host/careers', pool={'pool_size': 2})
+    assert options['pool_pre_ping'] is True
+    assert options['pool_size'] == 2 and options['max_overflow'] == 5
+    assert engine_options('sqlite:///db.sqlite') == {}
+
+
+def test_sqlite_pragmas_on_every_connection(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'tuned.sqlite'}")
+    results = []
+
+    def connect():
+        with engine.connect() as connection:
+            results.append([pragma(connection, name) for name in ('journal_mode', 'synchronous', 'busy_timeout')])
+
+    threads = [threading.Thread(target=connect) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # synchronous=NORMAL is 1
+    assert results == [['wal', 1, 5000]] * 2
+
+    untuned = create_engine(f"sqlite:///{tmp_path / 'default.sqlite'}", pragmas={})
+    with untuned.connect() as connection:
+        assert pragma(connection, 'journal_mode') == 'delete'
+
+
+@pytest.mark.parametrize('pragmas, journal_mode', [(None, 'wal'), ({}, 'delete')])
+def test_init_database(tmp_path, pragmas, journal_mode):
+    app = Flask(__name__)
+    app.config.update(SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'app.sqlite'}")
+    if pragmas is not None:
+        app.config['SQLITE_PRAGMAS'] = pragmas
+    init_database(app)
+    with app.app_context():
+        assert db.session.execute(text("PRAGMA journal_mode")).scalar() == journal_mode
+        db.session.remove()
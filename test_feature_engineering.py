@@ -0,0 +1,70 @@
+# test_feature_engineering.py
+import numpy as np
+import pandas as pd
+
+from ml.feature_engineering import (
+    calculate_skill_match, create_derived_features, derived_features, parse_skills, skill_bitsets, skill_match_bits
+)
+
+
+def raw_frame(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    ages = rng.integers(16, 60, n).astype(float)
+    ages[:7] = [0, 22, 22.5, 25, 100, 101, np.nan]
+    return pd.DataFrame({
+        'Age': ages,
+        'Course': 'LLB',
+        'Dominance': rng.integers(1, 11, n),
+        'Extraversion': rng.integers(1, 11, n),
+        'Patience': rng.integers(1, 11, n),
+        'Formality': rng.integers(1, 11, n)
+    })
+
+
+def test_derived_features_match_the_pandas_definitions():
+    df = raw_frame()
+    before = df.copy()
+    result = create_derived_features(df)
+
+    pd.testing.assert_frame_equal(df, before)
+    assert list(result.columns[:len(df.columns)]) == list(df.columns)
+    assert np.allclose(result['analytical_score'], df['Dominance'] * 0.3 + df['Formality'] * 0.7)
+    assert np.allclose(result['leadership_score'], df['Dominance'] * 0.6 + df['Extraversion'] * 0.4)
+    assert np.allclose(result['team_player_score'], df['Patience'] * 0.5 + df['Extraversion'] * 0.5)
+    expected = pd.cut(
+        df['Age'], bins=[0, 22, 25, 30, 35, 100],
+        labels=['early_career', 'graduate', 'developing', 'experienced', 'senior']
+    )
+    pd.testing.assert_series_equal(result['age_group'], expected, check_names=False)
+
+
+def test_one_row_matches_its_batch_row():
+    df = raw_frame()
+    batch = derived_features(df)
+    single = derived_features(df.iloc[[3]])
+    for name, values in single.items():
+        assert len(values) == 1
+        assert values[0] == batch[name][3]
+
+
+def test_skill_bitsets_agree_with_string_matching():
+    vocabulary = {f"Skill {i}": i for i in range(100)}
+    rng = np.random.default_rng(1)
+    users = [", ".join(rng.choice(list(vocabulary), 8, replace=False)) for _ in range(20)]
+    courses = [",".join(rng.choice(list(vocabulary), 5, replace=False)) for _ in range(30)] + [""]
+
+    user_bits = skill_bitsets([parse_skills(s) for s in users], vocabulary)
+    course_bits = skill_bitsets([parse_skills(s) for s in courses], vocabulary)
+    assert user_bits.shape == (20, 2)
+
+    matrix = skill_match_bits(user_bits[:, None, :], course_bits)
+    assert matrix.shape == (20, 31)
+    for i, user in enumerate(users):
+        for j, course in enumerate(courses):
+            assert matrix[i, j] == calculate_skill_match(user, course)
+    assert np.array_equal(skill_match_bits(user_bits[0], course_bits), matrix[0])
+
+
+def test_separators_do_not_matter():
+    assert parse_skills("Excel, Programming") == parse_skills("Excel,Programming")
+    assert calculate_skill_match("Excel, Programming", "Programming,Excel") == 1.0
@@ -0,0 +1,34 @@
+# test_lookup_tables.py
+import pytest
+
+from lookup_tables import ADJECTIVE_FACTORS, CAREER_PROGRESSIONS, get_career_progression, get_factor
+
+
+@pytest.mark.parametrize("spelling", ["detail-oriented", "Detail-Oriented", " detail oriented ", "DETAIL_ORIENTED"])
+def test_adjective_spellings_resolve(spelling):
+    assert get_factor(spelling) == "Formality"
+
+
+def test_aliases_and_unknown_adjectives():
+    assert get_factor("organised") == get_factor("Organized") == "Formality"
+    assert get_factor("Fast paced") == "Dominance"
+    assert get_factor("sideways") == "Dominance"
+
+
+def test_tables_are_read_only():
+    with pytest.raises(TypeError):
+        ADJECTIVE_FACTORS["calm"] = "Dominance"
+    with pytest.raises(TypeError):
+        CAREER_PROGRESSIONS["Accountant"] = ()
+
+
+def test_career_progressions():
+    progression = get_career_progression("Accountant")
+    assert progression is get_career_progression("Accountant")
+    assert progression[3] == {"title": "Finance Manager", "years": 8, "salary": 100000, "currency": "ZAR"}
+
+    generic = get_career_progression("Geologist")
+    assert [stage["title"] for stage in generic] == [
+        "Junior Geologist", "Geologist", "Senior Geologist", "Lead Geologist"
+    ]
+    assert generic is get_career_progression("Geologist")
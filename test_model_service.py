@@ -0,0 +1,78 @@
+# test_model_service.py
+import numpy as np
+import pytest
+
+from models import User
+from career_catalogue import catalogue
+from model_service import ModelService, model_service
+from recommendation import (
+    career_recommendation_batch, career_recommendation_top_k, get_user_recommendations, scoring_version
+)
+
+
+@pytest.fixture(scope='module')
+def model():
+    loaded = ModelService().load()
+    if loaded is None:
+        pytest.skip("career model could not be loaded")
+    return loaded
+
+
+@pytest.fixture
+def blended(model, monkeypatch):
+    for name, value in [('_model', model), ('_state', 'ready'), ('_failures', 0), ('_rows', 0), ('blend_weight', 0.2)]:
+        monkeypatch.setattr(model_service, name, value)
+    return model
+
+
+def test_missing_model_falls_back(tmp_path):
+    service = ModelService(path=str(tmp_path / "missing.pkl"))
+    assert service.load() is None
+    assert service.active() is None
+    assert service.stats()['state'] == 'missing'
+
+
+def test_batched_model_scores_match_single_rows(model):
+    snapshot = catalogue.snapshot()
+    traits = [(7, 4, 6, 9), (6, 8, 7, 5), (5, 6, 9, 8)]
+    ages = [19, 27, None]
+
+    batch = ModelService().career_scores(model, snapshot, ages, traits)
+    assert batch.shape == (3, len(snapshot))
+    for i in range(3):
+        single = model.career_scores(snapshot, [ages[i]], [traits[i]])
+        assert np.allclose(batch[i], single[0])
+
+    # Every row of a career gets that career's probability
+    row = batch[0]
+    for code in np.unique(snapshot.career_codes):
+        assert np.ptp(row[snapshot.career_codes == code]) == 0
+
+
+def test_blended_batch_matches_single_user(app, blended):
+    user_ids = [u.id for u in User.query.all()]
+    results = career_recommendation_batch(user_ids, k=3)
+    for user_id in user_ids:
+        assert results[user_id] == career_recommendation_top_k(user_id, 3)
+
+    assert model_service.stats()['predicted_rows'] >= len(user_ids)
+
+
+def test_stored_rows_follow_the_blend(app, blended, monkeypatch):
+    snapshot = catalogue.snapshot()
+    user = User.query.get(1)
+    blended_recs = get_user_recommendations(user, 3)
+    assert scoring_version(snapshot, blended) != snapshot.version
+
+    monkeypatch.setattr(model_service, 'blend_weight', 0)
+    heuristic = get_user_recommendations(user, 3)
+    assert [r['rating'] for r in heuristic] != [r['rating'] for r in blended_recs]
+
+
+def test_failing_model_is_switched_off(app, blended, monkeypatch):
+    monkeypatch.setattr(blended, 'career_scores', lambda *a: 1 / 0)
+    heuristic = career_recommendation_top_k(1, 3)
+
+    assert model_service.active() is None
+    assert model_service.stats()['failures'] == 1
+    assert heuristic == career_recommendation_top_k(1, 3)
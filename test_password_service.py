@@ -0,0 +1,49 @@
+# test_password_service.py
+import time
+
+import pytest
+
+from password_service import PasswordHasher, PasswordServiceBusy
+
+
+@pytest.mark.parametrize("workers", [0, 1])
+def test_hash_and_verify(workers):
+    hasher = PasswordHasher(rounds=4, workers=workers)
+    hashed = hasher.hash("s3cret")
+
+    assert hasher.verify("s3cret", hashed)
+    assert not hasher.verify("wrong", hashed)
+    assert hasher.stats()['latency']['verify']['count'] == 2
+
+
+def test_needs_rehash_when_cost_changes():
+    hashed = PasswordHasher(rounds=4, workers=0).hash("s3cret")
+
+    assert not PasswordHasher(rounds=4, workers=0).needs_rehash(hashed)
+    assert PasswordHasher(rounds=5, workers=0).needs_rehash(hashed)
+    assert PasswordHasher(rounds=5, workers=0).verify("s3cret", hashed)
+
+
+def test_rejects_when_no_slot_frees_up_before_the_deadline():
+    hasher = PasswordHasher(rounds=4, workers=0, max_pending=1, queue_timeout=0.01)
+    hasher._slots.acquire()
+
+    with pytest.raises(PasswordServiceBusy):
+        hasher.hash("s3cret")
+    assert hasher.stats()['rejected'] == 1
+
+
+def test_slot_is_held_until_a_timed_out_job_ends():
+    hasher = PasswordHasher(rounds=4, workers=1, max_pending=1, queue_timeout=0.01, result_timeout=0.05)
+
+    with pytest.raises(PasswordServiceBusy):
+        hasher._run('hash', time.sleep, 0.5)
+    # The sleep is still running in the pool, so there is no slot for another job
+    with pytest.raises(PasswordServiceBusy):
+        hasher.hash("s3cret")
+    assert hasher.stats()['rejected'] == 2
+
+    assert hasher._slots.acquire(timeout=5)
+    hasher._slots.release()
+    assert hasher.verify("s3cret", hasher.hash("s3cret"))
+    hasher._pool.shutdown()
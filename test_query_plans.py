@@ -0,0 +1,148 @@
+# test_query_plans.py
+import importlib
+from datetime import datetime
+
+import pytest
+from sqlalchemy import insert, text
+
+from extensions import db
+from init_data import init_adjectives
+from migrate_indexes import create_indexes, migrate
+from models import BehavioralAssessment, Course, ReferenceProfile, University, User, UserRecommendation
+from query_plans import QueryPlanAudit
+
+# Tables at least this large must not be scanned by a request
+MIN_ROWS = 1000
+SEEDED_USERS = 1500
+ADMIN = "audit@example.com"
+
+
+@pytest.fixture(scope='module')
+def routes():
+    """The real app on an in-memory database holding more than MIN_ROWS users, answers and recommendations"""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv('DATABASE_URL', 'sqlite://')
+        mp.setenv('BCRYPT_ROUNDS', '4')
+        mp.setenv('ADMIN_EMAILS', ADMIN)
+        mp.setenv('FLASK_ENV', 'testing')
+        flask_app = importlib.import_module('app').app
+
+    with flask_app.app_context():
+        db.create_all()
+        db.session.add_all([
+            ReferenceProfile(name="Analyzer", dominance=7, extraversion=4, patience=6, formality=9),
+            ReferenceProfile(name="Altruist", dominance=6, extraversion=8, patience=7, formality=5),
+            University(id="UJ", name="University of Johannesburg"),
+            Course(name="LLB", university_id="UJ", recommended_career="Public Defender", key_skills="Legal Research"),
+        ])
+        db.session.execute(insert(User), [
+            {'first_name': "Seed", 'last_name': str(i), 'email': f"seed{i}@example.com", 'age': 20 + i % 20,
+             'password': b"x", 'skills': "Programming", 'reference_profile_id': 1 + i % 2}
+            for i in range(SEEDED_USERS)
+        ])
+        db.session.execute(insert(BehavioralAssessment), [
+            {'user_id': 1 + i % SEEDED_USERS, 'question_type': i % 2, 'factor': i % 4} for i in range(2 * SEEDED_USERS)
+        ])
+        db.session.execute(insert(UserRecommendation), [
+            {'user_id': 1 + i, 'rank': 1, 'career': "Public Defender", 'rating': 50.0,
+             'catalogue_version': "old", 'inputs_key': "old", 'computed_at': datetime.utcnow()}
+            for i in range(SEEDED_USERS)
+        ])
+        db.session.commit()
+        init_adjectives(flask_app)
+        yield flask_app, flask_app.test_client()
+        db.session.remove()
+        db.drop_all()
+
+
+def exercise(client):
+    """Call every route once, as a new user going through the app"""
+    signup = client.post('/signup', json={
+        'firstName': "Audit", 'lastName': "User", 'email': ADMIN, 'password': "secret",
+        'age': 24, 'careerInterests': "Law", 'skills': ["Legal Research"]
+    })
+    assert signup.status_code == 201, signup.json
+    assert client.post('/login', json={'email': ADMIN, 'password': "secret"}).status_code == 200
+    headers = {'Authorization': f"Bearer {signup.json['token']}"}
+
+    answers = [
+        {'question_type': "Self-description", 'adjective': "calm"},
+        {'question_type': "Expected", 'adjective': "assertive"},
+    ]
+    calls = [
+        client.post('/submit_assessment', json={'responses': answers}, headers=headers),
+        client.get('/user/profile', headers=headers),
+        client.put('/user/profile', json={'age': 25, 'skills': ["Negotiation"]}, headers=headers),
+        client.post('/submit_skills', json={'skills': ["Legal Research", "Excel"]}, headers=headers),
+        client.get('/recommend?k=3', headers=headers),
+        client.post('/recommend/batch', json={'user_ids': [1, 2, 3], 'k': 2}, headers=headers),
+        client.get('/career_path', headers=headers),
+        client.get('/dashboard_data', headers=headers),
+        client.get('/skills', headers=headers),
+        client.get('/metrics', headers=headers),
+    ]
+    for response in calls:
+        assert response.status_code == 200, (response.request.path, response.json)
+
+
+def test_routes_do_not_scan_large_tables(routes):
+    flask_app, client = routes
+    with flask_app.app_context():
+        with QueryPlanAudit(db.engine) as audit:
+            exercise(client)
+        assert len(audit.statements) > 10
+        scans = audit.full_scans(MIN_ROWS)
+
+    assert not scans, "\n\n".join(
+        f"{table} ({rows} rows) scanned by:\n{statement}\nplan: {plan}" for statement, table, rows, plan in scans
+    )
+
+
+def test_audit_reports_unindexed_lookups(routes):
+    flask_app, _ = routes
+    with flask_app.app_context():
+        with QueryPlanAudit(db.engine) as audit:
+            User.query.filter_by(last_name="7").all()
+            User.query.filter_by(email="seed7@example.com").first()
+        scans = audit.full_scans(MIN_ROWS)
+
+    assert [(table, rows) for _, table, rows, _ in scans] == [('users', SEEDED_USERS + 1)]
+    assert "last_name" in scans[0][0]
+
+
+def test_metrics_are_for_admins_only(routes):
+    _, client = routes
+    assert client.get('/metrics').status_code == 401
+
+    signup = client.post('/signup', json={
+        'firstName': "Not", 'lastName': "Admin", 'email': "user@example.com", 'password': "secret",
+        'age': 24, 'careerInterests': "Law", 'skills': []
+    })
+    headers = {'Authorization': f"Bearer {signup.json['token']}"}
+    assert client.get('/metrics', headers=headers).status_code == 403
+
+
+def test_migration_adds_indexes_and_foreign_keys(app):
+    with db.engine.begin() as connection:
+        connection.execute(text("DROP INDEX ix_courses_recommended_career"))
+        # Rebuild users the way it was created before the foreign key was declared
+        connection.execute(text(
+            "CREATE TABLE users_old (id INTEGER PRIMARY KEY, first_name VARCHAR(100) NOT NULL, "
+            "last_name VARCHAR(100) NOT NULL, email VARCHAR(150) NOT NULL UNIQUE, age INTEGER NOT NULL, "
+            "skills VARCHAR(200), skill_bits BLOB, career_interests VARCHAR(200), password BLOB NOT NULL, "
+            "reference_profile_id INTEGER REFERENCES reference_profiles (id), course VARCHAR(100), "
+            "university_id VARCHAR(10), faculty VARCHAR(100), duration INTEGER)"
+        ))
+        connection.execute(text("INSERT INTO users_old SELECT * FROM users"))
+        connection.execute(text("DROP TABLE users"))
+        connection.execute(text("ALTER TABLE users_old RENAME TO users"))
+
+        assert migrate(connection) == [
+            "foreign key users.university_id -> universities", "index ix_courses_recommended_career"
+        ]
+        assert migrate(connection) == []
+        assert create_indexes(connection) == []
+
+    assert User.query.count() == 8
+    foreign_keys = db.session.execute(text("PRAGMA foreign_key_list(users)")).all()
+    assert {row[2] for row in foreign_keys} == {'reference_profiles', 'universities'}
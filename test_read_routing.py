@@ -0,0 +1,124 @@
+# test_read_routing.py
+import time
+
+import pytest
+from flask import Flask, jsonify, request
+from sqlalchemy import event, exc, text
+
+from database import SQLITE_PRAGMAS, init_database, read_database_url, read_only
+from extensions import db
+from models import User
+from read_routing import READ_ENGINE, is_write, recent_writes
+
+
+@pytest.fixture
+def routed(tmp_path):
+    """A file-backed app whose read-only route counts the statements each engine runs"""
+    app = Flask(__name__)
+    app.config.update(SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'routed.sqlite'}")
+    init_database(app)
+
+    @app.route('/users/<int:user_id>', methods=['GET'])
+    @read_only
+    def get_user(user_id):
+        db.session.info['user_id'] = user_id
+        return jsonify({'first_name': db.session.get(User, user_id).first_name})
+
+    @app.route('/users/<int:user_id>', methods=['PUT'])
+    def rename_user(user_id):
+        db.session.info['user_id'] = user_id
+        db.session.get(User, user_id).first_name = "Renamed"
+        db.session.commit()
+        return jsonify({})
+
+    @app.route('/users/<int:user_id>/birthday', methods=['POST'])
+    @read_only
+    def birthday(user_id):
+        # A read-only route that writes anyway must not read from the read engine afterwards
+        db.session.info['user_id'] = user_id
+        if request.args.get('sql'):
+            db.session.execute(text("UPDATE users SET age = age + 1 WHERE id = :id"), {'id': user_id})
+        else:
+            db.session.get(User, user_id).age += 1
+            db.session.flush()
+        age = db.session.execute(text("SELECT age FROM users WHERE id = :id"), {'id': user_id}).scalar()
+        db.session.commit()
+        return jsonify({'age': age})
+
+    counts = {'primary': 0, 'read': 0}
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([
+            User(first_name=f"User{i}", last_name="Test", email=f"user{i}@example.com", age=20, password=b"x")
+            for i in (1, 2)
+        ])
+        db.session.commit()
+        db.session.remove()
+        for name, engine in (('primary', db.engine), ('read', app.extensions[READ_ENGINE])):
+            event.listen(engine, 'before_cursor_execute', lambda *args, name=name: counts.__setitem__(name, counts[name] + 1))
+
+    window = recent_writes.window
+    recent_writes.configure(window=0.2)
+    yield app, app.test_client(), counts
+    recent_writes.configure(window=window)
+    with app.app_context():
+        app.extensions[READ_ENGINE].dispose()
+        db.drop_all()
+
+
+def test_read_database_url():
+    assert read_database_url('sqlite:////srv/db.sqlite', pragmas=SQLITE_PRAGMAS) == (
+        'sqlite:///file:/srv/db.sqlite?mode=ro&uri=true'
+    )
+    assert read_database_url('sqlite:////srv/db.sqlite', pragmas={}) is None
+    assert read_database_url('sqlite://', pragmas=SQLITE_PRAGMAS) is None
+    assert read_database_url('postgresql://u:p@primary/careers') is None
+    assert read_database_url('postgresql://u:p@primary/careers', 'postgres://u:p@replica/careers') == (
+        'postgresql://u:p@replica/careers'
+    )
+
+
+def test_reads_use_the_read_engine(routed):
+    app, client, counts = routed
+    assert client.get('/users/1').json == {'first_name': "User1"}
+    assert counts == {'primary': 0, 'read': 1}
+
+    with app.extensions[READ_ENGINE].connect() as connection:
+        with pytest.raises(exc.OperationalError, match="readonly"):
+            connection.execute(text("DELETE FROM users"))
+
+
+def test_writers_read_their_writes(routed):
+    app, client, counts = routed
+    client.put('/users/1')
+    assert counts == {'primary': 2, 'read': 0}
+
+    # The writer reads from the primary for the window; other users do not
+    assert client.get('/users/1').json == {'first_name': "Renamed"}
+    assert client.get('/users/2').json == {'first_name': "User2"}
+    assert counts == {'primary': 3, 'read': 1}
+
+    time.sleep(0.25)
+    assert client.get('/users/1').json == {'first_name': "Renamed"}
+    assert counts == {'primary': 3, 'read': 2}
+
+
+def test_is_write():
+    assert not is_write(text("SELECT 1"))
+    assert not is_write(text("  (select id FROM users) UNION (SELECT 2)"))
+    assert is_write(text("UPDATE users SET age = 1"))
+    assert is_write(text("PRAGMA journal_mode=WAL"))
+    assert is_write(db.update(User).values(age=1))
+    assert not is_write(db.select(User))
+    assert not is_write(None)
+
+
+def test_writes_in_read_only_routes_use_the_primary(routed):
+    app, client, counts = routed
+    assert client.post('/users/1/birthday?sql=1').json == {'age': 21}
+    assert counts == {'primary': 2, 'read': 0}
+
+    # The user is read from the read engine, then the flush and everything after it use the primary
+    assert client.post('/users/2/birthday').json == {'age': 21}
+    assert counts == {'primary': 4, 'read': 1}
+    assert recent_writes.pinned(1) and recent_writes.pinned(2)
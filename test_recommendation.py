@@ -0,0 +1,91 @@
+# test_recommendation.py
+from extensions import db
+from models import User, UserRecommendation
+from recommendation import (
+    career_recommendation, career_recommendation_top_k, career_recommendation_batch,
+    store_recommendations, get_user_recommendations, refresh_user_recommendations,
+    STORED_RECOMMENDATIONS, scoring_coalescer
+)
+
+
+def test_batch_matches_single_user(app):
+    user_ids = [u.id for u in User.query.all()] + [999]
+    results = career_recommendation_batch(user_ids, k=3)
+
+    assert set(results) == set(user_ids)
+    for user_id in user_ids:
+        assert results[user_id] == career_recommendation_top_k(user_id, 3)
+    assert results[999] == []
+    assert results[8] == []
+
+    career, rating = career_recommendation(1)
+    assert results[1][0]['career'] == career
+    assert results[1][0]['rating'] == rating
+
+
+def test_store_replaces_previous_rows(app):
+    results = career_recommendation_batch([1, 2, 8], k=2)
+    store_recommendations(results, "v1")
+    store_recommendations(results, "v2")
+    db.session.commit()
+
+    rows = UserRecommendation.query.order_by(UserRecommendation.user_id, UserRecommendation.rank).all()
+    assert [(r.user_id, r.rank) for r in rows] == [(1, 1), (1, 2), (2, 1), (2, 2)]
+    assert {r.catalogue_version for r in rows} == {"v2"}
+    assert rows[0].career == results[1][0]['career']
+
+
+def test_stored_recommendations_are_reused_until_inputs_change(app, monkeypatch):
+    import recommendation
+
+    user = User.query.get(1)
+    expected = career_recommendation_top_k(1, 3)
+    calls = []
+    real_score_user = recommendation.score_user
+    monkeypatch.setattr(recommendation, 'score_user', lambda *a: calls.append(a) or real_score_user(*a))
+
+    # Nothing stored yet: scored, but reads never write
+    assert get_user_recommendations(user, 3) == expected
+    assert len(calls) == 1
+    assert UserRecommendation.query.filter_by(user_id=1).count() == 0
+
+    refresh_user_recommendations(user)
+    db.session.commit()
+    assert UserRecommendation.query.filter_by(user_id=1).count() == STORED_RECOMMENDATIONS
+    calls.clear()
+    assert get_user_recommendations(user, 3) == expected
+    assert calls == []
+
+    # Changing skills invalidates the stored rows
+    user.skills = "Legal Research, Negotiation"
+    db.session.commit()
+    changed = get_user_recommendations(user, 3)
+    assert len(calls) == 1
+    assert changed == career_recommendation_top_k(1, 3)
+
+    # So does a new catalogue version
+    calls.clear()
+    UserRecommendation.query.filter_by(user_id=1).update({'catalogue_version': 'old'})
+    db.session.commit()
+    get_user_recommendations(user, 1)
+    assert len(calls) == 1
+    assert {r.catalogue_version for r in UserRecommendation.query.filter_by(user_id=1)} == {'old'}
+
+
+def test_refresh_writes_rows_for_new_inputs(app):
+    user = User.query.get(2)
+    user.reference_profile_id = 1
+    expected = refresh_user_recommendations(user)
+    db.session.commit()
+
+    rows = UserRecommendation.query.filter_by(user_id=2).order_by(UserRecommendation.rank).all()
+    assert [r.career for r in rows] == [r['career'] for r in expected]
+    assert get_user_recommendations(user, 2) == expected[:2]
+
+
+def test_heuristic_scoring_skips_the_batch_window(app, monkeypatch):
+    monkeypatch.setattr(scoring_coalescer, 'window_ms', 1000)
+    items = scoring_coalescer.stats()['items']
+
+    assert career_recommendation_top_k(1, 3)
+    assert scoring_coalescer.stats()['items'] == items
@@ -0,0 +1,71 @@
+# test_reference_profiles.py
+import math
+import random
+
+from sqlalchemy import event
+
+from extensions import db
+from models import BehavioralAssessment, ReferenceProfile
+from recommendation import calculate_reference_profile
+from assessments import FACTOR_CODES, QUESTION_TYPE_CODES
+from reference_profiles import profile_index
+
+
+def loop_match(factors, profiles):
+    """The nearest-neighbour loop calculate_reference_profile used to run"""
+    dominance, extraversion, patience, formality = factors
+    best_profile, lowest_distance = None, float('inf')
+    for profile in profiles:
+        distance = math.sqrt(
+            (dominance - profile.dominance) ** 2 +
+            (extraversion - profile.extraversion) ** 2 +
+            (patience - profile.patience) ** 2 +
+            (formality - profile.formality) ** 2
+        )
+        if distance < lowest_distance:
+            lowest_distance, best_profile = distance, profile
+    return best_profile.id
+
+
+def test_match_agrees_with_loop(app):
+    rng = random.Random(3)
+    db.session.add_all([
+        ReferenceProfile(name=f"Profile {i}", dominance=rng.randint(1, 10), extraversion=rng.randint(1, 10),
+                         patience=rng.randint(1, 10), formality=rng.randint(1, 10))
+        for i in range(20)
+    ])
+    # Same traits as the first profile: ties go to the lower id
+    db.session.add(ReferenceProfile(name="Duplicate", dominance=7, extraversion=4, patience=6, formality=9))
+    db.session.commit()
+    profiles = ReferenceProfile.query.order_by(ReferenceProfile.id).all()
+
+    for _ in range(200):
+        factors = [rng.randint(0, 20) for _ in range(4)]
+        assert profile_index.match(factors)['id'] == loop_match(factors, profiles)
+    assert profile_index.match([7, 4, 6, 9])['id'] == 1
+
+
+def test_match_and_get_need_no_queries(app):
+    profile_index.load()
+    statements = []
+    listener = lambda *a: statements.append(a[2])
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        profile = profile_index.match([6, 8, 7, 5])
+        assert profile_index.get(profile['id']) is profile
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+
+    assert profile['name'] == "Altruist"
+    assert statements == []
+
+
+def test_calculate_reference_profile_from_stored_answers(app):
+    assert calculate_reference_profile(1) is None
+
+    for question_type in ("Self-description", "Self-description", "Expected"):
+        db.session.add(BehavioralAssessment(user_id=1, question_type=QUESTION_TYPE_CODES[question_type],
+                                            factor=FACTOR_CODES["Extraversion"]))
+    db.session.commit()
+
+    assert calculate_reference_profile(1) == ReferenceProfile.query.filter_by(name="Altruist").one().id
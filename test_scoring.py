@@ -0,0 +1,98 @@
+# test_scoring.py
+import itertools
+import math
+
+import numpy as np
+import pandas as pd
+
+from career_catalogue import CareerCatalogue, DEFAULT_DATA_PATH
+from scoring import score_careers, personality_scores, skills_scores, combined_scores, top_k_careers
+
+SKILL_SETS = [
+    set(),
+    {"Programming"},
+    {"Programming", "Data Structures"},
+    {"Legal Research", "Excel", "Unknown Skill"},
+    {"Financial Analysis", "Excel", "Negotiation", "Legal Research"},
+]
+
+
+def reference_scores(df, traits, user_skills):
+    """The original per-row loop from career_recommendation"""
+    dominance, extraversion, patience, formality = traits
+    results = []
+    for _, row in df.iterrows():
+        personality_distance = math.sqrt(
+            (row['Dominance'] - dominance) ** 2 +
+            (row['Extraversion'] - extraversion) ** 2 +
+            (row['Patience'] - patience) ** 2 +
+            (row['Formality'] - formality) ** 2
+        )
+        career_skills = set(str(row['Key Skills']).split(",")) if pd.notna(row['Key Skills']) else set()
+        skills_match = len(user_skills.intersection(career_skills)) / len(career_skills) if career_skills else 0
+        max_distance = math.sqrt(4 * 100)
+        personality_score = 1 - (personality_distance / max_distance)
+        final_score = (0.7 * personality_score) + (0.3 * skills_match)
+        results.append({
+            'career': row['Recommended Career'],
+            'score': final_score,
+            'skills_match': skills_match,
+            'personality_match': personality_score
+        })
+    return results
+
+
+def test_matches_original_loop_bit_for_bit():
+    df = pd.read_csv(DEFAULT_DATA_PATH)
+    snapshot = CareerCatalogue(DEFAULT_DATA_PATH).snapshot()
+
+    profiles = [(7, 4, 6, 9), (6, 8, 7, 5), (8, 5, 8, 7), (5, 6, 9, 8), (1, 10, 0, 3)]
+    for traits, skills in itertools.product(profiles, SKILL_SETS):
+        expected = reference_scores(df, traits, skills)
+        scores, personality, skills_match = score_careers(snapshot, traits, skills)
+
+        assert scores.tolist() == [r['score'] for r in expected]
+        assert personality.tolist() == [r['personality_match'] for r in expected]
+        assert skills_match.tolist() == [r['skills_match'] for r in expected]
+
+        best = max(expected, key=lambda x: x['score'])
+        top = int(np.argmax(scores))
+        assert snapshot.career(top) == best['career']
+        assert scores[top] == best['score']
+
+
+def test_batch_matches_single_user():
+    snapshot = CareerCatalogue(DEFAULT_DATA_PATH).snapshot()
+    traits = [(7, 4, 6, 9), (6, 8, 7, 5), (8, 5, 8, 7), (5, 6, 9, 8), (2, 2, 2, 2)]
+
+    batch = combined_scores(personality_scores(snapshot, traits), skills_scores(snapshot, SKILL_SETS))
+    for user, (t, skills) in enumerate(zip(traits, SKILL_SETS)):
+        single, _, _ = score_careers(snapshot, t, skills)
+        assert batch[user].tolist() == single.tolist()
+
+
+def test_top_k_returns_distinct_careers_best_first():
+    snapshot = CareerCatalogue(DEFAULT_DATA_PATH).snapshot()
+    for traits, skills in itertools.product([(7, 4, 6, 9), (6, 8, 7, 5)], SKILL_SETS):
+        scores, _, _ = score_careers(snapshot, traits, skills)
+        rows = top_k_careers(snapshot, scores, 5)
+
+        assert rows[0] == int(np.argmax(scores))
+        careers = [snapshot.career(row) for row in rows]
+        assert len(set(careers)) == 5
+
+        # Same answer as a full sort over each career's best row
+        best = {}
+        for row, score in enumerate(scores.tolist()):
+            career = snapshot.career(row)
+            if career not in best or score > best[career][0]:
+                best[career] = (score, row)
+        expected = sorted(best.values(), key=lambda x: (-x[0], x[1]))[:5]
+        assert rows == [row for _, row in expected]
+
+
+def test_top_k_caps_at_number_of_careers():
+    snapshot = CareerCatalogue(DEFAULT_DATA_PATH).snapshot()
+    scores, _, _ = score_careers(snapshot, (5, 5, 5, 5), set())
+    assert len(top_k_careers(snapshot, scores, 10_000)) == len(snapshot.career_names)
+    assert top_k_careers(snapshot, scores, 0) == []
@@ -0,0 +1,67 @@
+# test_skills.py
+import numpy as np
+from sqlalchemy import text
+
+from career_catalogue import catalogue
+from extensions import db
+from migrate_skills import migrate, missing_columns
+from models import User
+from scoring import skills_scores
+from skills import AVAILABLE_SKILLS, format_skills, skill_vocabulary, split_skills, user_skill_bits
+
+
+def test_vocabulary_round_trips_bitsets():
+    assert len(skill_vocabulary) > 64 and skill_vocabulary.words == 2
+    assert set(AVAILABLE_SKILLS) <= set(skill_vocabulary.names)
+    names = ["Virtualization", "Programming", "Excel"]
+    packed = skill_vocabulary.pack(names)
+    assert len(packed) == 8 * skill_vocabulary.words
+    assert skill_vocabulary.from_bitset(skill_vocabulary.unpack(packed)) == sorted(
+        names, key=skill_vocabulary.ids.get
+    )
+    # Bitsets stored before the vocabulary grew are padded
+    assert skill_vocabulary.unpack(packed[:8]).tolist() == [skill_vocabulary.unpack(packed)[0], 0]
+
+
+def test_validation_and_separators():
+    assert skill_vocabulary.invalid(["Excel", "Juggling", "Virtualization"]) == ["Juggling", "Virtualization"]
+    assert format_skills(["Excel ", "Tax"]) == format_skills("Excel,Tax") == "Excel, Tax"
+    assert split_skills("Excel,Tax") == split_skills("Excel, Tax") == ["Excel", "Tax"]
+
+
+def test_user_skill_bits_follow_skills(app):
+    user = User.query.get(1)
+    user.skills = ["Legal Research", "Negotiation"]
+    db.session.commit()
+    assert user.skills == "Legal Research, Negotiation"
+    assert skill_vocabulary.from_bitset(skill_vocabulary.unpack(user.skill_bits)) == ["Legal Research", "Negotiation"]
+
+    user.skills = None
+    assert user.skill_bits is None
+
+
+def test_bitset_scores_match_name_sets():
+    snapshot = catalogue.snapshot()
+    sets = [set(), {"Excel"}, {"Programming", "Data Structures"}, {"Legal Research", "Negotiation", "Juggling"}]
+    bits = np.array([user_skill_bits(None, ", ".join(s)) for s in sets])
+    assert np.array_equal(skills_scores(snapshot, bits), skills_scores(snapshot, sets))
+    assert np.array_equal(skills_scores(snapshot, bits[2]), skills_scores(snapshot, sets[2]))
+
+
+def test_migration_fills_bitsets(app):
+    with db.engine.begin() as connection:
+        connection.execute(text("ALTER TABLE users DROP COLUMN skill_bits"))
+        connection.execute(text("ALTER TABLE courses DROP COLUMN skill_bits"))
+        connection.execute(text(
+            "INSERT INTO courses (name, key_skills) VALUES ('BSc', 'Statistics,Research'), ('BA', NULL)"
+        ))
+        assert missing_columns(connection) == ['users', 'courses']
+        assert migrate(connection) == {'users': 6, 'courses': 1}
+        assert missing_columns(connection) == []
+
+    rows = db.session.execute(text("SELECT key_skills, skill_bits FROM courses ORDER BY id")).all()
+    assert rows[0][0] == "Statistics, Research"
+    assert skill_vocabulary.from_bitset(skill_vocabulary.unpack(rows[0][1])) == ["Research", "Statistics"]
+    assert rows[1] == (None, None)
+    user = db.session.execute(text("SELECT skills, skill_bits FROM users WHERE id = 1")).one()
+    assert skill_vocabulary.unpack(user.skill_bits).tolist() == skill_vocabulary.bitset(user.skills).tolist()
@@ -0,0 +1,38 @@
+# test_user_cache.py
+from extensions import db
+from models import User
+from user_cache import UserCache
+
+
+def test_hits_until_invalidated(app):
+    cache = UserCache(ttl=60, max_size=10)
+
+    first = cache.get(1)
+    assert first.email == "user0@example.com"
+    assert cache.get(1) is first
+
+    User.query.get(1).skills = "Excel"
+    db.session.commit()
+    assert cache.get(1).skills == "Programming, Data Structures"
+
+    cache.invalidate(1)
+    assert cache.get(1).skills == "Excel"
+    assert cache.stats() == {
+        'hits': 2, 'misses': 2, 'evictions': 0, 'invalidations': 1, 'size': 1, 'hit_rate': 0.5
+    }
+
+
+def test_expiry_size_bound_and_unassessed_users(app):
+    cache = UserCache(ttl=0, max_size=10)
+    assert cache.get(1) is not cache.get(1)
+
+    cache = UserCache(ttl=60, max_size=2)
+    for user_id in (1, 2, 3):
+        cache.get(user_id)
+    assert cache.stats()['size'] == 2
+    assert cache.stats()['evictions'] == 1
+
+    # User 8 has no reference profile yet and is never cached
+    assert cache.get(8).reference_profile_id is None
+    assert cache.stats()['size'] == 2
+    assert cache.get(999) is None
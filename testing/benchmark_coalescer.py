@@ -0,0 +1,72 @@
+"""
+Concurrent recommendation scoring with and without request coalescing.
+
+Simulates a burst of /recommend misses: --threads callers each score
+--calls users through a BatchCoalescer around score_requests, with the
+career model blended in when it is available, for several batching windows.
+
+Run from the repository root:
+
+    PYTHONPATH=. python testing/benchmark_coalescer.py [--threads 32] [--calls 20]
+"""
+import argparse
+import random
+import statistics
+import threading
+import time
+
+from career_catalogue import catalogue
+from coalescer import BatchCoalescer
+from model_service import model_service
+from recommendation import score_requests
+
+
+def burst(coalescer, key, threads, calls):
+    rng = random.Random(0)
+    requests = [
+        (tuple(rng.randint(1, 10) for _ in range(4)), {"Programming", "Excel"}, rng.randint(18, 40), 3)
+        for _ in range(threads * calls)
+    ]
+    latencies = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(threads)
+
+    def caller(offset):
+        barrier.wait()
+        own = []
+        for request in requests[offset::threads]:
+            started = time.perf_counter()
+            coalescer.submit(key, request)
+            own.append((time.perf_counter() - started) * 1000)
+        with lock:
+            latencies.extend(own)
+
+    workers = [threading.Thread(target=caller, args=(i,)) for i in range(threads)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    cuts = statistics.quantiles(latencies, n=100)
+    return len(latencies) / elapsed, cuts[49], cuts[98]
+
+
+def main(threads=32, calls=20, windows=(0, 2, 5)):
+    snapshot = catalogue.snapshot()
+    model_service.load()
+    model = model_service.active()
+    print(f"model: {'on' if model else 'off'}, {threads} threads x {calls} calls")
+    print(f"{'window ms':>10}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'mean batch':>12}")
+    for window in windows:
+        coalescer = BatchCoalescer(lambda key, items: score_requests(key[0], key[1], items), window_ms=window)
+        rate, p50, p99 = burst(coalescer, (snapshot, model), threads, calls)
+        print(f"{window:>10}{rate:>10.0f}{p50:>10.2f}{p99:>10.2f}{coalescer.stats()['mean_batch_size']:>12}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--calls', type=int, default=20)
+    args = parser.parse_args()
+    main(args.threads, args.calls)
@@ -0,0 +1,90 @@
+"""
+Throughput of feature engineering for one row and for large batches.
+
+Compares the previous pandas implementation (in-place columns plus pd.cut,
+run on a copy so every call sees the same input) with derived_features on
+the same frame, and string skill matching with packed skill bitsets.
+
+Run from the repository root:
+
+    PYTHONPATH=. python testing/benchmark_features.py [--rows 100000]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from ml.feature_engineering import derived_features, parse_skills, skill_bitsets, skill_match_bits
+
+
+def legacy_derived_features(df):
+    df['analytical_score'] = df['Dominance'] * 0.3 + df['Formality'] * 0.7
+    df['leadership_score'] = df['Dominance'] * 0.6 + df['Extraversion'] * 0.4
+    df['team_player_score'] = df['Patience'] * 0.5 + df['Extraversion'] * 0.5
+    df['age_group'] = pd.cut(
+        df['Age'],
+        bins=[0, 22, 25, 30, 35, 100],
+        labels=['early_career', 'graduate', 'developing', 'experienced', 'senior']
+    )
+    return df
+
+
+def legacy_skill_match(user_skills, course_skills):
+    user_skill_list = set(s.strip() for s in user_skills.split(','))
+    course_skill_list = set(s.strip() for s in course_skills.split(','))
+    return len(user_skill_list.intersection(course_skill_list)) / len(course_skill_list)
+
+
+def rate(fn, rows, min_seconds=0.5):
+    """Rows per second over repeated calls for at least min_seconds"""
+    calls = 0
+    started = time.perf_counter()
+    while True:
+        fn()
+        calls += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_seconds:
+            return calls * rows / elapsed
+
+
+def main(rows=100_000):
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({
+        'Age': rng.integers(16, 60, rows),
+        'Dominance': rng.integers(1, 11, rows),
+        'Extraversion': rng.integers(1, 11, rows),
+        'Patience': rng.integers(1, 11, rows),
+        'Formality': rng.integers(1, 11, rows)
+    })
+    one = frame.iloc[:1].copy()
+
+    print(f"{'derived features':<34}{'1 row, rows/s':>16}{f'{rows} rows, rows/s':>22}")
+    for name, fn in [
+        ("pandas, in place on a copy", lambda df: legacy_derived_features(df.copy())),
+        ("derived_features", derived_features),
+    ]:
+        print(f"{name:<34}{rate(lambda: fn(one), 1):>16,.0f}{rate(lambda: fn(frame), rows):>22,.0f}")
+
+    skills = [f"Skill {i}" for i in range(60)]
+    vocabulary = {name: i for i, name in enumerate(skills)}
+    users = [", ".join(rng.choice(skills, 6, replace=False)) for _ in range(rows)]
+    courses = [",".join(rng.choice(skills, 4, replace=False)) for _ in range(100)]
+    user_bits = skill_bitsets([parse_skills(s) for s in users], vocabulary)
+    course_bits = skill_bitsets([parse_skills(s) for s in courses], vocabulary)
+    pairs = min(rows, 10_000)
+
+    print(f"\n{'skill match':<34}{'pairs/s':>16}")
+    print(f"{'strings, split per call':<34}"
+          f"{rate(lambda: [legacy_skill_match(users[i], courses[i % 100]) for i in range(pairs)], pairs):>16,.0f}")
+    print(f"{'bitsets, 1 user x 100 courses':<34}"
+          f"{rate(lambda: skill_match_bits(user_bits[0], course_bits), 100):>16,.0f}")
+    print(f"{f'bitsets, {pairs} users x 100 courses':<34}"
+          f"{rate(lambda: skill_match_bits(user_bits[:pairs, None, :], course_bits), pairs * 100):>16,.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100_000)
+    args = parser.parse_args()
+    main(args.rows)
@@ -0,0 +1,121 @@
+"""
+Logging cost on the request thread: the old synchronous setup against Config.init_logging.
+
+Each simulated request logs what a signup used to: two DEBUG lines (one
+with the request body), the statements and parameters SQLALCHEMY_ECHO
+printed, and one INFO line. --threads threads, like a gthread worker, run
+--requests requests each under every setup, with the console sent to
+/dev/null and the log file in a temporary folder. Reports the mean time a
+request spends logging and how long the queue listener took to drain.
+
+Run from the repository root:
+
+    PYTHONPATH=. python testing/benchmark_logging.py [--threads 4] [--requests 2000]
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from flask import Flask
+
+from config import Config
+
+STATEMENTS = [
+    "SELECT users.id, users.email FROM users WHERE users.email = ? LIMIT ? OFFSET ?",
+    "INSERT INTO users (first_name, last_name, email, age, skills, skill_bits, career_interests, password) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+    "SELECT users.id, users.first_name, users.last_name, users.email FROM users WHERE users.id = ?",
+]
+BODY = {
+    'firstName': "Bench", 'lastName': "User", 'email': "bench@example.com", 'password': "secret",
+    'age': 24, 'careerInterests': "Law", 'skills': ["Legal Research", "Negotiation"]
+}
+
+
+def request(logger, echo, i):
+    logger.debug("Received signup request")
+    logger.debug(f"Signup data received: {BODY}")
+    for statement in STATEMENTS:
+        echo.info(statement)
+        echo.info("[generated in %.5fs] %r", 0.00012, (BODY['email'], 1, 0))
+    logger.info("New user created: %s", i)
+
+
+def synchronous(folder):
+    """What app.py did before: basicConfig at DEBUG with a file and a console handler"""
+    root = logging.getLogger()
+    formatter = logging.Formatter(Config.LOG_FORMAT)
+    for handler in (logging.FileHandler(os.path.join(folder, 'sync.log')), logging.StreamHandler()):
+        handler.setFormatter(formatter)
+        root.addHandler(handler)
+    root.setLevel(logging.DEBUG)
+    logging.getLogger('sqlalchemy.engine').setLevel(logging.INFO)
+
+    def stop():
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+            handler.close()
+    return stop
+
+
+def queued(environment, json_lines=False):
+    def setup(folder):
+        os.environ.update(FLASK_ENV=environment, LOG_JSON=str(json_lines))
+        Config.LOG_FOLDER = folder
+        Config.init_logging(Flask(__name__))
+        return Config.stop_logging
+    return setup
+
+
+def measure(setup, threads, requests):
+    with tempfile.TemporaryDirectory() as folder:
+        stop = setup(folder)
+        logger, echo = logging.getLogger('app'), logging.getLogger('sqlalchemy.engine.Engine')
+        barrier = threading.Barrier(threads)
+        spent = []
+
+        def caller(offset):
+            barrier.wait()
+            started = time.perf_counter()
+            for i in range(offset, offset + requests):
+                request(logger, echo, i)
+            spent.append(time.perf_counter() - started)
+
+        workers = [threading.Thread(target=caller, args=(n * requests,)) for n in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        started = time.perf_counter()
+        stop()
+        drained = time.perf_counter() - started
+        lines = sum(1 for name in os.listdir(folder) for _ in open(os.path.join(folder, name)))
+    return sum(spent) / (threads * requests) * 1e6, drained * 1000, lines / (threads * requests)
+
+
+def main(threads=4, requests=2000):
+    setups = [
+        ("sync DEBUG + echo", synchronous),
+        ("queue production", queued('production')),
+        ("queue production json", queued('production', json_lines=True)),
+        ("queue development", queued('development')),
+    ]
+    # The console handlers write to /dev/null
+    sys.stderr = open(os.devnull, 'w')
+    print(f"{threads} threads x {requests} requests")
+    print(f"{'setup':<24}{'us/request':>12}{'drain ms':>10}{'lines/request':>15}")
+    for name, setup in setups:
+        per_request, drained, lines = measure(setup, threads, requests)
+        print(f"{name:<24}{per_request:>12.1f}{drained:>10.1f}{lines:>15.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+    main(args.threads, args.requests)
@@ -0,0 +1,64 @@
+"""
+Microbenchmark get_factor and get_career_progression.
+
+The "rebuild" column approximates the previous implementations, which built
+the whole adjective map or career path map on every call; the "table"
+column is the module-level lookups in lookup_tables.py.
+
+Run from the repository root:
+
+    PYTHONPATH=. python testing/benchmark_lookups.py
+"""
+import csv
+import json
+import logging
+import timeit
+
+from lookup_tables import ADJECTIVE_FACTORS_PATH, CAREER_PROGRESSIONS_PATH, get_career_progression, get_factor
+
+with open(ADJECTIVE_FACTORS_PATH, newline='') as f:
+    PAIRS = tuple((row['Adjective'], row['Factor']) for row in csv.DictReader(f))
+with open(CAREER_PROGRESSIONS_PATH) as f:
+    PATHS = tuple((career, tuple(tuple(stage.items()) for stage in stages)) for career, stages in json.load(f).items())
+
+
+def rebuild_get_factor(adjective):
+    adjective = adjective.lower().strip()
+    factor_mapping = dict(PAIRS)
+    return factor_mapping.get(adjective) or "Dominance"
+
+
+def rebuild_get_career_progression(career):
+    career_paths = {name: [dict(stage) for stage in stages] for name, stages in PATHS}
+    if career in career_paths:
+        return career_paths[career]
+    return [
+        {"title": f"Junior {career}", "years": 0, "salary": 40000},
+        {"title": career, "years": 2, "salary": 60000},
+        {"title": f"Senior {career}", "years": 5, "salary": 80000},
+        {"title": f"Lead {career}", "years": 8, "salary": 100000}
+    ]
+
+
+def per_call_ns(fn, args, number):
+    """Best of 5 runs, in nanoseconds per call"""
+    best = min(timeit.repeat(lambda: [fn(a) for a in args], number=number, repeat=5))
+    return best / (number * len(args)) * 1e9
+
+
+def main(number=20000):
+    logging.disable(logging.WARNING)
+    adjectives = ["calm", "organized", "fast-paced", "teamwork"]
+    careers = ["Accountant", "Software Engineer", "Geologist"]
+    cases = [
+        ("get_factor", adjectives, rebuild_get_factor, get_factor),
+        ("get_career_progression", careers, rebuild_get_career_progression, get_career_progression),
+    ]
+    print(f"{'function':<24}{'rebuild ns':>12}{'table ns':>12}{'speed-up':>10}")
+    for name, args, before, after in cases:
+        old, new = per_call_ns(before, args, number), per_call_ns(after, args, number)
+        print(f"{name:<24}{old:>12.0f}{new:>12.0f}{old / new:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
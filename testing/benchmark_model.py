@@ -0,0 +1,86 @@
+"""
+Latency of the career model against the heuristic scores.
+
+Reports p50/p99 for heuristic scoring alone, one predict_proba call per
+user, and batched calls (per call and per user), plus load time with and
+without memory mapping.
+
+Run from the repository root:
+
+    PYTHONPATH=. python testing/benchmark_model.py [--requests 500] [--batch 32]
+"""
+import argparse
+import random
+import statistics
+import time
+
+from career_catalogue import catalogue
+from model_service import ModelService
+from scoring import score_careers
+
+
+def percentiles(samples_ms):
+    cuts = statistics.quantiles(samples_ms, n=100)
+    return cuts[49], cuts[98]
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main(requests=500, batch=32):
+    rng = random.Random(0)
+    snapshot = catalogue.snapshot()
+
+    for mmap in (False, True):
+        service = ModelService(mmap=mmap)
+        started = time.perf_counter()
+        model = service.load()
+        print(f"load (mmap={mmap}): {time.perf_counter() - started:.2f}s")
+    if model is None:
+        print("No model available; only the heuristic would be served")
+        return
+
+    users = [
+        (rng.randint(18, 40), tuple(rng.randint(1, 10) for _ in range(4)), {"Programming", "Excel"})
+        for _ in range(requests)
+    ]
+    rows = iter(range(10 ** 9))
+
+    def heuristic():
+        age, traits, skills = users[next(rows) % requests]
+        score_careers(snapshot, traits, skills)
+
+    def single():
+        age, traits, skills = users[next(rows) % requests]
+        score_careers(snapshot, traits, skills)
+        service.career_scores(model, snapshot, [age], [traits])
+
+    def batched():
+        start = next(rows) % requests
+        chunk = [users[(start + i) % requests] for i in range(batch)]
+        service.career_scores(model, snapshot, [u[0] for u in chunk], [u[1] for u in chunk])
+
+    single()  # first call pays for lazy set-up
+    print(f"{'path':<28}{'p50 ms':>10}{'p99 ms':>10}")
+    for name, fn, repeat, per in [
+        ("heuristic only", heuristic, requests, 1),
+        ("model, 1 user per call", single, requests, 1),
+        (f"model, {batch} users per call", batched, max(requests // batch, 20), 1),
+        (f"  per user", batched, max(requests // batch, 20), batch),
+    ]:
+        p50, p99 = percentiles([ms / per for ms in timed(fn, repeat)])
+        print(f"{name:<28}{p50:>10.2f}{p99:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--batch', type=int, default=32)
+    args = parser.parse_args()
+    main(args.requests, args.batch)
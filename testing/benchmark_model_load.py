@@ -0,0 +1,79 @@
+"""
+Cold load of the career model per worker: pickle against the compact export.
+
+Forks --workers processes, like gunicorn's pre-fork workers, that each load
+the model through ModelService and score one batch. Reports each format's
+artifact size, the mean load time, the growth of each worker's resident
+memory, and the proportional set size (shared pages split between the
+workers that map them) where /proc/self/smaps_rollup is available.
+
+Run from the repository root:
+
+    PYTHONPATH=. python testing/benchmark_model_load.py [--workers 4]
+"""
+import argparse
+import multiprocessing
+import os
+import statistics
+
+from career_catalogue import catalogue
+from model_service import DEFAULT_MODEL_PATH, ModelService
+
+PICKLE_PATH = os.path.splitext(DEFAULT_MODEL_PATH)[0] + '.pkl'
+
+
+def proportional_memory():
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                if line.startswith('Pss:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+
+
+def worker(path, mmap, barrier, results):
+    service = ModelService(path=path, mmap=mmap)
+    model = service.load()
+    model.career_scores(catalogue.snapshot(), [25] * 32, [(5, 5, 5, 5)] * 32)
+    # Measure once every worker holds the model, so shared pages are split
+    barrier.wait()
+    stats = service.stats()
+    results.put((stats['load_seconds'], stats['load_rss_mb'], proportional_memory()))
+
+
+def main(workers=4):
+    catalogue.snapshot()
+    context = multiprocessing.get_context('fork')
+    print(f"{workers} workers")
+    print(f"{'format':<16}{'size MB':>10}{'load ms':>10}{'+RSS MB':>10}{'PSS MB':>10}")
+    for name, path, mmap in [
+        ("pickle", PICKLE_PATH, False),
+        ("compact", DEFAULT_MODEL_PATH, False),
+        ("compact, mmap", DEFAULT_MODEL_PATH, True),
+    ]:
+        if not os.path.exists(path):
+            print(f"{name:<16}  missing: {path}")
+            continue
+        barrier = context.Barrier(workers)
+        results = context.Queue()
+        processes = [context.Process(target=worker, args=(path, mmap, barrier, results)) for _ in range(workers)]
+        for process in processes:
+            process.start()
+        rows = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+        pss = [row[2] for row in rows if row[2] is not None]
+        print(
+            f"{name:<16}{os.path.getsize(path) / 2 ** 20:>10.2f}"
+            f"{statistics.mean(row[0] for row in rows) * 1000:>10.1f}"
+            f"{statistics.mean(row[1] for row in rows):>10.2f}"
+            f"{statistics.mean(pss) / 2 ** 20 if pss else float('nan'):>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+    main(args.workers)
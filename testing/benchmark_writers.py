@@ -0,0 +1,125 @@
+"""
+Concurrent signups and assessment submissions against one SQLite file.
+
+Forks --workers processes, like gunicorn workers, that each import the app
+on a fresh database and push --users new users through POST /signup and
+POST /submit_assessment with the Flask test client (bcrypt at cost 4,
+inline, so the database dominates). Runs once with
+SQLite's defaults (rollback journal, synchronous=FULL) and once with the
+WAL pragmas from database.py, and reports the throughput of each route,
+the p99 latency and the requests that failed (e.g. "database is locked").
+
+Run from the repository root:
+
+    PYTHONPATH=. python testing/benchmark_writers.py [--workers 1 2 4 8] [--users 50]
+"""
+import argparse
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import insert
+
+from assessments import adjective_vocabulary
+from database import create_engine
+from extensions import db
+from models import Adjective, ReferenceProfile
+
+ANSWERS = [
+    {'question_type': "Self-description", 'adjective': "calm"},
+    {'question_type': "Self-description", 'adjective': "assertive"},
+    {'question_type': "Expected", 'adjective': "precise"},
+    {'question_type': "Expected", 'adjective': "outgoing"},
+]
+
+
+def create_database(url, tuned):
+    engine = create_engine(url, pragmas=None if tuned else {})
+    db.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(ReferenceProfile), [
+            {'name': "Analyzer", 'dominance': 7, 'extraversion': 4, 'patience': 6, 'formality': 9},
+            {'name': "Altruist", 'dominance': 6, 'extraversion': 8, 'patience': 7, 'formality': 5},
+        ])
+        connection.execute(insert(Adjective), [{'word': word} for word in adjective_vocabulary.words])
+    engine.dispose()
+
+
+def worker(index, users, barrier, results):
+    from app import app
+    client = app.test_client()
+
+    timings = {'signup': [], 'assessment': []}
+    failures = 0
+    barrier.wait()
+    for i in range(users):
+        started = time.perf_counter()
+        signup = client.post('/signup', json={
+            'firstName': "Bench", 'lastName': str(i), 'email': f"bench{index}-{i}@example.com",
+            'password': "secret", 'age': 20 + i % 20, 'careerInterests': "Law", 'skills': ["Excel"]
+        })
+        timings['signup'].append(time.perf_counter() - started)
+        if signup.status_code != 201:
+            failures += 1
+            continue
+        started = time.perf_counter()
+        response = client.post(
+            '/submit_assessment', json={'responses': ANSWERS},
+            headers={'Authorization': f"Bearer {signup.json['token']}"}
+        )
+        timings['assessment'].append(time.perf_counter() - started)
+        failures += response.status_code != 200
+    results.put((timings, failures))
+
+
+def run(workers, users, tuned):
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{os.path.join(directory, 'bench.sqlite')}"
+        create_database(url, tuned)
+        os.environ.update(
+            DATABASE_URL=url, SQLITE_TUNING=str(tuned), BCRYPT_ROUNDS='4', PASSWORD_POOL_WORKERS='0',
+            FLASK_ENV='testing'
+        )
+
+        context = multiprocessing.get_context('fork')
+        barrier = context.Barrier(workers + 1)
+        results = context.Queue()
+        processes = [context.Process(target=worker, args=(i, users, barrier, results)) for i in range(workers)]
+        for process in processes:
+            process.start()
+        barrier.wait()
+        started = time.perf_counter()
+        collected = [results.get() for _ in processes]
+        elapsed = time.perf_counter() - started
+        for process in processes:
+            process.join()
+
+    timings = {route: [t for worker_timings, _ in collected for t in worker_timings[route]] for route in ('signup', 'assessment')}
+    failures = sum(f for _, f in collected)
+    return timings, failures, elapsed
+
+
+def main(worker_counts=(1, 2, 4, 8), users=50):
+    print(f"{users} users per worker, each signing up then submitting an assessment")
+    print(f"{'journal':>8}{'workers':>9}{'signup/s':>10}{'assess/s':>10}"
+          f"{'signup p99':>12}{'assess p99':>12}{'failed':>8}")
+    for tuned in (False, True):
+        for workers in worker_counts:
+            timings, failures, elapsed = run(workers, users, tuned)
+            p99 = {
+                route: statistics.quantiles(values, n=100)[98] * 1000 if len(values) > 1 else float('nan')
+                for route, values in timings.items()
+            }
+            print(f"{'wal' if tuned else 'delete':>8}{workers:>9}"
+                  f"{len(timings['signup']) / elapsed:>10.0f}{len(timings['assessment']) / elapsed:>10.0f}"
+                  f"{p99['signup']:>10.1f}ms{p99['assessment']:>10.1f}ms{failures:>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--users', type=int, default=50)
+    args = parser.parse_args()
+    main(args.workers, args.users)
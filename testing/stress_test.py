@@ -1,4 +1,13 @@
+"""
+Stress test the API endpoints with concurrent requests.
+
+Run from the repository root against a running server, optionally naming
+the scenarios to run:
+
+    PYTHONPATH=. python testing/stress_test.py [Login] [Dashboard] [Skills] [Assessment]
+"""
 import requests
+import sys
 import time
 import concurrent.futures
 import statistics
@@ -20,8 +29,12 @@ class StressTest:
                 json=TEST_CONFIG['test_user']
             )
             if response.status_code == 200:
-                self.user_id = response.json().get('user_id')
+                body = response.json()
+                self.user_id = body['user']['id']
+                self.session.headers['Authorization'] = f"Bearer {body['token']}"
                 return True
+            print(f"Setup failed: login returned {response.status_code}")
+            return False
         except Exception as e:
             print(f"Setup failed: {str(e)}")
             return False
@@ -59,6 +72,7 @@ class StressTest:
                 }
         
         # Execute parallel requests
+        wall_start = time.time()
         with concurrent.futures.ThreadPoolExecutor(
             max_workers=TEST_CONFIG['stress_test']['max_workers']
         ) as executor:
@@ -74,7 +88,8 @@ class StressTest:
                     response_times.append(result['time'])
                 else:
                     error_count += 1
-                    errors.append(result.get('error'))
+                    errors.append(result.get('error') or result.get('status_code'))
+        wall_time = time.time() - wall_start
         
         # Calculate metrics
         return {
@@ -86,12 +101,15 @@ class StressTest:
             'median_response_time': statistics.median(response_times) if response_times else 0,
             'min_response_time': min(response_times) if response_times else 0,
             'max_response_time': max(response_times) if response_times else 0,
+            'p99_response_time': statistics.quantiles(response_times, n=100)[98] if len(response_times) > 1 else 0,
             'requests_per_second': TEST_CONFIG['stress_test']['num_requests'] / sum(response_times) if response_times else 0,
+            # Completed requests per second of elapsed time, across all workers
+            'throughput': success_count / wall_time if wall_time else 0,
             'errors': errors[:5]  # Include first 5 errors for debugging
         }
 
-def run_stress_tests():
-    """Run stress tests on all endpoints"""
+def run_stress_tests(names=None):
+    """Run stress tests on all endpoints, or only the named scenarios"""
     tester = StressTest()
     if not tester.setup():
         print("Failed to setup stress test")
@@ -127,6 +145,9 @@ def run_stress_tests():
         }
     ]
     
+    if names:
+        endpoints = [endpoint for endpoint in endpoints if endpoint['name'] in names]
+    
     # Run tests and collect results
     results = {}
     for endpoint in endpoints:
@@ -152,6 +173,7 @@ def run_stress_tests():
         print(f"Success Rate: {metrics['success_rate']:.2f}%")
         print(f"Avg Response Time: {metrics['avg_response_time']*1000:.2f}ms")
         print(f"Requests/second: {metrics['requests_per_second']:.2f}")
+        print(f"Throughput: {metrics['throughput']:.2f} req/s (p99 {metrics['p99_response_time']*1000:.2f}ms)")
 
 if __name__ == "__main__":
-    run_stress_tests()
\ No newline at end of file
+    run_stress_tests(sys.argv[1:])
\ No newline at end of file
@@ -0,0 +1,103 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from extensions import db
+from models import User
+
+logger = logging.getLogger(__name__)
+
+CACHED_FIELDS = (
+    'id', 'first_name', 'last_name', 'email', 'age',
+    'skills', 'skill_bits', 'career_interests', 'reference_profile_id'
+)
+
+
+class TokenUser:
+    """The authenticated user as described by the JWT claims alone"""
+
+    __slots__ = ('id', 'email')
+
+    def __init__(self, claims):
+        self.id = claims['user_id']
+        self.email = claims.get('email')
+
+
+class CachedUser:
+    """Read-only copy of the User columns that read handlers use"""
+
+    __slots__ = CACHED_FIELDS
+
+    def __init__(self, row):
+        for field in CACHED_FIELDS:
+            setattr(self, field, getattr(row, field))
+
+
+class UserCache:
+    """Small LRU cache of CachedUser objects with a per-entry TTL.
+
+    Entries are dropped after ``ttl`` seconds, when the cache grows past
+    ``max_size`` and when invalidate() is called after a write. Users who have
+    not completed the assessment are never cached, so a handler never sees a
+    missing reference profile that has since been set.
+
+    The cache is per process: with several workers a write is invalidated
+    only in the worker that handled it, and other workers may serve the old
+    values for up to ``ttl`` seconds.
+    """
+
+    def __init__(self, ttl=5.0, max_size=1024):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+    def get(self, user_id):
+        """Return a CachedUser, loading it on a miss. None if the user does not exist."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(user_id)
+                self._counters['hits'] += 1
+                return entry[1]
+            self._counters['misses'] += 1
+
+        row = (
+            db.session.query(*(getattr(User, field) for field in CACHED_FIELDS))
+            .filter(User.id == user_id)
+            .first()
+        )
+        if row is None:
+            return None
+        user = CachedUser(row)
+
+        if self.max_size > 0 and user.reference_profile_id is not None:
+            with self._lock:
+                self._entries[user_id] = (now + self.ttl, user)
+                self._entries.move_to_end(user_id)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+                    self._counters['evictions'] += 1
+        return user
+
+    def invalidate(self, user_id):
+        """Drop a user after their row was modified"""
+        with self._lock:
+            if self._entries.pop(user_id, None) is not None:
+                self._counters['invalidations'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return counters and the hit rate since start-up"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats['size'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        return stats